@@ -1,297 +1,12 @@
-import traceback
-from openpyxl import load_workbook
-from employee import Employee
-from datetime import date, datetime
-import logging
-import re
-
-
-first_finals_week = ['2024-12-11', '2024-12-12', '2024-12-13', '2024-12-14']
-second_finals_week = ['2024-12-15', '2024-12-16', '2024-12-17', '2024-12-18', '2024-12-19']
-max_allowed_shifts = 6
-first_final_week_max_allowed_shifts = 3
-second_final_week_max_allowed_shifts = 5
-resolve_comments_after_assigned = True 
-resolve_comments_after_unassigned = False
-
-
-
-logging.basicConfig(
-    filename="shift_assignment.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
-
-
-def parse_comments(raw_comment):
-    """
-    Parses a raw comment string into a list of (comment, commenter) tuples.
-
-    Parameters:
-        raw_comment (str): The raw comment text from a cell.
-
-    Returns:
-        list: A list of tuples, each containing (comment, commenter).
-    """
-    if not raw_comment:
-        return []
-
-    
-    # Split the comments into a list by the delimiter '\n----\n'
-    comment_list = raw_comment.split('\n----\n')
-    processed_comments = []
-
-    for item in comment_list:
-        # Further split into comment and commenter using '\n\t-' as the delimiter
-        parts = item.split('\n\t-')
-        if len(parts) == 2:
-            comment, commenter = parts
-            processed_comments.append((comment.strip(), commenter.strip()))
-        else:
-            # If no valid structure, add as "Unknown"
-            processed_comments.append((parts[0].strip(), "Unknown"))
-            
-
-    return processed_comments
-
-
-
-
-def get_table_header(row):
-    """
-    Determine if a row is a table header based on custom rules and return the header value if it exists.
-    
-    :param row: The row to inspect.
-    :return: The header value (string or formatted date) if the row is a header, otherwise None.
-    """
-    for cell in row:
-        if cell.value:
-            # Check if the cell contains a string with "day" or "2024"
-            if isinstance(cell.value, str) and ("day" in cell.value.lower() or "2024" in cell.value.lower()):
-                return cell.value.strip()  # Return the string header
-            # Check if the cell contains a date
-            elif isinstance(cell.value, (date, datetime)):
-                return cell.value.strftime("%Y-%m-%d")  # Return the formatted date
-    return None
-
-def is_merged_cell(cell):
-    """
-    Check if a given cell is part of a merged cell range.
-
-    :param cell: An openpyxl cell object to check.
-    :return: True if the cell is part of a merged range, False otherwise.
-    """
-    worksheet = cell.parent  # Get the parent worksheet of the cell
-    for merged_range in worksheet.merged_cells.ranges:
-        if cell.coordinate in merged_range:
-            return True
-    return False
-
-def has_more_than_allowed_shifts_in_first_week(employee_obj):
-    return True if employee_obj.first_week_shift_count >= first_final_week_max_allowed_shifts else False
-    
-def has_more_than_allowed_shifts_in_second_week(employee_obj):
-    # return True if employee_obj.total_shift_count > max_allowed_shifts else False
-    return True if employee_obj.second_week_shift_count >= second_final_week_max_allowed_shifts else False
-   
-def get_name_parts(assign_shift_to):
-    name_parts = assign_shift_to.split()
-    if len(name_parts) > 1:  # Ensure there's a last name
-        last_name = name_parts[-1]
-        first_name = ' '.join(name_parts[:-1])  # Join all parts except the last one
-    else:
-        first_name = name_parts[0]  # Only one name provided
-        last_name = ''  # No last name available
-    return first_name, last_name
-
-
-def is_valid_time_format(time_cell):
-    """
-    Validates if a time_cell string is in the format '11:00AM - 2:30PM'.
-
-    Parameters:
-        time_cell (str): The string to validate.
-
-    Returns:
-        bool: True if the format is valid, False otherwise.
-    """
-    # Remove all spaces from the string
-    cleaned_time_cell = time_cell.replace(" ", "")
-    
-    # Define the regex pattern for the time format
-    pattern = r"^\d{1,2}:\d{2}[APM]{2}-\d{1,2}:\d{2}[APM]{2}$"
-    
-    # Match the pattern
-    return bool(re.match(pattern, cleaned_time_cell))
-
-
-def load_and_assign_shift_xlsx(file_path, sheets_to_analyze):
-    """
-    Load an .xlsx file, analyze specific sheets, and assign shifts based on the last commenter.
-    Updates the cell value with the last commenter's name.
-
-    Parameters:
-        file_path (str): Path to the .xlsx file.
-        sheets_to_analyze (list): List of sheet names to analyze.
-
-    Returns:
-        dict: A dictionary with sheet names as keys and the last person who commented assigned to each shift.
-    """
-    # Initialize result dictionary
-    results = {}
-    processed_rows_count = 0
-    try:
-        # Load the workbook
-        workbook = load_workbook(filename=file_path, data_only=False)
-        shift_assignments = {}
-        # Iterate through the specified sheets
-        for sheet in sheets_to_analyze:
-            if sheet in workbook.sheetnames:
-                worksheet = workbook[sheet]
-                logging.info(f"Starting to process sheet {sheet}")
-                table_header = ""
-                for index, row in enumerate(worksheet.iter_rows()):
-                    table_header_temp = get_table_header(row)
-                    if table_header_temp:  # Check if the row marks the start of a new table
-                        table_header = table_header_temp
-                        logging.info(f"Got new table header - {table_header}")
-                        continue
-                    
-                    assign_shift_to = ""
-                    first_name = ""
-                    last_name = ""
-                    is_unassigned_due_to_warning = False
-                    if sheet == "Kitchen":
-                        time_cell, first_name_cell, last_name_cell = row[2:5]
-                    else:
-                        time_cell, first_name_cell, last_name_cell = row[1:4]
-                    
-                    if not time_cell.value:
-                        continue
-                    # Skip rows that already have a value or are part of a merged range, or are table header Time-FirstName-LastName
-
-                    if is_merged_cell(first_name_cell) or is_merged_cell(last_name_cell):
-                        continue
-                    if time_cell.value == "Time":
-                        continue
-                    if not first_name_cell.value and not first_name_cell.comment:
-                        continue
-                    if not is_valid_time_format(time_cell.value):
-                        continue
-                    
-                    processed_rows_count += 1
-
-                    # Get the raw comment
-                    if first_name_cell.value:
-                        assign_shift_to = first_name_cell.value + " " + last_name_cell.value
-                        processed_comments= [(first_name_cell.value, assign_shift_to)]
-                    else: 
-                        raw_comments = first_name_cell.comment.text
-                        # Parse the comment into tuples
-                        processed_comments = parse_comments(raw_comments)
-
-            
-                    # Assign the correct last commenter to the shift
-                    for comment_item in reversed(processed_comments):
-                        #check if the comment is by the same person.
-                        if comment_item[1] == 'Unknown':
-                            is_unassigned_due_to_warning = True
-                            logging.warning(f"{first_name_cell} - There was a problem in resolving this comment please proceed manually.")
-                            continue
-                        
-                        if comment_item[0].lower() in comment_item[1].lower():
-                            employee_obj = shift_assignments.get(comment_item[1])
-                            if sheet == "Dish" or sheet == "Pot Room":
-                                if employee_obj:
-                                    if table_header in first_finals_week:
-                                        if has_more_than_allowed_shifts_in_first_week(employee_obj):
-                                            logging.info(f"{first_name_cell} - {employee_obj.name} already has {employee_obj.first_week_shift_count}/{first_final_week_max_allowed_shifts} shifts so moving to next commentor")
-                                            continue
-                                    else: 
-                                        if has_more_than_allowed_shifts_in_second_week(employee_obj):
-                                            logging.info(f"{first_name_cell} - {employee_obj.name} already has  {employee_obj.second_week_shift_count}/{second_final_week_max_allowed_shifts} shifts so moving to next commentor")
-                                            continue
-                                    has_conflict = employee_obj.has_conflict(table_header, time_cell)
-                                    if has_conflict:
-                                        logging.info(f"{first_name_cell} - There was a shift conflict for {comment_item[1]} so moving to next commentor.")
-                                        continue
-                                    assign_shift_to = comment_item[1]
-                                    break
-                                else: 
-                                    assign_shift_to = comment_item[1]
-                                    break
-                            else:
-                                if employee_obj:
-                                    
-                                    has_conflict = employee_obj.has_conflict(table_header, time_cell)
-                                    has_dish_or_pot_shift = employee_obj.dish_or_pot_shift_taken
-                                    # if not has_dish_or_pot_shift:
-                                    #     logging.info(f"{first_name_cell} - {comment_item[1]} doesn't have dish or pot room shift so moving to next commentor.")
-                                    #     continue
-                                    if table_header in first_finals_week:
-                                        if has_more_than_allowed_shifts_in_first_week(employee_obj):
-                                            logging.info(f"{first_name_cell} - {employee_obj.name} already has {employee_obj.first_week_shift_count}/{first_final_week_max_allowed_shifts} shifts so moving to next commentor")
-                                            continue
-                                    else: 
-                                        if has_more_than_allowed_shifts_in_second_week(employee_obj):
-                                            logging.info(f"{first_name_cell} - {employee_obj.name} already has  {employee_obj.second_week_shift_count}/{second_final_week_max_allowed_shifts} shifts so moving to next commentor")
-                                            continue
-                                    if has_conflict:
-                                        logging.info(f"{first_name_cell} - There was a shift conflict for {comment_item[1]} so moving to next commentor.")
-                                        continue
-                                    
-                                    assign_shift_to = comment_item[1]
-                                    break
-                                else: # if employee_obj not found for non dish shifts that means person doesn't have dish shift yet.
-                                    logging.info(f"{first_name_cell} - {comment_item[1]} doesn't have dish or pot room shift so moving to next commentor.")
-                                    continue
-                            
-                        else: 
-                            logging.info(f"{first_name_cell} - {comment_item[1]} has commented for someone else so moving on to next person.")
-                    if len(assign_shift_to) > 0:    
-                        first_name, last_name = get_name_parts(assign_shift_to)
-                        first_name_cell.value = first_name
-                        last_name_cell.value = last_name
-                        if resolve_comments_after_assigned:
-                            first_name_cell.comment = None
-                            last_name_cell.comment = None
-                        if assign_shift_to not in shift_assignments:
-                            shift_assigned_employee = Employee(assign_shift_to)
-                        else: 
-                            shift_assigned_employee = shift_assignments.get(assign_shift_to)
-                        shift_assigned_employee.add_shift(sheet, table_header, time_cell.value)
-                        shift_assignments[assign_shift_to] = shift_assigned_employee
-                    else:
-                        logging.info(f"{first_name_cell} - Unassigned because no valid commentator found.")
-                        if resolve_comments_after_unassigned and not is_unassigned_due_to_warning:
-                            first_name_cell.comment = None
-                            last_name_cell.comment = None
-                            continue
-                    
-                    
-
-        results = shift_assignments
-        logging.info(f"workout processing completed. Total {processed_rows_count} shifts processed")
-        #Save changes to the workbook
-        workbook.save(filename=file_path)
-        
-        logging.info("Workbook processing completed successfully.")
-    except Exception as e:
-    # Log and print the error message with line number
-        error_message = f"An error occurred: {e} | Additional Details: first name={first_name_cell.value} last name = {last_name_cell.value}"
-        logging.error(error_message)
-        
-        # Get the traceback and extract the line number
-        traceback_details = traceback.format_exc()
-        print(f"{error_message}\nTraceback details:\n{traceback_details}")
-
-    return results
-
-# Example function usage
-file_path = "Worcester Final week Schedule 2024.xlsx"  # Replace with your .xlsx file name
-sheets_to_analyze = ["Dish", "Pot Room", "Line", "Kitchen", "Stir Fry", "Sushi","International Kitchen", "Grab & Go", "Salad Room"]  # Replace with sheet names to analyze
-#sheets_to_analyze = ["Dish"]
-shift_assignments = load_and_assign_shift_xlsx(file_path, sheets_to_analyze)
-output_file = "shift_assignments"
-is_this_final_week_schedule = False
+"""
+The resolver moved to src/assignment_engine.py. Importing assignment_engine still works and gives
+that same module, so settings changed through either name (e.g. max_allowed_shifts) are shared.
+"""
+import sys
+
+if __name__ == "__main__":
+    import runpy
+    runpy.run_module("src.assignment_engine", run_name="__main__")
+else:
+    from src import assignment_engine
+    sys.modules[__name__] = assignment_engine
@@ -0,0 +1,87 @@
+"""
+Compare the scalar and NumPy backends of the cap and conflict checks at thousands of employees.
+
+Two measurements, each checked to give the same decisions on both backends:
+- batch: every employee gets random shifts (a few crossing midnight), then slots
+  with --candidates commenters each are checked against all of them at once;
+- greedy: assign_greedy on a synthetic schedule with --employees commenters.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_availability [--employees 5000] [--candidates 50] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import time
+from src import assignment_engine
+from src.employee import Employee
+from src.availability_matrix import AvailabilityMatrix
+from src.calendar_policy import CalendarPolicy
+from src.data_extractor import ShiftSlot, iter_shift_slots
+from src.parsing import is_valid_time_format
+from benchmarks.bench_resolver import workbook_directory
+from benchmarks.synthetic_schedule import default_sheets, generate_schedule, get_random_time
+
+
+def bench_batch(employee_count, candidate_count, query_count, seed=0):
+    rng = random.Random(seed)
+    calendar_policy = CalendarPolicy(max_shifts_per_week=5, max_hours_per_week=20)
+    dates = [f"2025-01-{day:02d}" for day in range(6, 20)]
+    names = [f"Person {index}" for index in range(employee_count)]
+    shift_assignments = {}
+    # All random times fall on 15 minute buckets.
+    availability = AvailabilityMatrix(calendar_policy, bucket_minutes=15)
+    for name in names:
+        employee_obj = shift_assignments[name] = Employee(name, calendar_policy)
+        for _ in range(rng.randint(1, 6)):
+            date, time_range = rng.choice(dates), get_random_time(rng)
+            employee_obj.add_shift("Dish", date, time_range)
+            availability.add_shift(name, date, time_range, employee_obj.shifts[-1].hours)
+    queries = [(ShiftSlot("Dish", rng.choice(dates), 0, 3, 4, get_random_time(rng), None, None, None), rng.sample(names, candidate_count))
+               for _ in range(query_count)]
+
+    start = time.perf_counter()
+    scalar = [{name: assignment_engine.get_rejection(shift_assignments[name], slot) for name in candidates}
+              for slot, candidates in queries]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = [availability.get_rejections(candidates, slot.header, slot.time, assignment_engine.get_slot_hours(slot), shift_assignments)
+               for slot, candidates in queries]
+    numpy_seconds = time.perf_counter() - start
+    return scalar_seconds, numpy_seconds, scalar == batched
+
+
+def bench_greedy(employee_count, seed=0):
+    os.makedirs(workbook_directory, exist_ok=True)
+    file_path = os.path.join(workbook_directory, f"schedule_{employee_count}_employees_seed{seed}.xlsx")
+    if not os.path.exists(file_path):
+        generate_schedule(file_path, days=18, slots_per_day=40, commenters=employee_count, seed=seed)
+    slots = [slot for slot in iter_shift_slots(file_path, default_sheets) if is_valid_time_format(slot.time)]
+
+    timings = {}
+    results = {}
+    for backend in ("scalar", "numpy"):
+        start = time.perf_counter()
+        with assignment_engine.quiet_pass():
+            results[backend], _ = assignment_engine.assign_greedy(slots, backend=backend)
+        timings[backend] = time.perf_counter() - start
+    return timings["scalar"], timings["numpy"], results["scalar"] == results["numpy"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the scalar and NumPy cap and conflict checks.")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--candidates", type=int, default=50, help="Commenters checked per slot in the batch benchmark")
+    parser.add_argument("--queries", type=int, default=2000, help="Slots checked in the batch benchmark")
+    args = parser.parse_args()
+
+    print(f"{'benchmark':40} {'scalar (ms)':>12} {'numpy (ms)':>12} {'same':>6}")
+    for name, (scalar_seconds, numpy_seconds, same) in (
+            (f"batch {args.candidates} candidates/slot", bench_batch(args.employees, args.candidates, args.queries)),
+            ("assign_greedy", bench_greedy(args.employees))):
+        print(f"{name:40} {scalar_seconds * 1000:12.2f} {numpy_seconds * 1000:12.2f} {str(same):>6}")
+
+
+if __name__ == "__main__":
+    main()
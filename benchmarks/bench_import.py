@@ -0,0 +1,61 @@
+"""
+Measure how long importing the resolver's modules takes and which heavy dependencies they load.
+
+Each import runs in a fresh interpreter, so nothing is already cached in sys.modules. The
+run fails (exit code 1) when a module loads openpyxl, yaml or numpy at import time, or when
+its import is slower than --max-ms.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_import [--repeat 5] [--max-ms 100]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+
+modules = ["src", "src.parsing", "src.employee", "src.data_extractor", "src.assignment_engine", "src.main"]
+heavy_dependencies = ["openpyxl", "yaml", "numpy", "multiprocessing"]
+probe = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [name for name in {heavy_dependencies!r} if name in sys.modules]]))
+"""
+
+
+def time_import(module, repeat):
+    """
+    Best import time of a module over repeat fresh interpreters, and the heavy dependencies it loaded.
+    """
+    best = float("inf")
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", probe.format(module=module, heavy_dependencies=heavy_dependencies)],
+                                capture_output=True, text=True, check=True).stdout
+        seconds, loaded = json.loads(output)
+        best = min(best, seconds)
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of the resolver's modules.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=100.0, help="Fail when an import takes longer than this")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':30} {'import (ms)':>12}  heavy dependencies loaded")
+    for module in modules:
+        seconds, loaded = time_import(module, args.repeat)
+        print(f"{module:30} {seconds * 1000:12.2f}  {', '.join(loaded) or '-'}")
+        if loaded or seconds * 1000 > args.max_ms:
+            failures.append(module)
+    if failures:
+        print(f"Slow or heavy imports: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
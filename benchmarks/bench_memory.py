@@ -0,0 +1,156 @@
+"""
+Measure the peak memory of resolving long comment threads and of extracting comments from large workbooks.
+
+Two measurements, each checked to give the same result both ways:
+- threads: resolving one slot whose thread has --thread-lengths comments, the newest one
+  valid, with the whole thread parsed first (get_slot_comments) and with a whole
+  assign_greedy call, which registers the commenters one comment at a time and parses the
+  thread lazily, newest first. Both include creating the run's employee registry;
+- extract: synthetic workbooks with --sheet-counts sheets of --days tables each, saved as
+  JSON from the list of extract_tables_and_comments and streamed from iter_tables_and_comments.
+  A full (not read-only) load of each workbook, what the extractor used to do, is shown for scale.
+
+Each measurement runs in a fresh process and reports how much its peak resident set size
+(RSS) grew, so the C allocations of zlib, expat and lxml are counted too. The assign_greedy
+peak stays flat whatever the thread length. The streamed extraction holds one sheet and one
+table at a time, so it does not grow with the number of tables, but it is not flat in the
+number of sheets: openpyxl parses the start of every sheet when it opens a workbook, about
+65 KB of peak RSS per sheet.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_memory [--thread-lengths 10 1000 100000] [--sheet-counts 1 4 16] [--days 30]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import openpyxl  # Imported before measuring, so its import is not counted
+from src import assignment_engine
+from src.data_extractor import ShiftSlot, extract_tables_and_comments, iter_tables_and_comments, save_to_json
+from src.employee_registry import employee_registry_for
+from src.parsing import COMMENT_SEPARATOR, COMMENTER_SEPARATOR
+from benchmarks.bench_resolver import workbook_directory
+from benchmarks.synthetic_schedule import generate_schedule
+
+
+def reset_peak_rss():
+    """
+    Start counting the peak resident set size (RSS) from the current one, where Linux allows it.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def get_peak_rss():
+    """
+    Peak resident set size of this process in bytes, since reset_peak_rss on Linux.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024  # KiB everywhere but macOS
+
+
+def run_in_new_process(func, *args):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(func, *args).result()
+
+
+def get_thread_slot(thread_length):
+    """
+    A Dish slot whose thread has thread_length - 1 comments for someone else, then one valid comment.
+    """
+    comments = [f"Person {index % 50}{COMMENTER_SEPARATOR}Commenter {index % 50}" for index in range(thread_length - 1)]
+    comments.append(f"Newest{COMMENTER_SEPARATOR}Newest Commenter")
+    return ShiftSlot("Dish", "2024-12-11", 5, 3, 4, "9:00AM-1:00PM", None, None, COMMENT_SEPARATOR.join(comments))
+
+
+def measure_thread(thread_length, lazy):
+    """
+    Returns:
+        tuple: (commenter picked, peak RSS growth in bytes while creating the registry and picking it).
+    """
+    slot = get_thread_slot(thread_length)
+    with assignment_engine.quiet_pass():
+        reset_peak_rss()
+        start_rss = get_peak_rss()
+        if lazy:
+            assignees, _ = assignment_engine.assign_greedy([slot])
+            result = assignees[0]
+        else:
+            with employee_registry_for([slot]):
+                result, _ = assignment_engine.find_last_valid_commenter(slot, {}, assignment_engine.get_slot_comments(slot))
+        return result, get_peak_rss() - start_rss
+
+
+def measure_extract(file_path, sheets, mode, output_file=None):
+    """
+    Returns:
+        int: Peak RSS growth in bytes while loading the workbook fully (mode "full load") or saving its
+             comments to output_file from a list (mode "list") or streamed (mode "streamed").
+    """
+    reset_peak_rss()
+    start_rss = get_peak_rss()
+    if mode == "full load":
+        openpyxl.load_workbook(file_path, data_only=True).close()
+    elif mode == "list":
+        save_to_json(extract_tables_and_comments(file_path, sheets), output_file)
+    else:
+        save_to_json(iter_tables_and_comments(file_path, sheets), output_file)
+    return get_peak_rss() - start_rss
+
+
+def bench_threads(thread_lengths):
+    print(f"{'comments':>10} {'parsed first':>14} {'assign_greedy':>14}")
+    for thread_length in thread_lengths:
+        parsed, parsed_rss = run_in_new_process(measure_thread, thread_length, False)
+        lazy, lazy_rss = run_in_new_process(measure_thread, thread_length, True)
+        if parsed != lazy:
+            raise AssertionError(f"assign_greedy picked {lazy}, parsing first picked {parsed}")
+        print(f"{thread_length:10} {parsed_rss / 2 ** 20:11.1f} MB {lazy_rss / 2 ** 20:11.1f} MB")
+
+
+def bench_extract(sheet_counts, days):
+    print(f"{'sheets':>7} {'tables':>7} {'full load':>12} {'list':>12} {'streamed':>12}")
+    for sheet_count in sheet_counts:
+        file_path = os.path.join(workbook_directory, f"memory_{sheet_count}_sheets_{days}_days.xlsx")
+        sheets = [f"Sheet {index + 1}" for index in range(sheet_count)]
+        if not os.path.exists(file_path):
+            generate_schedule(file_path, sheets=sheets, days=days)
+        list_path = file_path.replace(".xlsx", "_list.json")
+        streamed_path = file_path.replace(".xlsx", "_streamed.json")
+
+        full_rss = run_in_new_process(measure_extract, file_path, sheets, "full load")
+        list_rss = run_in_new_process(measure_extract, file_path, sheets, "list", list_path)
+        streamed_rss = run_in_new_process(measure_extract, file_path, sheets, "streamed", streamed_path)
+        with open(list_path) as list_file, open(streamed_path) as streamed_file:
+            if list_file.read() != streamed_file.read():
+                raise AssertionError(f"Streamed JSON of {file_path} differs from the JSON of the list")
+        print(f"{sheet_count:7} {sheet_count * days:7} {full_rss / 2 ** 20:9.1f} MB "
+              f"{list_rss / 2 ** 20:9.1f} MB {streamed_rss / 2 ** 20:9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--thread-lengths", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--sheet-counts", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    os.makedirs(workbook_directory, exist_ok=True)
+    bench_threads(args.thread_lengths)
+    print()
+    bench_extract(args.sheet_counts, args.days)
+
+
+if __name__ == "__main__":
+    main()
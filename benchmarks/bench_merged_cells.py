@@ -0,0 +1,71 @@
+"""
+Benchmark merged-cell lookups on the bundled schedule.
+
+Compares the old per-cell scan over worksheet.merged_cells.ranges with the
+precomputed MergedCellIndex for the name cells the resolver checks.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_merged_cells [path/to/schedule.xlsx]
+"""
+import sys
+import time
+from openpyxl import load_workbook
+from src.merged_cells import MergedCellIndex
+
+
+file_path = "Worcester Final week Schedule 2024.xlsx"
+sheets_to_analyze = ["Dish", "Pot Room", "Line", "Kitchen", "Stir Fry", "Sushi", "International Kitchen", "Grab & Go", "Salad Room"]
+repeats = 5
+
+
+def scan_is_merged_cell(cell):
+    for merged_range in cell.parent.merged_cells.ranges:
+        if cell.coordinate in merged_range:
+            return True
+    return False
+
+
+def get_name_cells(workbook):
+    name_cells = []
+    for sheet in sheets_to_analyze:
+        if sheet not in workbook.sheetnames:
+            continue
+        for row in workbook[sheet].iter_rows():
+            if sheet == "Kitchen":
+                name_cells.extend(row[3:5])
+            else:
+                name_cells.extend(row[2:4])
+    return name_cells
+
+
+def time_call(func):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(path):
+    workbook = load_workbook(filename=path, data_only=False)
+    name_cells = get_name_cells(workbook)
+
+    scan_time, scan_hits = time_call(lambda: sum(scan_is_merged_cell(cell) for cell in name_cells))
+
+    def indexed():
+        indexes = {sheet: MergedCellIndex(workbook[sheet].merged_cells.ranges) for sheet in sheets_to_analyze if sheet in workbook.sheetnames}
+        return sum(cell in indexes[cell.parent.title] for cell in name_cells)
+
+    index_time, index_hits = time_call(indexed)
+    if scan_hits != index_hits:
+        raise AssertionError(f"Index found {index_hits} merged cells, scan found {scan_hits}")
+
+    print(f"{len(name_cells)} name cells checked, {scan_hits} merged")
+    print(f"range scan : {scan_time * 1000:8.2f} ms")
+    print(f"index      : {index_time * 1000:8.2f} ms (including index build)")
+    print(f"speedup    : {scan_time / index_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else file_path)
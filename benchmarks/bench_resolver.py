@@ -0,0 +1,268 @@
+"""
+Benchmark the resolver hot paths on synthetic schedules at several scales.
+
+Times load_and_assign_shift_xlsx, is_merged_cell, parse_comments and
+Employee.has_conflict on workbooks from benchmarks/synthetic_schedule.py, and
+compares each timing with a baseline saved on the same machine. The run fails
+(exit code 1) when a timing is slower than its baseline by more than the threshold
+factor and by more than --min-delta-ms, so sub-millisecond noise does not count.
+
+Timings are machine specific, so the baseline is not part of the repository
+(benchmarks/baseline.json by default, ignored by git). Either of:
+- --against REF (e.g. --against HEAD or --against main) runs the benchmarks of that
+  git revision in a temporary worktree, saves their timings as the baseline, then
+  times the working tree against it: one command checks a change;
+- a run without a baseline file saves its own timings as the baseline, so running
+  once before a change and once after it checks the change. --save-baseline
+  overwrites an existing baseline.
+
+Each benchmark is warmed up and repeated until it has run for MIN_SECONDS, so short
+benchmarks get many samples, and a benchmark over the threshold is measured again
+before it counts as a regression. A busy or throttled machine slows every benchmark
+alike, so every run also times a fixed calibration workload that uses none of the
+resolver code, and the baseline timings are scaled by how much slower it got (the
+noise floor, at least 1). A regression of the resolver itself does not move it,
+however many benchmarks it slows down.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_resolver [--scales 1,10,100] [--threshold 1.5] [--against REF] [--save-baseline] [--baseline path]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from openpyxl import load_workbook
+from src import assignment_engine
+from src.employee import Employee
+from src import merged_cells
+from src.data_extractor import iter_shift_slots
+from src.sheet_layout import find_sheet_layout
+from src.parsing import clear_caches, parse_comments
+from benchmarks.synthetic_schedule import default_sheets, format_time, generate_schedule, get_scale_parameters
+
+
+baseline_path = os.path.join(os.path.dirname(__file__), "baseline.json")
+workbook_directory = os.path.join(tempfile.gettempdir(), "shift_resolver_benchmarks")
+repeats = 3
+# Short benchmarks are repeated until their runs add up to this many seconds.
+MIN_SECONDS = 0.25
+# Baseline entry holding the time of the calibration workload.
+CALIBRATION = "_calibration"
+
+
+def get_workbook(scale, seed=0):
+    """
+    Path of the synthetic workbook for a scale, generated on first use and reused afterwards.
+    """
+    os.makedirs(workbook_directory, exist_ok=True)
+    file_path = os.path.join(workbook_directory, f"schedule_{scale}x_seed{seed}.xlsx")
+    if not os.path.exists(file_path):
+        generate_schedule(file_path, seed=seed, **get_scale_parameters(scale))
+    return file_path
+
+
+def time_best(func, setup=None, repeat=repeats, min_seconds=MIN_SECONDS):
+    """
+    Best wall time of func over at least repeat runs, and as many more as needed to reach
+    min_seconds in total, calling setup (untimed) before each run. With repeat greater than 1
+    an untimed run warms up caches first.
+    """
+    def run_once():
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        func(argument) if setup else func()
+        return time.perf_counter() - start
+
+    if repeat > 1:
+        run_once()
+    best = float("inf")
+    total = 0.0
+    runs = 0
+    while runs < repeat or (repeat > 1 and total < min_seconds):
+        seconds = run_once()
+        best = min(best, seconds)
+        total += seconds
+        runs += 1
+    return best
+
+
+def bench_load_and_assign(file_path, scale):
+    work_path = os.path.join(workbook_directory, "resolver_run.xlsx")
+
+    def copy_workbook():
+        shutil.copyfile(file_path, work_path)
+        clear_caches()
+        return work_path
+
+    return time_best(lambda path: assignment_engine.load_and_assign_shift_xlsx(path, default_sheets), setup=copy_workbook,
+                     repeat=1 if scale >= 100 else repeats)
+
+
+def bench_is_merged_cell(file_path):
+    workbook = load_workbook(filename=file_path, data_only=False)
+    name_cells = []
+    for sheet in default_sheets:
+        _, first_name_column, last_name_column = find_sheet_layout(workbook[sheet].iter_rows(values_only=True))
+        for row in workbook[sheet].iter_rows():
+            name_cells.append(row[first_name_column - 1])
+            name_cells.append(row[last_name_column - 1])
+
+    def check_all(_):
+        for cell in name_cells:
+            assignment_engine.is_merged_cell(cell)
+
+    # Clear the per-worksheet indexes so each run includes building them.
+    return time_best(check_all, setup=merged_cells._index_cache.clear)
+
+
+def bench_parse_comments(file_path):
+    raw_comments = [slot.comment for slot in iter_shift_slots(file_path, default_sheets) if slot.comment]
+    return time_best(lambda: [parse_comments(raw_comment) for raw_comment in raw_comments])
+
+
+def bench_has_conflict(scale):
+    rng = random.Random(0)
+    parameters = get_scale_parameters(scale)
+    dates = [f"2024-12-{day:02d}" if day <= 31 else f"day-{day}" for day in range(11, 11 + parameters["days"])]
+    times = [f"{format_time(start)} - {format_time(start + length)}"
+             for start in range(7 * 60, 20 * 60, 30) for length in (120, 180, 240)]
+    employees = []
+    for index in range(parameters["commenters"]):
+        employee_obj = Employee(f"Person {index}")
+        for date in rng.sample(dates, min(len(dates), 6)):
+            employee_obj.add_shift("Dish", date, rng.choice(times))
+        employees.append(employee_obj)
+    queries = [(rng.choice(employees), rng.choice(dates), rng.choice(times)) for _ in range(20000)]
+
+    def check_all():
+        for employee_obj, date, time_range in queries:
+            employee_obj.has_conflict(date, time_range)
+
+    clear_caches()
+    return time_best(check_all)
+
+
+def calibration_workload():
+    """
+    Fixed pure-Python work (string formatting, dict counting, sorting and splitting) that
+    shares no code with the resolver, so its time only moves with the machine's speed.
+    """
+    rng = random.Random(0)
+    words = [f"{rng.random():.8f}" for _ in range(50000)]
+    counts = {}
+    for word in words:
+        counts[word[2:5]] = counts.get(word[2:5], 0) + 1
+    sorted(words)
+    return len(" ".join(words).split("7")) + len(counts)
+
+
+def time_calibration():
+    return time_best(calibration_workload)
+
+
+def get_benchmarks(scales):
+    """
+    Returns:
+        dict: Benchmark name -> function returning its best time in seconds.
+    """
+    benchmarks = {}
+    for scale in scales:
+        file_path = get_workbook(scale)
+        benchmarks[f"load_and_assign_shift_xlsx@{scale}x"] = lambda file_path=file_path, scale=scale: bench_load_and_assign(file_path, scale)
+        benchmarks[f"is_merged_cell@{scale}x"] = lambda file_path=file_path: bench_is_merged_cell(file_path)
+        benchmarks[f"parse_comments@{scale}x"] = lambda file_path=file_path: bench_parse_comments(file_path)
+        benchmarks[f"Employee.has_conflict@{scale}x"] = lambda scale=scale: bench_has_conflict(scale)
+    return benchmarks
+
+
+def is_regression(seconds, baseline_seconds, threshold, min_delta_ms, noise_floor=1.0):
+    """
+    Whether seconds is slower than baseline_seconds by more than threshold times the noise floor
+    (how much slower the calibration workload got, at least 1) and by more than min_delta_ms.
+    """
+    baseline_seconds *= max(noise_floor, 1.0)
+    return seconds / baseline_seconds > threshold and (seconds - baseline_seconds) * 1000 > min_delta_ms
+
+
+def save_baseline_of(revision, baseline_file, scales):
+    """
+    Run the benchmarks of a git revision in a temporary worktree and save their timings to baseline_file.
+    The revision must include this benchmark harness.
+    """
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.exists(baseline_file):
+        os.remove(baseline_file)  # Only the revision's timings, none left from an older baseline
+    worktree = tempfile.mkdtemp(prefix="shift_resolver_baseline_")
+    subprocess.run(["git", "worktree", "add", "--detach", worktree, revision], cwd=repository, check=True)
+    try:
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_resolver", "--save-baseline", "--baseline",
+                        os.path.abspath(baseline_file), "--scales", scales], cwd=worktree, check=True)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=repository, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resolver hot paths.")
+    parser.add_argument("--scales", default="1,10,100", help="Comma separated scale factors")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Fail when a timing exceeds baseline x threshold")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these timings as the new baseline")
+    parser.add_argument("--against", metavar="REF", help="Save the timings of this git revision as the baseline first")
+    parser.add_argument("--baseline", default=baseline_path, help="Baseline file of this machine")
+    args = parser.parse_args()
+
+    if args.against:
+        save_baseline_of(args.against, args.baseline, args.scales)
+    assignment_engine.configure_logging()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+    save_baseline = args.save_baseline or not baseline
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    benchmarks = get_benchmarks(scales)
+    calibration_seconds = time_calibration()
+    results = {name: benchmark() for name, benchmark in benchmarks.items()}
+    # Timed before and after the benchmarks, the faster run is the machine's speed during both
+    calibration_seconds = min(calibration_seconds, time_calibration())
+
+    noise_floor = calibration_seconds / baseline[CALIBRATION] if baseline.get(CALIBRATION) else 1.0
+    regressions = []
+    print(f"{'benchmark':40} {'time (ms)':>12} {'baseline':>12} {'ratio':>8}")
+    for name, seconds in results.items():
+        baseline_seconds = baseline.get(name)
+        if baseline_seconds:
+            if not save_baseline and is_regression(seconds, baseline_seconds, args.threshold, args.min_delta_ms, noise_floor):
+                # Measure again, a single slow measurement is often noise
+                seconds = results[name] = min(seconds, benchmarks[name]())
+                if is_regression(seconds, baseline_seconds, args.threshold, args.min_delta_ms, noise_floor):
+                    regressions.append(name)
+            print(f"{name:40} {seconds * 1000:12.2f} {baseline_seconds * 1000:12.2f} {seconds / baseline_seconds:8.2f}")
+        else:
+            print(f"{name:40} {seconds * 1000:12.2f} {'-':>12} {'-':>8}")
+
+    if baseline.get(CALIBRATION):
+        print(f"Noise floor (calibration {calibration_seconds * 1000:.2f} ms, baseline "
+              f"{baseline[CALIBRATION] * 1000:.2f} ms): {noise_floor:.2f}")
+    if save_baseline:
+        if not baseline:
+            print(f"No baseline at {args.baseline} yet, these timings become the baseline")
+        baseline.update({name: round(seconds, 6) for name, seconds in results.items()})
+        baseline[CALIBRATION] = round(calibration_seconds, 6)
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=4, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"Regression over {args.threshold}x baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
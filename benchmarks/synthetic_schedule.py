@@ -0,0 +1,149 @@
+"""
+Generate synthetic schedule workbooks in the layout the resolver expects.
+
+Each sheet holds one table per day: a date header row (merged across the
+time and name columns), a "Time / First Name / Last Name" label row and one
+row per shift slot. The Kitchen sheet is shifted one column to the right.
+Slots are either open with a comment thread on the first name cell, already
+filled with a name, or closed with the name cells merged. Comment threads use
+the same delimiters as the exported workbook, and include comments made for
+someone else and comments without a commenter.
+
+Usage (from the repository root):
+    python -m benchmarks.synthetic_schedule output.xlsx [--scale N] [--seed N]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from openpyxl import Workbook
+from openpyxl.comments import Comment
+
+
+default_sheets = ["Dish", "Pot Room", "Line", "Kitchen", "Stir Fry", "Sushi", "International Kitchen", "Grab & Go", "Salad Room"]
+first_names = ["Aarav", "Bianca", "Chen", "Diego", "Esha", "Farah", "Gabriel", "Hana", "Ivan", "Jia", "Kofi", "Lena",
+               "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rohan", "Sofia", "Tariq", "Uma", "Victor", "Wen", "Yusuf"]
+last_names = ["Patel", "Rossi", "Li", "Garcia", "Kumar", "Haddad", "Silva", "Sato", "Petrov", "Wang", "Mensah", "Novak",
+              "Lopez", "Rahman", "Ali", "Sharma", "Brooks", "Mehta", "Costa", "Aziz", "Reddy", "Hugo", "Zhang", "Demir"]
+slot_starts = [7 * 60, 8 * 60 + 30, 10 * 60, 11 * 60 + 30, 13 * 60, 14 * 60 + 30, 16 * 60, 17 * 60 + 30, 19 * 60]
+
+
+def format_time(minutes):
+    hour, minute = divmod(minutes, 60)
+    period = "AM" if hour < 12 else "PM"
+    hour = hour % 12 or 12
+    return f"{hour}:{minute:02d}{period}"
+
+
+def get_random_time(rng):
+    """
+    Random time range on 15 minute buckets, starting between 6:00AM and 11:00PM and lasting 2 to 5
+    hours, so some ranges cross midnight.
+    """
+    start = rng.randrange(6 * 60, 23 * 60, 15)
+    return f"{format_time(start)} - {format_time((start + rng.choice([120, 180, 240, 300])) % (24 * 60))}"
+
+
+def get_people(commenters):
+    people = []
+    for index in range(commenters):
+        first_name = first_names[index % len(first_names)]
+        last_name = last_names[(index // len(first_names)) % len(last_names)]
+        if index >= len(first_names) * len(last_names):
+            last_name += f"-{index}"
+        people.append((first_name, last_name))
+    return people
+
+
+def get_comment_thread(rng, people):
+    """
+    Build a comment thread of 1 to 5 comments, oldest first.
+    """
+    comments = []
+    for _ in range(rng.randint(1, 5)):
+        first_name, last_name = rng.choice(people)
+        kind = rng.random()
+        if kind < 0.1:
+            # Commented for someone else.
+            other_first_name, _ = rng.choice(people)
+            comments.append(f"{other_first_name}\n\t-{first_name} {last_name}")
+        elif kind < 0.13:
+            # No commenter, resolved as "Unknown".
+            comments.append(f"{first_name} please")
+        else:
+            comments.append(f"{first_name}\n\t-{first_name} {last_name}")
+    return "\n----\n".join(comments)
+
+
+def generate_schedule(file_path, sheets=None, days=9, slots_per_day=8, commenters=80, seed=0,
+                      start_date=datetime(2024, 12, 11)):
+    """
+    Write a synthetic schedule workbook.
+
+    Parameters:
+        file_path (str): Path of the .xlsx file to write.
+        sheets (list): Sheet names, defaults to the sheets the resolver analyzes.
+        days (int): Number of daily tables per sheet.
+        slots_per_day (int): Number of shift rows per table.
+        commenters (int): Number of distinct people commenting.
+        seed (int): Seed of the random generator, the same seed gives the same workbook.
+        start_date (datetime): Date of the first table.
+
+    Returns:
+        int: Number of shift rows written.
+    """
+    rng = random.Random(seed)
+    people = get_people(commenters)
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    slot_count = 0
+    for sheet in sheets or default_sheets:
+        worksheet = workbook.create_sheet(sheet)
+        time_column = 3 if sheet == "Kitchen" else 2
+        worksheet.cell(row=1, column=1, value=f"{sheet} Schedule")
+        worksheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=time_column + 2)
+        row = 3
+        for day in range(days):
+            worksheet.cell(row=row, column=time_column, value=start_date + timedelta(days=day))
+            worksheet.merge_cells(start_row=row, start_column=time_column, end_row=row, end_column=time_column + 2)
+            row += 1
+            worksheet.cell(row=row, column=time_column, value="Time")
+            worksheet.cell(row=row, column=time_column + 1, value="First Name")
+            worksheet.cell(row=row, column=time_column + 2, value="Last Name")
+            row += 1
+            for slot in range(slots_per_day):
+                start = slot_starts[slot % len(slot_starts)]
+                end = start + rng.choice([120, 150, 180, 210, 240])
+                worksheet.cell(row=row, column=time_column, value=f"{format_time(start)} - {format_time(end)}")
+                kind = rng.random()
+                if kind < 0.05:
+                    worksheet.cell(row=row, column=time_column + 1, value="CLOSED")
+                    worksheet.merge_cells(start_row=row, start_column=time_column + 1, end_row=row, end_column=time_column + 2)
+                elif kind < 0.15:
+                    first_name, last_name = rng.choice(people)
+                    worksheet.cell(row=row, column=time_column + 1, value=first_name)
+                    worksheet.cell(row=row, column=time_column + 2, value=last_name)
+                else:
+                    comment = Comment(get_comment_thread(rng, people), "Scheduler")
+                    worksheet.cell(row=row, column=time_column + 1).comment = comment
+                slot_count += 1
+                row += 1
+            row += 1
+    workbook.save(file_path)
+    return slot_count
+
+
+def get_scale_parameters(scale):
+    """
+    Generator parameters for a scale factor, 1 being about the size of a finals-week workbook.
+    """
+    return {"days": 9 * scale, "slots_per_day": 8, "commenters": 80 * scale}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic schedule workbook.")
+    parser.add_argument("file_path")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    slot_count = generate_schedule(args.file_path, seed=args.seed, **get_scale_parameters(args.scale))
+    print(f"Wrote {slot_count} shift rows to {args.file_path}")
@@ -0,0 +1,34 @@
+"""
+Shift resolver package. The names below are imported on first use, so importing the package
+(or a light module such as src.parsing) does not load the resolver, openpyxl, YAML or NumPy.
+"""
+from importlib import import_module
+
+
+_lazy_names = {
+    "load_and_assign_shift_xlsx": "src.assignment_engine",
+    "load_and_assign_shift_xlsx_batch": "src.assignment_engine",
+    "configure_logging": "src.assignment_engine",
+    "default_sheets_to_analyze": "src.assignment_engine",
+    "Employee": "src.employee",
+    "CalendarPolicy": "src.calendar_policy",
+    "EmployeeRegistry": "src.employee_registry",
+    "RuleSet": "src.rules",
+    "ShiftSlot": "src.data_extractor",
+    "extract_tables_and_comments": "src.data_extractor",
+    "iter_shift_slots": "src.data_extractor",
+    "iter_tables_and_comments": "src.data_extractor",
+    "parse_comments": "src.parsing",
+    "parse_time_range": "src.parsing",
+    "ResolutionService": "src.resolution_service",
+    "simulate_workbook": "src.simulation",
+}
+
+__all__ = list(_lazy_names)
+
+
+def __getattr__(name):
+    module_name = _lazy_names.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'src' has no attribute '{name}'")
+    return getattr(import_module(module_name), name)
@@ -0,0 +1,848 @@
+import traceback
+from src.employee import Employee, get_duration
+from src.availability_matrix import AvailabilityMatrix
+from src.calendar_policy import get_calendar_policy
+from src.config_loader import load_config
+from src.merged_cells import get_merged_cell_index
+from src.data_extractor import extract_workbooks_slots, iter_shift_slots
+from src.employee_registry import employee_registry_for, get_aliases, get_employee_registry
+from src.min_cost_flow import MinCostFlow
+from src.rules import NOT_CHECKED, get_rule_set
+from src.report_generator import save_assignments_csv, save_assignments_json
+from src.parsing import get_cache_info, is_valid_time_format, iter_comments_newest_first, parse_comments, parse_time_range
+from src.snapshot import get_slot_fingerprint, get_slot_key, load_snapshot, save_snapshot
+from src.instrumentation import stats
+from contextlib import contextmanager
+from time import perf_counter
+import logging
+
+
+max_allowed_shifts = 6
+resolve_comments_after_assigned = True 
+resolve_comments_after_unassigned = False
+default_sheets_to_analyze = ["Dish", "Pot Room", "Line", "Kitchen", "Stir Fry", "Sushi", "International Kitchen", "Grab & Go", "Salad Room"]
+
+
+def configure_logging(log_file="shift_assignment.log", level=logging.INFO):
+    """
+    Send the resolver's log messages to a file. Importing this module leaves logging untouched,
+    so scripts call this (the command line does) and applications configure logging themselves.
+    """
+    logging.basicConfig(
+        filename=log_file,
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+
+
+def is_merged_cell(cell):
+    """
+    Check if a given cell is part of a merged cell range.
+
+    :param cell: An openpyxl cell object to check.
+    :return: True if the cell is part of a merged range, False otherwise.
+    """
+    return cell in get_merged_cell_index(cell.parent)
+
+def get_name_parts(assign_shift_to):
+    return get_employee_registry().get_name_parts(assign_shift_to)
+
+
+def write_assignments(file_path, decisions):
+    """
+    Apply the resolver's decisions to the workbook in one batched write.
+
+    openpyxl can only save a workbook it has fully loaded, so this loads every cell, style and
+    comment of the file and writes the whole file back, however few cells change. It is the
+    slowest step and the peak of memory of a run that writes the workbook.
+
+    Parameters:
+        file_path (str): Path to the .xlsx file.
+        decisions (list): (slot, first_name, last_name, clear_comments) tuples. When first_name is None
+                          the name cells are left as they are.
+    """
+    from openpyxl import load_workbook
+    workbook = load_workbook(filename=file_path, data_only=False)
+    for slot, first_name, last_name, clear_comments in decisions:
+        worksheet = workbook[slot.sheet]
+        first_name_cell = worksheet.cell(row=slot.row, column=slot.first_name_column)
+        last_name_cell = worksheet.cell(row=slot.row, column=slot.last_name_column)
+        if first_name is not None:
+            first_name_cell.value = first_name
+            last_name_cell.value = last_name
+        if clear_comments:
+            first_name_cell.comment = None
+            last_name_cell.comment = None
+    workbook.save(filename=file_path)
+
+
+def export_assignments(shift_assignments, json_path=None, csv_path=None):
+    with stats.timer("export"):
+        if json_path:
+            save_assignments_json(shift_assignments, json_path)
+            logging.info(f"Assignments saved to {json_path}")
+        if csv_path:
+            save_assignments_csv(shift_assignments, csv_path)
+            logging.info(f"Assignments saved to {csv_path}")
+
+
+def get_slot_comments(slot):
+    """
+    Return the (comment, commenter) tuples of a slot, oldest first, with each commenter's name
+    as registered in the employee registry (see src/employee_registry.py).
+    A slot whose name cells are already filled counts as a single comment by that person.
+    """
+    registry = get_employee_registry()
+    if slot.first_name:
+        assign_shift_to = registry.get_name(slot.first_name + " " + slot.last_name)
+        return [(slot.first_name, assign_shift_to)]
+    with stats.timer("comment_parsing"):
+        return [(comment, commenter if commenter == 'Unknown' else registry.get_name(commenter))
+                for comment, commenter in parse_comments(slot.comment)]
+
+
+def iter_slot_comments_newest_first(slot):
+    """
+    Yield the (comment, commenter) tuples of get_slot_comments, most recent first, parsing each
+    comment only when it is reached. Callers that stop at the first match of a long thread
+    never parse or hold the older comments.
+    """
+    registry = get_employee_registry()
+    if slot.first_name:
+        yield slot.first_name, registry.get_name(slot.first_name + " " + slot.last_name)
+        return
+    comment_items = iter_comments_newest_first(slot.comment)
+    while True:
+        # Timed item by item, the caller's own work between items is not comment parsing
+        start = perf_counter()
+        comment_item = next(comment_items, None)
+        if comment_item is not None:
+            comment, commenter = comment_item
+            comment_item = comment, commenter if commenter == 'Unknown' else registry.get_name(commenter)
+        stats.add_time("comment_parsing", perf_counter() - start)
+        if comment_item is None:
+            return
+        yield comment_item
+
+
+def get_slot_hours(slot):
+    return get_duration(*parse_time_range(slot.time))
+
+
+def get_rejection(employee_obj, slot, rejections=None):
+    """
+    Name of the rule rejecting an employee for a slot (e.g. "weekly_cap", "hours_cap" or "conflict"),
+    None if they can take it. The rules come from config/config.yaml, see src/rules.py.
+
+    Parameters:
+        employee_obj (Employee): The candidate, None for someone without any shift yet.
+        slot (ShiftSlot): The slot to take.
+        rejections (dict): Reasons already checked in a batch (see AvailabilityMatrix.get_rejections),
+                           employees missing from it are checked one rule at a time.
+    """
+    batch_rejection = NOT_CHECKED
+    if rejections is not None and employee_obj is not None:
+        batch_rejection = rejections.get(employee_obj.name, NOT_CHECKED)
+    return get_rule_set().get_rejection(employee_obj, slot, batch_rejection)
+
+
+def find_last_valid_commenter(slot, shift_assignments, processed_comments=None, rejections=None):
+    """
+    Pick the most recent commenter of a slot who commented for themselves and passes the rules
+    of the slot's sheet (see get_rejection). With the default rules these are the shift and hour
+    caps of the date's period or week, the shift conflict check and, outside Dish and Pot Room,
+    already having a shift. A slot whose name cells are already filled keeps that name even if
+    the rules reject it.
+
+    Parameters:
+        slot (ShiftSlot): The shift row to resolve.
+        shift_assignments (dict): Employee objects keyed by name, as assigned so far.
+        processed_comments (list): The slot's (comment, commenter) tuples, see get_slot_comments. None to
+                                   parse them lazily, newest first, up to the commenter picked.
+        rejections (dict): Rejection reasons of the commenters checked in a batch, None to check them one by one.
+
+    Returns:
+        tuple: (name of the commenter or "", True if an unresolvable comment was skipped).
+    """
+    registry = get_employee_registry()
+    assign_shift_to = ""
+    if slot.first_name:
+        assign_shift_to = registry.get_name(slot.first_name + " " + slot.last_name)
+    is_unassigned_due_to_warning = False
+    if processed_comments is None:
+        comment_items = iter_slot_comments_newest_first(slot)
+    else:
+        comment_items = reversed(processed_comments)
+    for comment_item in comment_items:
+        #check if the comment is by the same person.
+        if comment_item[1] == 'Unknown':
+            is_unassigned_due_to_warning = True
+            stats.count("rejected_unknown_commenter")
+            logging.warning("%s - There was a problem in resolving this comment please proceed manually.", slot)
+            continue
+
+        if registry.is_own_comment(comment_item[0], comment_item[1]):
+            rejection = get_rejection(shift_assignments.get(comment_item[1]), slot, rejections)
+            if rejection:
+                stats.count(f"rejected_{rejection}")
+                logging.debug("%s - %s is rejected by the %s rule so moving to next commentor.", slot, comment_item[1], rejection)
+                continue
+            assign_shift_to = comment_item[1]
+            break
+        else:
+            stats.count("rejected_commented_for_someone_else")
+            logging.debug("%s - %s has commented for someone else so moving on to next person.", slot, comment_item[1])
+    return assign_shift_to, is_unassigned_due_to_warning
+
+
+def get_slot_candidates(slot):
+    """
+    Return the distinct people who commented for themselves on a slot, most recent first.
+    """
+    registry = get_employee_registry()
+    candidates = []
+    candidate_ids = set()
+    for comment, commenter in iter_slot_comments_newest_first(slot):
+        if commenter != 'Unknown' and registry.is_own_comment(comment, commenter):
+            person_id = registry.get_id(commenter)
+            if person_id not in candidate_ids:
+                candidate_ids.add(person_id)
+                candidates.append(commenter)
+    return candidates
+
+
+def add_shift_to_employee(shift_assignments, assign_shift_to, slot):
+    shift_assigned_employee = shift_assignments.get(assign_shift_to)
+    if shift_assigned_employee is None:
+        shift_assigned_employee = Employee(assign_shift_to)
+        shift_assignments[assign_shift_to] = shift_assigned_employee
+    shift_assigned_employee.add_shift(slot.sheet, slot.header, slot.time)
+
+
+def solve_optimal_stage(slots, slot_indexes, shift_assignments, assignees):
+    """
+    Assign one group of slots at once with a min-cost flow, on top of the shifts already in shift_assignments.
+
+    The network is source -> slot -> (person, date, overlap group) -> (person, week) -> sink.
+    Slot edges cost the age of the comment (0 for the most recent commenter), each overlap group
+    (candidate shifts of one person on one date that overlap, directly or through each other) takes
+    at most one shift, and each week node (a period or ISO week, see src/calendar_policy.py) is capped
+    by the shift limit left for that person. Candidates must pass the rules of the slot's sheet
+    (see get_rejection) on the shifts assigned before the stage, and the rules are checked again
+    when the flow is applied, since only the overlaps and weekly caps are part of the network. The
+    maximum number of slots is filled first, then the most recent comments are preferred. Grouping
+    overlaps is conservative, so slots left open are retried greedily with the exact checks.
+
+    Parameters:
+        slots (list): All ShiftSlot records.
+        slot_indexes (list): Indexes of the slots to assign in this stage, in sheet order.
+        shift_assignments (dict): Employee objects keyed by name, updated in place.
+        assignees (list): Assigned name per slot index, updated in place.
+    """
+    calendar_policy = get_calendar_policy()
+    rule_set = get_rule_set()
+    candidate_edges = []  # (slot index, name, age)
+    for slot_index in slot_indexes:
+        slot = slots[slot_index]
+        for age, name in enumerate(get_slot_candidates(slot)):
+            if get_rejection(shift_assignments.get(name), slot):
+                continue
+            candidate_edges.append((slot_index, name, age))
+
+    # Union candidate shifts of a person on a date that overlap into groups of capacity 1.
+    group_of_edge = list(range(len(candidate_edges)))
+
+    def find_group(edge_index):
+        while group_of_edge[edge_index] != edge_index:
+            group_of_edge[edge_index] = group_of_edge[group_of_edge[edge_index]]
+            edge_index = group_of_edge[edge_index]
+        return edge_index
+
+    edges_by_day = {}
+    for edge_index, (slot_index, name, age) in enumerate(candidate_edges):
+        slot = slots[slot_index]
+        edges_by_day.setdefault((name, slot.header), []).append((edge_index, parse_time_range(slot.time)))
+    for day_edges in edges_by_day.values():
+        for position, (edge_index, (start, end)) in enumerate(day_edges):
+            for other_index, (other_start, other_end) in day_edges[:position]:
+                if start < other_end and other_start < end:
+                    group_of_edge[find_group(edge_index)] = find_group(other_index)
+
+    network = MinCostFlow()
+    source = network.add_node()
+    sink = network.add_node()
+    slot_nodes = {}
+    group_nodes = {}
+    week_nodes = {}
+    slot_edges = []
+    for edge_index, (slot_index, name, age) in enumerate(candidate_edges):
+        slot = slots[slot_index]
+        if slot_index not in slot_nodes:
+            slot_nodes[slot_index] = network.add_node()
+            network.add_edge(source, slot_nodes[slot_index], 1)
+        group = find_group(edge_index)
+        if group not in group_nodes:
+            group_nodes[group] = network.add_node()
+            bucket = calendar_policy.get_bucket(slot.header)
+            week = (name, bucket)
+            if week not in week_nodes:
+                week_nodes[week] = network.add_node()
+                employee_obj = shift_assignments.get(name)
+                max_shifts, _ = calendar_policy.get_limits(bucket)
+                if max_shifts is None or not rule_set.applies("weekly_cap", slot.sheet):
+                    remaining = len(slot_indexes)
+                else:
+                    remaining = max_shifts - (employee_obj.bucket_shift_counts.get(bucket, 0) if employee_obj else 0)
+                network.add_edge(week_nodes[week], sink, remaining)
+            network.add_edge(group_nodes[group], week_nodes[week], 1)
+        slot_edges.append(network.add_edge(slot_nodes[slot_index], group_nodes[group], 1, age))
+    network.solve(source, sink)
+
+    for edge_index, (slot_index, name, age) in enumerate(candidate_edges):
+        if network.get_flow(slot_edges[edge_index]):
+            # Hour caps and the other rules are not part of the network, so a flow can break them.
+            if get_rejection(shift_assignments.get(name), slots[slot_index]):
+                continue
+            assignees[slot_index] = name
+            add_shift_to_employee(shift_assignments, name, slots[slot_index])
+
+    for slot_index in slot_indexes:
+        if assignees[slot_index]:
+            continue
+        slot = slots[slot_index]
+        for name in get_slot_candidates(slot):
+            if get_rejection(shift_assignments.get(name), slot):
+                continue
+            assignees[slot_index] = name
+            add_shift_to_employee(shift_assignments, name, slot)
+            break
+
+
+def solve_optimal_assignment(slots):
+    """
+    Assign slots globally instead of greedily, filling as many slots as the rules allow (see
+    get_rejection). Filled slots are kept, then the slots of sheets without a prerequisite rule
+    (Dish and Pot Room by default) are solved, then the other sheets, whose prerequisites are
+    checked on the shifts assigned by then.
+
+    The greedy pass only counts a filled slot against the caps once it reaches it, and the network
+    of solve_optimal_stage approximates the overlaps and leaves out the hour caps, so on tight
+    schedules the greedy pass can fill more slots. Its assignments are returned instead then,
+    so the result never fills fewer slots than a greedy run. Both counts are logged.
+
+    Parameters:
+        slots (list): ShiftSlot records with a valid time, in sheet order.
+
+    Returns:
+        tuple: (assigned name or "" per slot, Employee objects keyed by name).
+    """
+    with employee_registry_for(slots):
+        assignees = [""] * len(slots)
+        shift_assignments = {}
+        # Filled slots keep their name, as in the greedy pass.
+        for slot_index, slot in enumerate(slots):
+            if slot.first_name:
+                assignees[slot_index] = get_employee_registry().get_name(slot.first_name + " " + slot.last_name)
+                add_shift_to_employee(shift_assignments, assignees[slot_index], slot)
+        rule_set = get_rule_set()
+        first_indexes = [index for index, slot in enumerate(slots) if not slot.first_name and not rule_set.applies("prerequisite", slot.sheet)]
+        other_indexes = [index for index, slot in enumerate(slots) if not slot.first_name and rule_set.applies("prerequisite", slot.sheet)]
+        solve_optimal_stage(slots, first_indexes, shift_assignments, assignees)
+        solve_optimal_stage(slots, other_indexes, shift_assignments, assignees)
+
+        with quiet_pass():
+            greedy_assignees, greedy_shift_assignments = assign_greedy(slots)
+        greedy_count = sum(1 for assign_shift_to in greedy_assignees if assign_shift_to)
+        optimal_count = sum(1 for assign_shift_to in assignees if assign_shift_to)
+        logging.info(f"Optimal solver assigned {optimal_count} shifts, greedy assigns {greedy_count} ({optimal_count - greedy_count:+d} slots)")
+        if greedy_count > optimal_count:
+            logging.info("Optimal solver filled fewer slots than the greedy pass, keeping the greedy assignments")
+            return greedy_assignees, greedy_shift_assignments
+
+        # Rebuild the employees in sheet order so their shift lists match a greedy run.
+        shift_assignments = {}
+        for slot, assign_shift_to in zip(slots, assignees):
+            if assign_shift_to:
+                add_shift_to_employee(shift_assignments, assign_shift_to, slot)
+        return assignees, shift_assignments
+
+
+@contextmanager
+def quiet_pass():
+    """
+    Silence INFO and WARNING messages and pause the run stats, for passes whose decisions
+    are not the ones being applied.
+    """
+    previous_disable_level = logging.root.manager.disable
+    previous_paused = stats.paused
+    logging.disable(logging.WARNING)
+    stats.paused = True
+    try:
+        yield
+    finally:
+        logging.disable(previous_disable_level)
+        stats.paused = previous_paused
+
+
+def get_table_end(slots, slot_index):
+    """
+    Index after the last of the consecutive slots sharing the date of slots[slot_index].
+    """
+    header = slots[slot_index].header
+    table_end = slot_index + 1
+    while table_end < len(slots) and slots[table_end].header == header:
+        table_end += 1
+    return table_end
+
+
+def assign_greedy(slots, previous_assignees=None, slots_to_resolve=None, backend="scalar"):
+    """
+    Assign slots row by row to their last valid commenter (see find_last_valid_commenter).
+
+    With backend="numpy" the caps and conflicts of all commenters of all slots of a table (the
+    consecutive slots of one date) are checked in one batch against an AvailabilityMatrix kept
+    next to the Employee objects, when the table is reached. Whoever is assigned a slot of the
+    table afterwards is checked again, one rule at a time, for its later slots, so the decisions
+    are the same as with backend="scalar", which checks each commenter on its Employee object and
+    parses the comments lazily. The batches pay off with many commenters per table, see
+    benchmarks/bench_availability.py.
+
+    Parameters:
+        slots (list): ShiftSlot records with a valid time, in sheet order.
+        previous_assignees (list): Names assigned by an earlier run, reused for the slots not in slots_to_resolve.
+        slots_to_resolve (set): Indexes of the slots to resolve, None to resolve every slot.
+        backend (str): "scalar" or "numpy".
+
+    Returns:
+        tuple: (assigned name or "" per slot, Employee objects keyed by name).
+    """
+    with employee_registry_for(slots):
+        shift_assignments = {}
+        assignees = []
+        availability = AvailabilityMatrix.from_slots(slots, get_calendar_policy()) if backend == "numpy" else None
+        table_end = 0
+        table_comments = {}  # Slot index -> (comment, commenter) tuples, for the slots of the current table
+        table_rejections = {}  # Slot index -> rejections of its commenters, batched when the table was reached
+        assigned_in_table = set()  # People whose batched rejections are out of date
+        for slot_index, slot in enumerate(slots):
+            resolve_slot = slots_to_resolve is None or slot_index in slots_to_resolve
+            if availability and slot_index >= table_end:
+                table_end = get_table_end(slots, slot_index)
+                table_indexes = [index for index in range(slot_index, table_end) if slots_to_resolve is None or index in slots_to_resolve]
+                table_comments = {index: get_slot_comments(slots[index]) for index in table_indexes}
+                assigned_in_table = set()
+                with stats.timer("constraint_checks"):
+                    batch = availability.get_day_rejections(
+                        slot.header, [([commenter for _, commenter in table_comments[index]], slots[index].time, get_slot_hours(slots[index]))
+                                      for index in table_indexes], shift_assignments)
+                table_rejections = dict(zip(table_indexes, batch))
+            if resolve_slot:
+                # The scalar backend parses comments lazily, newest first, stopping at the commenter picked
+                processed_comments = table_comments[slot_index] if availability else None
+                with stats.timer("constraint_checks"):
+                    rejections = None
+                    if availability:
+                        rejections = {name: rejection for name, rejection in table_rejections[slot_index].items()
+                                      if name not in assigned_in_table}
+                    assign_shift_to, _ = find_last_valid_commenter(slot, shift_assignments, processed_comments, rejections)
+                if not assign_shift_to:
+                    logging.debug("%s - Unassigned because no valid commentator found.", slot)
+            else:
+                assign_shift_to = previous_assignees[slot_index]
+            if assign_shift_to:
+                add_shift_to_employee(shift_assignments, assign_shift_to, slot)
+                if availability:
+                    availability.add_shift(assign_shift_to, slot.header, slot.time, get_slot_hours(slot))
+                    assigned_in_table.add(assign_shift_to)
+            assignees.append(assign_shift_to)
+        return assignees, shift_assignments
+
+
+def resolve_changed_slots(slots, snapshot, backend="scalar"):
+    """
+    Re-run the greedy pass only where the previous run's decisions can change.
+
+    Slots whose fingerprint differs from the snapshot are re-resolved, together with every slot
+    that one of the employees they involve (candidates, old and new assignees) commented on or
+    was assigned to. The set of affected employees grows until re-resolving neither assigns nor
+    takes a slot away from anybody outside it, so the decisions are the same as a full greedy run;
+    the other slots keep their snapshot decision without being checked again.
+
+    Parameters:
+        slots (list): ShiftSlot records with a valid time, in sheet order.
+        snapshot (dict): The snapshot saved by the previous run.
+        backend (str): How the greedy pass checks caps and conflicts, see assign_greedy.
+
+    Returns:
+        tuple: (assigned name or "" per slot, Employee objects keyed by name, indexes of the re-resolved slots).
+    """
+    with employee_registry_for(slots):
+        previous_slots = snapshot["slots"]
+        slot_keys = [get_slot_key(slot) for slot in slots]
+        previous_assignees = []
+        changed_slots = set()
+        affected_employees = set()
+        for slot_index, (slot, slot_key) in enumerate(zip(slots, slot_keys)):
+            previous_entry = previous_slots.get(slot_key)
+            if previous_entry is None or previous_entry[0] != get_slot_fingerprint(slot):
+                changed_slots.add(slot_index)
+                affected_employees.update(get_slot_candidates(slot))
+                if previous_entry and previous_entry[1]:
+                    affected_employees.add(previous_entry[1])
+            previous_assignees.append(previous_entry[1] if previous_entry else "")
+        # Slots that disappeared free the shift of whoever had them.
+        for slot_key in previous_slots.keys() - set(slot_keys):
+            if previous_slots[slot_key][1]:
+                affected_employees.add(previous_slots[slot_key][1])
+
+        slot_candidates = [set(get_slot_candidates(slot)) for slot in slots]
+        with quiet_pass():
+            while True:
+                slots_to_resolve = {slot_index for slot_index in range(len(slots))
+                                    if slot_index in changed_slots
+                                    or previous_assignees[slot_index] in affected_employees
+                                    or not slot_candidates[slot_index].isdisjoint(affected_employees)}
+                assignees, _ = assign_greedy(slots, previous_assignees, slots_to_resolve, backend)
+                # Whoever gains or loses a slot may decide their other slots differently.
+                newly_affected = {name for slot_index in slots_to_resolve if assignees[slot_index] != previous_assignees[slot_index]
+                                  for name in (assignees[slot_index], previous_assignees[slot_index])} - affected_employees - {""}
+                if not newly_affected:
+                    break
+                affected_employees |= newly_affected
+        assignees, shift_assignments = assign_greedy(slots, previous_assignees, slots_to_resolve, backend)
+        return assignees, shift_assignments, slots_to_resolve
+
+
+def get_resolver_settings(sheets_to_analyze, solver, write_workbook=True):
+    return {
+        "sheets_to_analyze": list(sheets_to_analyze),
+        "solver": solver,
+        "write_workbook": write_workbook,
+        "calendar_policy": get_calendar_policy().to_dict(),
+        "rules": get_rule_set().to_dict()["rules"],
+        "aliases": get_aliases(),
+        "resolve_comments_after_assigned": resolve_comments_after_assigned,
+        "resolve_comments_after_unassigned": resolve_comments_after_unassigned,
+    }
+
+
+def get_slot_decisions(slots, assignees, slot_indexes=None):
+    """
+    Turn the assigned names into the changes to write to the workbook (see write_assignments).
+
+    Parameters:
+        slots (list): ShiftSlot records.
+        assignees (list): Assigned name or "" per slot.
+        slot_indexes (iterable): Indexes of the slots to write, None for every slot.
+
+    Returns:
+        dict: (slot, first_name, last_name, clear_comments) keyed by slot index, for the slots that change.
+    """
+    with employee_registry_for(slots):
+        slot_decisions = {}
+        for slot_index in range(len(slots)) if slot_indexes is None else slot_indexes:
+            slot = slots[slot_index]
+            assign_shift_to = assignees[slot_index]
+            if len(assign_shift_to) > 0:
+                first_name, last_name = get_name_parts(assign_shift_to)
+                slot_decisions[slot_index] = (slot, first_name, last_name, resolve_comments_after_assigned)
+            else:
+                is_unassigned_due_to_warning = any(commenter == 'Unknown' for _, commenter in iter_slot_comments_newest_first(slot))
+                if resolve_comments_after_unassigned and not is_unassigned_due_to_warning:
+                    slot_decisions[slot_index] = (slot, None, None, True)
+        return slot_decisions
+
+
+def get_written_slot(slot, decision):
+    """
+    Return the slot as it reads back from the workbook once its decision is written, None if it
+    is no longer a shift row (comments cleared and no name).
+    """
+    if decision is None:
+        return slot
+    _, first_name, last_name, clear_comments = decision
+    if first_name is not None:
+        slot = slot._replace(first_name=first_name, last_name=last_name)
+    if clear_comments:
+        slot = slot._replace(comment=None)
+    if not slot.first_name and slot.comment is None:
+        return None
+    return slot
+
+
+def check_run_options(solver, backend):
+    """
+    Raises:
+        ValueError: If solver is not "greedy" or "optimal", or backend is not "scalar" or "numpy".
+    """
+    if solver not in ("greedy", "optimal"):
+        raise ValueError(f"Unknown solver '{solver}', expected 'greedy' or 'optimal'")
+    if backend not in ("scalar", "numpy"):
+        raise ValueError(f"Unknown backend '{backend}', expected 'scalar' or 'numpy'")
+
+
+def load_and_assign_shift_xlsx(file_path, sheets_to_analyze, processes=None, solver="greedy", snapshot_path=None,
+                               report_path=None, backend="scalar", write_workbook=True, json_path=None, csv_path=None,
+                               cache_dir=None):
+    """
+    Load an .xlsx file, analyze specific sheets, and assign shifts based on the last commenter.
+    Updates the cell value with the last commenter's name, unless write_workbook is False.
+
+    The shift rows are first streamed from a read-only view of the workbook, then all
+    assignments are written back to the file in a single pass. Sheets can be parsed
+    in a process pool; they are still resolved in the order of sheets_to_analyze.
+    Writing back still loads and saves the whole workbook (see write_assignments), so the
+    streaming pass lowers the cost of parsing, not the peak memory or the time of a run
+    that writes the workbook. Use write_workbook=False with json_path or csv_path for a
+    run that only reads it.
+
+    With solver="optimal" the slots are assigned with a min-cost flow instead of row by row
+    (see solve_optimal_assignment), and the number of extra slots filled compared with the
+    greedy pass is logged.
+
+    With a snapshot_path, the fingerprint of every slot and the resulting employees are saved
+    after the run. The next run with the same settings re-resolves only the slots affected by
+    changes since then (see resolve_changed_slots), and skips resolving and saving the workbook
+    altogether when nothing changed.
+
+    The assignments can be exported straight from the resolved employees to json_path (employee
+    summaries) and csv_path (one row per shift), see src/report_generator.py. With
+    write_workbook=False these exports are the only output and the workbook is left untouched.
+
+    Timers and counters of the run are collected in src.instrumentation.stats: time spent loading
+    the workbook, parsing sheets (including header detection), checking merged cells, parsing
+    comments, checking constraints (per-slot decisions), assigning, saving, and the number of
+    commenters rejected for each reason. With a report_path they are written as a JSON report.
+    Per-decision messages are logged at DEBUG level only.
+
+    Parameters:
+        file_path (str): Path to the .xlsx file.
+        sheets_to_analyze (list): List of sheet names to analyze.
+        processes (int): Number of processes used to parse the sheets, None to parse serially.
+        solver (str): "greedy" (last valid commenter per row) or "optimal".
+        snapshot_path (str): Path to the JSON snapshot used for incremental runs, None to always run fully.
+        report_path (str): Path of the JSON run report, None to skip it.
+        backend (str): "scalar" or "numpy", how the greedy pass checks caps and conflicts (see assign_greedy).
+        write_workbook (bool): Write the assignments back to the workbook.
+        json_path (str): Path of the JSON export of the assignments, None to skip it.
+        csv_path (str): Path of the CSV export of the assignments, None to skip it.
+        cache_dir (str): Directory of the parsed-workbook cache shared with other jobs, None to always parse
+                         the workbook (see src/workbook_cache.py).
+
+    Returns:
+        dict: A dictionary with sheet names as keys and the last person who commented assigned to each shift.
+    """
+    check_run_options(solver, backend)
+    # Initialize result dictionary
+    results = {}
+    processed_rows_count = 0
+    slot = None
+    stats.reset()
+    run_start = perf_counter()
+    try:
+        settings = get_resolver_settings(sheets_to_analyze, solver, write_workbook)
+        snapshot = load_snapshot(snapshot_path) if snapshot_path else None
+        if snapshot and snapshot.get("settings") != settings:
+            logging.info("Resolver settings changed since the last run, resolving every slot")
+            snapshot = None
+
+        valid_slots = []
+        sheet = None
+        table_header = None
+        for slot in iter_shift_slots(file_path, sheets_to_analyze, processes, cache_dir):
+            stats.count("slots")
+            if slot.sheet != sheet:
+                sheet = slot.sheet
+                logging.info(f"Starting to process sheet {sheet}")
+            if slot.header != table_header:
+                table_header = slot.header
+                logging.info(f"Got new table header - {table_header}")
+
+            if not is_valid_time_format(slot.time):
+                stats.count("invalid_time_format")
+                continue
+
+            processed_rows_count += 1
+            valid_slots.append(slot)
+        slot = None
+
+        slots_to_write = range(len(valid_slots))
+        if snapshot and {get_slot_key(slot): get_slot_fingerprint(slot) for slot in valid_slots} == {
+                slot_key: entry[0] for slot_key, entry in snapshot["slots"].items()}:
+            logging.info("No slot changed since the last run, keeping the previous assignments")
+            shift_assignments = {}
+            for name, shifts in snapshot["employees"].items():
+                shift_assignments[name] = Employee(name)
+                for shift in shifts:
+                    shift_assignments[name].add_shift(shift["location"], shift["date"], shift["time"])
+            logging.info(f"workout processing completed. Total {processed_rows_count} shifts processed")
+            export_assignments(shift_assignments, json_path, csv_path)
+            return shift_assignments
+
+        with employee_registry_for(valid_slots):
+            if solver == "optimal":
+                with stats.timer("assignment"):
+                    assignees, shift_assignments = solve_optimal_assignment(valid_slots)
+            elif snapshot:
+                with stats.timer("assignment"):
+                    assignees, shift_assignments, slots_to_write = resolve_changed_slots(valid_slots, snapshot, backend)
+                slots_to_write = sorted(slots_to_write)
+                stats.count("re_resolved", len(slots_to_write))
+                logging.info(f"Re-resolved {len(slots_to_write)} of {len(valid_slots)} shifts changed since the last run")
+            else:
+                with stats.timer("assignment"):
+                    assignees, shift_assignments = assign_greedy(valid_slots, backend=backend)
+            stats.count("assigned", sum(1 for assign_shift_to in assignees if assign_shift_to))
+            stats.count("unassigned", sum(1 for assign_shift_to in assignees if not assign_shift_to))
+
+            slot_decisions = get_slot_decisions(valid_slots, assignees, slots_to_write)
+            decisions = list(slot_decisions.values())
+        slot = None
+
+        results = shift_assignments
+        logging.info(f"workout processing completed. Total {processed_rows_count} shifts processed")
+        time_ranges_cache = get_cache_info()["time_ranges"]
+        logging.info(f"Time range cache: {time_ranges_cache['hits']} hits, {time_ranges_cache['misses']} misses, {time_ranges_cache['currsize']} entries")
+        rejections = {name: count for name, count in stats.counters.items() if name.startswith("rejected_")}
+        logging.info(f"Rejected commenters: {rejections}")
+        export_assignments(shift_assignments, json_path, csv_path)
+        #Save changes to the workbook
+        if decisions and write_workbook:
+            with stats.timer("save"):
+                write_assignments(file_path, decisions)
+
+        if snapshot_path:
+            written_slots = {}
+            for slot_index, slot in enumerate(valid_slots):
+                written_slot = get_written_slot(slot, slot_decisions.get(slot_index) if write_workbook else None)
+                if written_slot is not None:
+                    written_slots[get_slot_key(slot)] = [get_slot_fingerprint(written_slot), assignees[slot_index]]
+            slot = None
+            employees = {name: [shift.to_dict() for shift in employee_obj.shifts] for name, employee_obj in shift_assignments.items()}
+            with stats.timer("snapshot"):
+                save_snapshot(snapshot_path, settings, written_slots, employees)
+
+        logging.info("Workbook processing completed successfully.")
+    except Exception as e:
+    # Log and print the error message with line number
+        error_message = f"An error occurred: {e} | Additional Details: first name={slot.first_name if slot else None} last name = {slot.last_name if slot else None}"
+        logging.error(error_message)
+
+        # Get the traceback and extract the line number
+        traceback_details = traceback.format_exc()
+        print(f"{error_message}\nTraceback details:\n{traceback_details}")
+    finally:
+        stats.add_time("total", perf_counter() - run_start)
+        if report_path:
+            stats.save_report(report_path, file_path=file_path, sheets_to_analyze=sheets_to_analyze, solver=solver,
+                              processes=processes, backend=backend, shifts_processed=processed_rows_count,
+                              time_range_cache=get_cache_info()["time_ranges"])
+
+    return results
+
+def write_workbooks(file_paths, workbook_decisions, processes=None):
+    """
+    Write the decisions of several workbooks, in a process pool when processes is greater than 1.
+    Workbooks without decisions are not saved.
+    """
+    jobs = [(file_path, decisions) for file_path, decisions in zip(file_paths, workbook_decisions) if decisions]
+    if processes and processes > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            list(executor.map(write_assignments, *zip(*jobs)))
+        return
+    for file_path, decisions in jobs:
+        write_assignments(file_path, decisions)
+
+
+def load_and_assign_shift_xlsx_batch(file_paths, sheets_to_analyze, processes=None, solver="greedy", report_path=None,
+                                     backend="scalar", write_workbook=True, json_path=None, csv_path=None, cache_dir=None):
+    """
+    Resolve several workbooks, e.g. one per dining location or term, against one shared set of
+    employees, so the caps, the shift conflict check and the Dish or Pot Room rule hold across
+    all of them.
+
+    The workbooks are parsed concurrently with processes greater than 1, then their slots are
+    resolved together in the order of file_paths (and of sheets_to_analyze within each file),
+    and the decisions of each workbook are written back in parallel. The run report adds the
+    throughput of the batch: files and slots per second.
+
+    Parameters:
+        file_paths (list): Paths to the .xlsx files.
+        sheets_to_analyze (list): List of sheet names to analyze in each workbook.
+        processes (int): Number of processes used to parse and write the workbooks, None to work serially.
+        solver (str): "greedy" (last valid commenter per row) or "optimal".
+        report_path (str): Path of the JSON run report, None to skip it.
+        backend (str): "scalar" or "numpy", how the greedy pass checks caps and conflicts (see assign_greedy).
+        write_workbook (bool): Write the assignments back to the workbooks.
+        json_path (str): Path of the JSON export of the shared employees, None to skip it.
+        csv_path (str): Path of the CSV export of the shared employees, None to skip it.
+        cache_dir (str): Directory of the parsed-workbook cache, None to always parse the workbooks.
+
+    Returns:
+        dict: Employee objects keyed by name, with their shifts in all the workbooks.
+    """
+    check_run_options(solver, backend)
+    stats.reset()
+    run_start = perf_counter()
+    with stats.timer("parse"):
+        workbook_slots = extract_workbooks_slots(file_paths, sheets_to_analyze, processes, cache_dir)
+
+    valid_slots = []
+    workbook_indexes = []
+    for workbook_index, (file_path, slots) in enumerate(zip(file_paths, workbook_slots)):
+        logging.info(f"Got {len(slots)} shift rows from {file_path}")
+        for slot in slots:
+            stats.count("slots")
+            if not is_valid_time_format(slot.time):
+                stats.count("invalid_time_format")
+                continue
+            valid_slots.append(slot)
+            workbook_indexes.append(workbook_index)
+
+    with employee_registry_for(valid_slots):
+        with stats.timer("assignment"):
+            if solver == "optimal":
+                assignees, shift_assignments = solve_optimal_assignment(valid_slots)
+            else:
+                assignees, shift_assignments = assign_greedy(valid_slots, backend=backend)
+        stats.count("assigned", sum(1 for assign_shift_to in assignees if assign_shift_to))
+        stats.count("unassigned", sum(1 for assign_shift_to in assignees if not assign_shift_to))
+
+        workbook_decisions = [[] for _ in file_paths]
+        for slot_index, decision in get_slot_decisions(valid_slots, assignees).items():
+            workbook_decisions[workbook_indexes[slot_index]].append(decision)
+    export_assignments(shift_assignments, json_path, csv_path)
+    if write_workbook:
+        with stats.timer("save"):
+            write_workbooks(file_paths, workbook_decisions, processes)
+
+    seconds = perf_counter() - run_start
+    stats.add_time("total", seconds)
+    throughput = {
+        "files": len(file_paths),
+        "slots": len(valid_slots),
+        "seconds": round(seconds, 6),
+        "files_per_second": round(len(file_paths) / seconds, 3),
+        "slots_per_second": round(len(valid_slots) / seconds, 3),
+    }
+    logging.info(f"Batch of {throughput['files']} workbooks completed: {throughput['files_per_second']} files/s, "
+                 f"{throughput['slots_per_second']} slots/s")
+    if report_path:
+        stats.save_report(report_path, file_paths=file_paths, sheets_to_analyze=sheets_to_analyze, solver=solver,
+                          processes=processes, backend=backend, throughput=throughput,
+                          time_range_cache=get_cache_info()["time_ranges"])
+    return shift_assignments
+
+
+if __name__ == "__main__":
+    # Example function usage (python -m src.assignment_engine), see src/main.py for the command line
+    configure_logging()
+    file_path = "Worcester Final week Schedule 2024.xlsx"  # Replace with your .xlsx file name
+    sheets_to_analyze = default_sheets_to_analyze  # Replace with sheet names to analyze
+    #sheets_to_analyze = ["Dish"]
+    output_file = load_config()["output"]["assignments_file"]
+    shift_assignments = load_and_assign_shift_xlsx(file_path, sheets_to_analyze, json_path=output_file,
+                                                   csv_path=output_file.replace(".json", ".csv"))
+    is_this_final_week_schedule = False
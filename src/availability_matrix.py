@@ -0,0 +1,198 @@
+from math import gcd
+from src.parsing import parse_time_range
+
+np = None  # NumPy, imported by the first AvailabilityMatrix so it is only needed for backend="numpy"
+
+
+WORD_BITS = 64
+DEFAULT_BUCKET_MINUTES = 15
+
+
+def get_bucket_minutes(slots, bucket_minutes=DEFAULT_BUCKET_MINUTES):
+    """
+    Largest bucket size, at most bucket_minutes, that every slot's start and end fall on,
+    so the bitmap represents the time ranges exactly.
+    """
+    for slot in slots:
+        start, end = parse_time_range(slot.time)
+        bucket_minutes = gcd(gcd(bucket_minutes, start), end)
+    return bucket_minutes or 1
+
+
+class AvailabilityMatrix:
+    def __init__(self, calendar_policy, bucket_minutes=DEFAULT_BUCKET_MINUTES):
+        """
+        Columnar state of the assigned shifts, for checking many candidates at once.
+
+        occupancy[employee, day] is a bitmap of the day in bucket_minutes buckets, packed in
+        64-bit words. shift_counts[employee, bucket] and hours[employee, bucket] hold the totals
+        per calendar bucket (period or ISO week). Rows and columns are added as new employees,
+        days and calendar buckets show up.
+
+        Shifts that cross midnight or have no length cannot be represented as a bitmap range.
+        Employee days holding one, and queries for one, fall back to Employee.has_conflict so
+        the decisions match the scalar checks exactly.
+
+        Parameters:
+            calendar_policy (CalendarPolicy): Maps dates to calendar buckets and their caps.
+            bucket_minutes (int): Size of a time bucket, every shift start and end must fall on one
+                                  (see get_bucket_minutes).
+        """
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise ImportError("The numpy backend requires NumPy, install it with 'pip install -r requirements-optional.txt'")
+        self.calendar_policy = calendar_policy
+        self.bucket_minutes = bucket_minutes
+        self.words = -(-(24 * 60 // bucket_minutes) // WORD_BITS)
+        self.employee_indexes = {}
+        self.day_indexes = {}
+        self.bucket_indexes = {}
+        self.occupancy = np.zeros((8, 8, self.words), dtype=np.uint64)
+        self.shift_counts = np.zeros((8, 8), dtype=np.int64)
+        self.hours = np.zeros((8, 8), dtype=np.float64)
+        self.max_shifts = np.full(8, np.inf)
+        self.max_hours = np.full(8, np.inf)
+        self.irregular_days = set()  # (employee index, day index) holding a shift that is not a bitmap range
+        self.masks = {}
+
+    @classmethod
+    def from_slots(cls, slots, calendar_policy, bucket_minutes=DEFAULT_BUCKET_MINUTES):
+        return cls(calendar_policy, get_bucket_minutes(slots, bucket_minutes))
+
+    @staticmethod
+    def grow(array, axis, size, fill=0):
+        """
+        Return array with at least size entries along axis, doubling it so growing stays amortized O(1).
+        """
+        if array.shape[axis] >= size:
+            return array
+        shape = list(array.shape)
+        shape[axis] = max(size, 2 * shape[axis])
+        grown = np.full(shape, fill, dtype=array.dtype)
+        grown[tuple(slice(0, length) for length in array.shape)] = array
+        return grown
+
+    def get_employee_index(self, name):
+        index = self.employee_indexes.get(name)
+        if index is None:
+            index = self.employee_indexes[name] = len(self.employee_indexes)
+            self.occupancy = self.grow(self.occupancy, 0, index + 1)
+            self.shift_counts = self.grow(self.shift_counts, 0, index + 1)
+            self.hours = self.grow(self.hours, 0, index + 1)
+        return index
+
+    def get_day_index(self, date_or_day):
+        index = self.day_indexes.get(date_or_day)
+        if index is None:
+            index = self.day_indexes[date_or_day] = len(self.day_indexes)
+            self.occupancy = self.grow(self.occupancy, 1, index + 1)
+        return index
+
+    def get_bucket_index(self, date_or_day):
+        bucket = self.calendar_policy.get_bucket(date_or_day)
+        index = self.bucket_indexes.get(bucket)
+        if index is None:
+            index = self.bucket_indexes[bucket] = len(self.bucket_indexes)
+            self.shift_counts = self.grow(self.shift_counts, 1, index + 1)
+            self.hours = self.grow(self.hours, 1, index + 1)
+            self.max_shifts = self.grow(self.max_shifts, 0, index + 1, np.inf)
+            self.max_hours = self.grow(self.max_hours, 0, index + 1, np.inf)
+            max_shifts, max_hours = self.calendar_policy.get_limits(bucket)
+            self.max_shifts[index] = np.inf if max_shifts is None else max_shifts
+            self.max_hours[index] = np.inf if max_hours is None else max_hours
+        return index
+
+    def get_mask(self, start, end):
+        """
+        Bitmap words with the buckets of [start, end) set.
+        """
+        key = (start, end)
+        mask = self.masks.get(key)
+        if mask is None:
+            bits = (1 << (end // self.bucket_minutes)) - (1 << (start // self.bucket_minutes))
+            mask = np.array([(bits >> (WORD_BITS * word)) & (2 ** WORD_BITS - 1) for word in range(self.words)], dtype=np.uint64)
+            self.masks[key] = mask
+        return mask
+
+    def add_shift(self, name, date_or_day, time, hours):
+        employee_index = self.get_employee_index(name)
+        day_index = self.get_day_index(date_or_day)
+        bucket_index = self.get_bucket_index(date_or_day)
+        start, end = parse_time_range(time)
+        if end <= start:
+            self.irregular_days.add((employee_index, day_index))
+        else:
+            self.occupancy[employee_index, day_index] |= self.get_mask(start, end)
+        self.shift_counts[employee_index, bucket_index] += 1
+        self.hours[employee_index, bucket_index] += hours
+
+    def get_rejections(self, names, date_or_day, time, hours, shift_assignments):
+        """
+        Check a shift for several employees in one batch.
+
+        Parameters:
+            names (list): Candidate names, those without any shift yet are ignored.
+            date_or_day (str): Date of the shift.
+            time (str): Time range of the shift (e.g., "8:30AM - 12:00PM").
+            hours (float): Duration of the shift in hours.
+            shift_assignments (dict): Employee objects keyed by name, used for shifts the bitmap cannot hold.
+
+        Returns:
+            dict: "weekly_cap", "hours_cap", "conflict" or None per name with shifts, checked in that order.
+        """
+        return self.get_day_rejections(date_or_day, [(names, time, hours)], shift_assignments)[0]
+
+    def get_day_rejections(self, date_or_day, shifts, shift_assignments):
+        """
+        Check several shifts of one date, each for its own candidates, in one batch: every
+        (shift, candidate) pair is checked by the same few array operations.
+
+        Parameters:
+            date_or_day (str): Date of the shifts.
+            shifts (list): (names, time, hours) per shift, as the arguments of get_rejections.
+            shift_assignments (dict): Employee objects keyed by name, used for shifts the bitmap cannot hold.
+
+        Returns:
+            list: The rejections dict of get_rejections for each shift, in order.
+        """
+        shift_names = [[name for name in dict.fromkeys(names) if name in self.employee_indexes] for names, _, _ in shifts]
+        pair_count = sum(len(names) for names in shift_names)
+        if not pair_count:
+            return [{} for _ in shifts]
+        employee_indexes = np.fromiter((self.employee_indexes[name] for names in shift_names for name in names),
+                                       dtype=np.intp, count=pair_count)
+        shift_positions = np.repeat(np.arange(len(shifts)), [len(names) for names in shift_names])
+        bucket_index = self.get_bucket_index(date_or_day)
+        shift_hours = np.array([hours for _, _, hours in shifts], dtype=np.float64)
+        over_shifts = self.shift_counts[employee_indexes, bucket_index] >= self.max_shifts[bucket_index]
+        over_hours = self.hours[employee_indexes, bucket_index] + shift_hours[shift_positions] > self.max_hours[bucket_index]
+
+        ranges = [parse_time_range(time) for _, time, _ in shifts]
+        irregular_shifts = [end <= start for start, end in ranges]
+        day_index = self.day_indexes.get(date_or_day)
+        if day_index is None:
+            conflicts = np.zeros(pair_count, dtype=bool)
+        else:
+            masks = np.stack([np.zeros(self.words, dtype=np.uint64) if irregular else self.get_mask(start, end)
+                              for (start, end), irregular in zip(ranges, irregular_shifts)])
+            conflicts = (self.occupancy[employee_indexes, day_index] & masks[shift_positions]).any(axis=1)
+
+        day_rejections = []
+        position = 0
+        for (_, time, _), names, irregular in zip(shifts, shift_names, irregular_shifts):
+            rejections = {}
+            for name in names:
+                if over_shifts[position]:
+                    rejections[name] = "weekly_cap"
+                elif over_hours[position]:
+                    rejections[name] = "hours_cap"
+                elif day_index is not None and (irregular or (int(employee_indexes[position]), day_index) in self.irregular_days):
+                    rejections[name] = "conflict" if shift_assignments[name].has_conflict(date_or_day, time) else None
+                else:
+                    rejections[name] = "conflict" if conflicts[position] else None
+                position += 1
+            day_rejections.append(rejections)
+        return day_rejections
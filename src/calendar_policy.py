@@ -0,0 +1,112 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from src.config_loader import DEFAULT_CONFIG_PATH, load_config
+
+
+# Set while a policy variant is simulated, replacing the policy of the config file.
+active_calendar_policy = None
+
+
+def to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+class CalendarPolicy:
+    def __init__(self, periods=None, max_shifts_per_week=None, max_hours_per_week=None):
+        """
+        Map shift dates to the buckets their caps are counted in, and hold the caps of each bucket.
+
+        Dates of a named period map to the period's name. Any other date maps to its ISO week
+        (e.g. "2024-W50") with the weekly caps, and anything that is not a date (e.g. "Unknown Table"
+        or "Monday") is a bucket of its own with the weekly caps: the caps are then counted per header,
+        as the week of such a table is unknown. Bucket lookups go through a dict, so
+        checking a cap costs the same for any number of periods or weeks.
+
+        Parameters:
+            periods (list): Dictionaries with name, start and end dates, and optional max_shifts and max_hours.
+            max_shifts_per_week (int): Shift cap of ISO-week buckets, None for no cap.
+            max_hours_per_week (float): Hour cap of ISO-week buckets, None for no cap.
+        """
+        self.periods = periods or []
+        self.max_shifts_per_week = max_shifts_per_week
+        self.max_hours_per_week = max_hours_per_week
+        self.buckets = {}  # Date string -> bucket name, precomputed for named periods
+        self.limits = {}  # Bucket name -> (max shifts, max hours)
+        for period in self.periods:
+            name = period["name"]
+            current, end = to_date(period["start"]), to_date(period["end"])
+            while current <= end:
+                self.buckets[current.isoformat()] = name
+                current += timedelta(days=1)
+            self.limits[name] = (period.get("max_shifts"), period.get("max_hours"))
+
+    def get_bucket(self, date_or_day):
+        """
+        Bucket of a shift date (a table header such as "2024-12-11").
+        """
+        bucket = self.buckets.get(date_or_day)
+        if bucket is None:
+            try:
+                year, week, _ = to_date(date_or_day).isocalendar()
+                bucket = f"{year}-W{week:02d}"
+            except ValueError:
+                bucket = date_or_day
+            self.buckets[date_or_day] = bucket
+            self.limits.setdefault(bucket, (self.max_shifts_per_week, self.max_hours_per_week))
+        return bucket
+
+    def get_limits(self, bucket):
+        """
+        Returns:
+            tuple: (max shifts, max hours) of a bucket, None where there is no cap.
+        """
+        return self.limits.get(bucket, (self.max_shifts_per_week, self.max_hours_per_week))
+
+    def get_cap_violation(self, employee_obj, date_or_day, hours=0.0):
+        """
+        Check if one more shift of the given hours on a date would exceed the employee's caps.
+
+        Returns:
+            str: "weekly_cap" if the bucket's shift count is reached, "hours_cap" if the hours
+                 would go over the bucket's hour cap, None if the shift fits.
+        """
+        bucket = self.get_bucket(date_or_day)
+        max_shifts, max_hours = self.get_limits(bucket)
+        if max_shifts is not None and employee_obj.bucket_shift_counts.get(bucket, 0) >= max_shifts:
+            return "weekly_cap"
+        if max_hours is not None and employee_obj.bucket_hours.get(bucket, 0.0) + hours > max_hours:
+            return "hours_cap"
+        return None
+
+    def to_dict(self):
+        return {
+            "periods": [{key: str(value) for key, value in period.items()} for period in self.periods],
+            "max_shifts_per_week": self.max_shifts_per_week,
+            "max_hours_per_week": self.max_hours_per_week,
+        }
+
+
+def load_calendar_policy(config):
+    """
+    Build a CalendarPolicy from the periods, max_shifts_per_week and max_hours_per_week of a config dict.
+    """
+    return CalendarPolicy(config.get("periods"), config.get("max_shifts_per_week"), config.get("max_hours_per_week"))
+
+
+@lru_cache(maxsize=None)
+def load_calendar_policy_file(config_path=DEFAULT_CONFIG_PATH):
+    return load_calendar_policy(load_config(config_path))
+
+
+def get_calendar_policy(config_path=DEFAULT_CONFIG_PATH):
+    """
+    The calendar policy of a config file, loaded once per path, or the one of the variant
+    being simulated (see src/simulation.py).
+    """
+    if active_calendar_policy is not None:
+        return active_calendar_policy
+    return load_calendar_policy_file(config_path)
@@ -0,0 +1,13 @@
+import os
+
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "config.yaml")
+
+
+def load_config(config_file=DEFAULT_CONFIG_PATH):
+    """
+    Load configuration from a YAML file.
+    """
+    import yaml
+    with open(config_file, 'r') as file:
+        return yaml.safe_load(file)
@@ -1,117 +1,453 @@
-from openpyxl import load_workbook
-import yaml
+# openpyxl and the process pool are imported by the functions that use them,
+# so importing this module (e.g. for ShiftSlot) does not load them.
+from collections import namedtuple
+from itertools import repeat
+from time import perf_counter
+import gc
 import json
+import logging
 from datetime import date, datetime
+from src.config_loader import load_config
+from src.instrumentation import stats
+from src.merged_cells import MergedCellIndex
+from src.openpyxl_adapter import open_sheet_parser, open_sheet_source, read_sheet_comments
+from src.parsing import is_valid_time_format
+from src.sheet_layout import get_header_value, get_label_layout, infer_layout
+from src.workbook_cache import WorkbookCache
 
-def load_config(config_file):
+
+# Part of the workbook cache key: bump it whenever read_sheet_tables, read_sheet_slots or the
+# layout and time parsing they use extract different records, so older cache entries are not read.
+EXTRACTOR_VERSION = 2
+
+
+class ShiftSlot(namedtuple("ShiftSlot", ["sheet", "header", "row", "first_name_column", "last_name_column", "time",
+                                           "first_name", "last_name", "comment"])):
     """
-    Load configuration from a YAML file.
+    A compact, picklable record of one shift row: the sheet, the table header it
+    belongs to, its position and the columns of its name cells, the raw time value,
+    the name cells and the raw comment thread on the first name cell (None if there
+    is no comment).
     """
-    with open(config_file, 'r') as file:
-        return yaml.safe_load(file)
+    __slots__ = ()
 
+    @property
+    def coordinate(self):
+        from openpyxl.utils import get_column_letter
+        return f"{get_column_letter(self.first_name_column)}{self.row}"
 
-def extract_tables_and_comments(file_path, sheets_to_process):
+    def __str__(self):
+        return f"<Cell '{self.sheet}'.{self.coordinate}>"
+
+def extract_tables_and_comments(file_path, sheets_to_process, cache_dir=None):
     """
     Extract comments and organize them by tables in each sheet.
 
     Parameters:
         file_path (str): Path to the Excel file.
         sheets_to_process (list): List of sheet names to process.
+        cache_dir (str): Directory of the parsed-workbook cache (see src/workbook_cache.py), None to always parse.
 
     Returns:
-        list: A list of dictionaries containing sheet name, table context, cell address, value, and comment.
-    """
-    workbook = load_workbook(file_path, data_only=True)
-    all_comments = []
-
-    for sheet in sheets_to_process:
-        if sheet in workbook.sheetnames:
-            worksheet = workbook[sheet]
-            print(f"Processing sheet: {sheet}")
-
-            current_table_context = None
-            current_table_comments = []
-
-            for row in worksheet.iter_rows():
-                
-                # Detect table headers (adjust based on your sheet structure)
-                if any(cell.value for cell in row):  # Non-empty row
-                    if is_table_header(row):  # Check if the row marks the start of a new table
-                        if current_table_comments:
-                            # Save comments from the previous table
-                            all_comments.append({
-                                "Sheet": sheet,
-                                "Table": current_table_context,
-                                "Comments": current_table_comments
-                            })
-                            current_table_comments = []
-
-                        # Start a new table context
-                        current_table_context = get_table_context(row)
-
-                # Process comments in the current table
-                for cell in row:
-                    if cell.comment:
-                        current_table_comments.append({
-                            "Cell": cell.coordinate,
-                            "Value": cell.value,
-                            "Comment": cell.comment.text
-                        })
-
-            # Save the last table's comments
-            if current_table_comments:
-                all_comments.append({
-                    "Sheet": sheet,
-                    "Table": current_table_context,
-                    "Comments": current_table_comments
+        list: A list of dictionaries containing sheet name, table context, cell address, value, comment,
+              and whether the cell is part of a merged range.
+    """
+    if cache_dir:
+        cache = WorkbookCache(cache_dir, extractor_version=EXTRACTOR_VERSION)
+        records = cache.load(file_path, "comments", sheets_to_process)
+        if records is None:
+            all_comments = extract_tables_and_comments(file_path, sheets_to_process)
+            records = [(table_index, table["Sheet"], table["Table"], comment["Cell"], comment["Value"], comment["Comment"], comment["Merged"])
+                       for table_index, table in enumerate(all_comments) for comment in table["Comments"]]
+            cache.store(file_path, "comments", sheets_to_process, records, 7)
+            return all_comments
+        all_comments = []
+        for table_index, sheet, table_context, coordinate, value, comment, merged in records:
+            if table_index == len(all_comments):
+                all_comments.append({"Sheet": sheet, "Table": table_context, "Comments": []})
+            all_comments[-1]["Comments"].append({"Cell": coordinate, "Value": value, "Comment": comment, "Merged": merged})
+        return all_comments
+
+    return list(iter_tables_and_comments(file_path, sheets_to_process))
+
+
+def iter_tables_and_comments(file_path, sheets_to_process):
+    """
+    Stream the tables of extract_tables_and_comments, each one as soon as its last row is read.
+
+    The workbook is opened read-only and its sheets are parsed row by row, so memory holds the
+    current sheet's comment threads and the current table instead of the whole workbook and
+    every table, and does not grow with the number of tables. It is not fully independent of
+    the number of sheets: opening a read-only workbook, openpyxl parses the start of every
+    sheet for its dimensions (about 65 KB per sheet at its peak, see benchmarks/bench_memory.py).
+    Pass the result to save_to_json to write the tables as they come.
+
+    Parameters:
+        file_path (str): Path to the Excel file.
+        sheets_to_process (list): List of sheet names to process.
+
+    Yields:
+        dict: The sheet name, table context and comments of each table with comments, in sheet and row order.
+    """
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    # Opening a read-only workbook leaves a parser per sheet in reference cycles, collect them
+    # now instead of letting them pile up with every sheet
+    gc.collect()
+    try:
+        for sheet in sheets_to_process:
+            if sheet in workbook.sheetnames:
+                print(f"Processing sheet: {sheet}")
+                yield from read_sheet_tables(workbook, sheet)
+            else:
+                print(f"Sheet '{sheet}' not found in the workbook.")
+    finally:
+        workbook.close()
+
+
+def read_merged_refs(worksheet):
+    """
+    List the merged ranges of a read-only worksheet, e.g. ["A1:C1"].
+
+    The sheet file lists them after its rows, so this scans the file once beforehand, dropping
+    each row as soon as it is read.
+    """
+    from xml.etree.ElementTree import iterparse
+    from openpyxl.xml.constants import SHEET_MAIN_NS
+    sheet_data_tag = f"{{{SHEET_MAIN_NS}}}sheetData"
+    row_tag = f"{{{SHEET_MAIN_NS}}}row"
+    merge_cell_tag = f"{{{SHEET_MAIN_NS}}}mergeCell"
+    merged_refs = []
+    sheet_data = None
+    with open_sheet_source(worksheet) as source:
+        for event, element in iterparse(source, events=("start", "end")):
+            if event == "start":
+                if element.tag == sheet_data_tag:
+                    sheet_data = element
+            elif element.tag == row_tag:
+                sheet_data.clear()
+            elif element.tag == merge_cell_tag:
+                merged_refs.append(element.get("ref"))
+    return merged_refs
+
+
+def read_sheet_tables(workbook, sheet):
+    """
+    Parse one sheet of a read-only workbook into tables of comments, see iter_tables_and_comments.
+
+    Every row of the sheet file is read, plus the rows holding only comments, which the file
+    does not list. A non-empty row with a header value starts a new table.
+
+    Yields:
+        dict: {"Sheet", "Table", "Comments"} for each table with comments.
+    """
+    from openpyxl.utils import get_column_letter
+    worksheet = workbook[sheet]
+    comments = read_sheet_comments(workbook, worksheet)
+    merged_cells = MergedCellIndex(read_merged_refs(worksheet))
+    comment_columns = {}  # Row -> columns with a comment, in order
+    for row_index, column in sorted(comments):
+        comment_columns.setdefault(row_index, []).append(column)
+    comment_rows = sorted(comment_columns, reverse=True)  # Rows with comments not reached yet, last first
+
+    def iter_rows(parser):
+        for row_index, row in parser.parse():
+            while comment_rows and comment_rows[-1] < row_index:
+                yield comment_rows.pop(), {}
+            if comment_rows and comment_rows[-1] == row_index:
+                comment_rows.pop()
+            yield row_index, {cell["column"]: cell["value"] for cell in row}
+        while comment_rows:
+            yield comment_rows.pop(), {}
+
+    current_table_context = None
+    current_table_comments = []
+    with open_sheet_parser(workbook, worksheet) as parser:
+        for row_index, values in iter_rows(parser):
+            # Detect table headers (adjust based on your sheet structure)
+            if any(values.values()) and is_table_header(values.values()):
+                if current_table_comments:
+                    # Yield the comments of the previous table
+                    yield {"Sheet": sheet, "Table": current_table_context, "Comments": current_table_comments}
+                    current_table_comments = []
+                # Start a new table context
+                current_table_context = get_table_context(values.values())
+
+            # Process comments in the current table
+            for column in comment_columns.get(row_index, ()):
+                current_table_comments.append({
+                    "Cell": f"{get_column_letter(column)}{row_index}",
+                    "Value": values.get(column),
+                    "Comment": comments[(row_index, column)],
+                    "Merged": merged_cells.is_merged(row_index, column)
                 })
-        else:
-            print(f"Sheet '{sheet}' not found in the workbook.")
 
-    return all_comments
+    # Yield the last table's comments
+    if current_table_comments:
+        yield {"Sheet": sheet, "Table": current_table_context, "Comments": current_table_comments}
 
 
-from datetime import date, datetime
+def read_sheet_slots(workbook, sheet):
+    """
+    Parse one sheet of a read-only workbook into ShiftSlot records.
+
+    The time and name columns are detected from the "Time / First Name / Last Name" label
+    rows (see src/sheet_layout.py). Rows read before the first label row are kept until it
+    is found, then parsed with its layout; a sheet without label rows is parsed with the
+    layout inferred from its time ranges. Past the first label row, a row only touches the
+    cells of the table's columns, and only the row after a table header is checked for a
+    new label row. Header rows, rows without a time, the "Time" label rows and rows with
+    neither a name nor a comment are skipped. Merged ranges are listed after the rows in
+    the sheet file, so slots with a merged name cell are dropped once the whole sheet has
+    been parsed.
+
+    Parameters:
+        workbook: An openpyxl workbook opened with read_only=True.
+        sheet (str): Name of the sheet to parse.
+
+    Returns:
+        list: ShiftSlot records in row order, empty if the sheet does not exist.
+    """
+    if sheet not in workbook.sheetnames:
+        return []
+    worksheet = workbook[sheet]
+    with stats.timer("workbook_load"):
+        comments = read_sheet_comments(workbook, worksheet)
+
+    sheet_slots = []
+    table_header = ""
+    layout = None
+    profiled_rows = []  # (row_index, values) read before the layout is known
+    labels_expected = True  # The next non-empty row may be a label row
+    header_detection_time = 0.0
+    rows_parsed = 0
+
+    def read_row(row_index, values):
+        """
+        Parse a row with the current layout. Returns True if the row is a table header.
+        """
+        nonlocal table_header, header_detection_time
+        time = values.get(layout.time_column)
+        if not (isinstance(time, str) and is_valid_time_format(time)):
+            header_start = perf_counter()
+            table_header_temp = get_header_value(values.get(column) for column in range(layout.first_column, layout.last_column + 1))
+            header_detection_time += perf_counter() - header_start
+            if table_header_temp:
+                table_header = table_header_temp
+                return True
+        if not time or time == "Time":
+            return False
+        first_name = values.get(layout.first_name_column)
+        comment = comments.get((row_index, layout.first_name_column))
+        if not first_name and comment is None:
+            return False
+        sheet_slots.append(ShiftSlot(sheet, table_header, row_index, layout.first_name_column, layout.last_name_column, time,
+                                     first_name, values.get(layout.last_name_column), comment))
+        return False
+
+    parse_start = perf_counter()
+    with open_sheet_parser(workbook, worksheet) as parser:
+        for row_index, row in parser.parse():
+            rows_parsed += 1
+            if labels_expected:
+                values = {cell["column"]: cell["value"] for cell in row if cell["value"] is not None}
+                if not values:
+                    continue
+                label_layout = get_label_layout(values)
+                if label_layout:
+                    labels_expected = False
+                    if layout is None:
+                        layout = label_layout
+                        for profiled_row in profiled_rows:
+                            read_row(*profiled_row)
+                        profiled_rows = None
+                    layout = label_layout
+                    continue
+                if layout is None:
+                    profiled_rows.append((row_index, values))
+                    continue
+            else:
+                values = {cell["column"]: cell["value"] for cell in row
+                          if layout.first_column <= cell["column"] <= layout.last_column}
+            labels_expected = read_row(row_index, values)
 
-def is_table_header(row):
+        if layout is None:
+            layout = infer_layout(values for _, values in profiled_rows)
+            if layout is None:
+                logging.warning(f"Sheet '{sheet}' has neither a Time / First Name / Last Name label row nor time ranges, skipping it")
+            else:
+                logging.info(f"Sheet '{sheet}' has no Time / First Name / Last Name label row, using {layout}")
+                for profiled_row in profiled_rows:
+                    read_row(*profiled_row)
+
+        merged_refs = []
+        if parser.merged_cells:
+            merged_refs = [merged_cell.ref for merged_cell in parser.merged_cells.mergeCell]
+    stats.add_time("sheet_parse", perf_counter() - parse_start)
+    stats.add_time("header_detection", header_detection_time)
+    stats.count("rows_parsed", rows_parsed)
+
+    with stats.timer("merged_cell_checks"):
+        merged_cells = MergedCellIndex(merged_refs)
+        return [slot for slot in sheet_slots
+                if not merged_cells.is_merged(slot.row, slot.first_name_column)
+                and not merged_cells.is_merged(slot.row, slot.last_name_column)]
+
+
+def extract_sheet_slots(file_path, sheet):
+    """
+    Open the workbook read-only and parse a single sheet into ShiftSlot records.
+    Used as the worker function when sheets are parsed in a process pool.
+
+    Returns:
+        tuple: (ShiftSlot records, timers and counters of the worker for this sheet).
+    """
+    from openpyxl import load_workbook
+    stats.reset()
+    with stats.timer("workbook_load"):
+        workbook = load_workbook(file_path, read_only=True, data_only=False)
+    try:
+        return read_sheet_slots(workbook, sheet), stats.to_dict()
+    finally:
+        workbook.close()
+
+
+def iter_shift_slots(file_path, sheets_to_process, processes=None, cache_dir=None):
+    """
+    Stream the shift rows of a workbook as ShiftSlot records without loading it fully.
+
+    With processes greater than 1 the sheets are parsed in a process pool, each
+    worker opening its own read-only view of the workbook. The records are still
+    yielded in the order of sheets_to_process, so the result is the same as a
+    serial run. The workers' timers and counters are added to src.instrumentation.stats.
+
+    With a cache_dir the records are read from the parsed-workbook cache when the same workbook
+    content was parsed before, and cached after parsing otherwise (see src/workbook_cache.py).
+
+    Parameters:
+        file_path (str): Path to the Excel file.
+        sheets_to_process (list): List of sheet names to process, in order.
+        processes (int): Number of worker processes, None or 1 to parse in this process.
+        cache_dir (str): Directory of the parsed-workbook cache, None to always parse.
+
+    Yields:
+        ShiftSlot: One record per candidate shift row.
+    """
+    if cache_dir:
+        cache = WorkbookCache(cache_dir, extractor_version=EXTRACTOR_VERSION)
+        with stats.timer("workbook_cache"):
+            records = cache.load(file_path, "slots", sheets_to_process)
+        if records is not None:
+            stats.count("workbook_cache_hits")
+            yield from (ShiftSlot(*record) for record in records)
+            return
+        stats.count("workbook_cache_misses")
+        slots = list(iter_shift_slots(file_path, sheets_to_process, processes))
+        with stats.timer("workbook_cache"):
+            cache.store(file_path, "slots", sheets_to_process, slots, len(ShiftSlot._fields))
+        yield from slots
+        return
+
+    if processes and processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for sheet_slots, sheet_stats in executor.map(extract_sheet_slots, repeat(file_path), sheets_to_process):
+                stats.merge(sheet_stats)
+                yield from sheet_slots
+        return
+
+    from openpyxl import load_workbook
+    with stats.timer("workbook_load"):
+        workbook = load_workbook(file_path, read_only=True, data_only=False)
+    try:
+        for sheet in sheets_to_process:
+            yield from read_sheet_slots(workbook, sheet)
+    finally:
+        workbook.close()
+
+
+def extract_workbook_slots(file_path, sheets_to_process, cache_dir=None):
+    """
+    Parse a whole workbook into ShiftSlot records.
+    Used as the worker function when workbooks are parsed in a process pool.
+
+    Returns:
+        tuple: (ShiftSlot records, timers and counters of the worker for this workbook).
+    """
+    stats.reset()
+    return list(iter_shift_slots(file_path, sheets_to_process, cache_dir=cache_dir)), stats.to_dict()
+
+
+def extract_workbooks_slots(file_paths, sheets_to_process, processes=None, cache_dir=None):
+    """
+    Parse several workbooks, concurrently in a process pool when processes is greater than 1.
+
+    Parameters:
+        file_paths (list): Paths to the Excel files.
+        sheets_to_process (list): List of sheet names to process in each workbook, in order.
+        processes (int): Number of worker processes, None or 1 to parse in this process.
+        cache_dir (str): Directory of the parsed-workbook cache, None to always parse.
+
+    Returns:
+        list: The ShiftSlot records of each workbook, in the order of file_paths.
+    """
+    if processes and processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        workbook_slots = []
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for slots, workbook_stats in executor.map(extract_workbook_slots, file_paths, repeat(sheets_to_process), repeat(cache_dir)):
+                stats.merge(workbook_stats)
+                workbook_slots.append(slots)
+        return workbook_slots
+    return [list(iter_shift_slots(file_path, sheets_to_process, cache_dir=cache_dir)) for file_path in file_paths]
+
+
+def is_table_header(values):
     """
     Determine if a row is a table header based on custom rules.
+
+    Parameters:
+        values (iterable): The cell values of the row, in column order.
     """
-    for cell in row:
-        if cell.value:
-            # Check if the cell contains a string with "day" or "2024"
-            if isinstance(cell.value, str) and ("day" in cell.value.lower() or "2024" in cell.value.lower()):
-                return True
-            # Check if the cell contains a date
-            elif isinstance(cell.value, (date, datetime)):
-                return True
-    return False
+    return get_header_value(values) is not None
 
 
 
-def get_table_context(row):
+def get_table_context(values):
     """
-    Extract table context (e.g., date or day) from a header row.
+    Extract table context (e.g., date or day) from the cell values of a header row.
     Adjust this function to match the structure of your sheet.
     """
-    for cell in row:
-        if cell.value:
+    for value in values:
+        if value:
             # Check if the cell contains a string
-            if isinstance(cell.value, str):
-                return cell.value
+            if isinstance(value, str):
+                return value
             # Check if the cell contains a date
-            elif isinstance(cell.value, (date, datetime)):
-                return cell.value.strftime("%Y-%m-%d")  # Format the date as needed
+            elif isinstance(value, (date, datetime)):
+                return value.strftime("%Y-%m-%d")  # Format the date as needed
     return "Unknown Table"
 
 
 def save_to_json(data, output_file):
     """
     Save data to a JSON file.
+
+    A list or any other iterable, e.g. the tables of iter_tables_and_comments, is written item
+    by item as a JSON array, so a generator is never held in memory as a whole. The file is the
+    same as json.dump(list(data), file, indent=4) would write.
     """
     with open(output_file, 'w') as file:
-        json.dump(data, file, indent=4)
+        if isinstance(data, dict):
+            json.dump(data, file, indent=4)
+        else:
+            separator = "[\n"
+            for item in data:
+                file.write(separator)
+                # Newlines inside strings are escaped, so this only indents the item's own lines
+                file.write("    " + json.dumps(item, indent=4).replace("\n", "\n    "))
+                separator = ",\n"
+            file.write("[]" if separator == "[\n" else "\n]")
     print(f"Comments saved to {output_file}")
 
 
@@ -124,7 +460,7 @@ if __name__ == "__main__":
     sheets = config.get("sheets_to_process", [])
     output_file = config.get("output_file", "processed_comments.json")
     
-    comments_data = extract_tables_and_comments(excel_file_path, sheets)
+    comments_data = iter_tables_and_comments(excel_file_path, sheets)
     
-    # Save comments to JSON
+    # Save comments to JSON, each table as it is read
     save_to_json(comments_data, output_file)
@@ -0,0 +1,192 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from src.calendar_policy import get_calendar_policy
+from src.parsing import parse_time_range
+
+
+def get_duration(start, end):
+    """
+    Duration in hours of a shift given as start and end minutes, handling shifts crossing midnight.
+    """
+    minutes = end - start
+    if minutes < 0:
+        minutes += 24 * 60
+    return minutes / 60
+
+
+class Shift:
+    __slots__ = ("location", "date", "time", "start", "end")
+
+    def __init__(self, location, date, time, start, end):
+        """
+        A single assigned shift with its time range pre-parsed into minutes.
+
+        Parameters:
+            location (str): Location of the shift (e.g., Dish).
+            date (str): Date of the shift.
+            time (str): Time range of the shift without spaces (e.g., "8:30AM-12:00PM").
+            start (int): Start of the shift in minutes after midnight.
+            end (int): End of the shift in minutes after midnight.
+        """
+        self.location = location
+        self.date = date
+        self.time = time
+        self.start = start
+        self.end = end
+
+    @property
+    def hours(self):
+        return get_duration(self.start, self.end)
+
+    def to_dict(self):
+        return {"location": self.location, "date": self.date, "time": self.time}
+
+
+class DayIntervals:
+    __slots__ = ("starts", "ends", "max_ends")
+
+    def __init__(self):
+        """
+        Shift intervals of one day, sorted by start minute.
+
+        max_ends[i] holds the latest end among the first i + 1 intervals, so an
+        overlap check only needs a bisect on starts and one lookup in max_ends.
+        A shift ending before it starts crosses midnight, its end is stored past
+        24 * 60 so it overlaps the later shifts of the evening it belongs to.
+        """
+        self.starts = array("H")
+        self.ends = array("H")
+        self.max_ends = array("H")
+
+    def add(self, start, end):
+        if end < start:
+            end += 24 * 60
+        position = bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.max_ends.insert(position, 0)
+        latest_end = self.max_ends[position - 1] if position else 0
+        for index in range(position, len(self.ends)):
+            latest_end = max(latest_end, self.ends[index])
+            self.max_ends[index] = latest_end
+
+    def overlaps(self, start, end):
+        """
+        Check if any interval of the day overlaps [start, end).
+        Intervals that only touch (back-to-back shifts) do not overlap.
+        """
+        if end < start:
+            end += 24 * 60
+        # Only intervals starting before the new end can overlap it.
+        position = bisect_left(self.starts, end)
+        return position > 0 and self.max_ends[position - 1] > start
+
+
+class Employee:
+    def __init__(self, name, calendar_policy=None):
+        """
+        Initialize a person object to store and manage shift details.
+
+        Parameters:
+            name (str): Full name of the person.
+            calendar_policy (CalendarPolicy): Maps shift dates to cap buckets, defaults to the one in config/config.yaml.
+        """
+        self.name = name
+        self.calendar_policy = calendar_policy or get_calendar_policy()
+        self.shifts = []  # List of Shift objects in the order they were added
+        self.shifts_by_date = {}  # Date -> DayIntervals of the shifts on that date
+        self.dish_or_pot_shift_taken = False  # Boolean flag for Dish Room shift
+        self.total_shift_count = 0  # Total number of shifts
+        self.bucket_shift_counts = {}  # Bucket (named period or ISO week) -> number of shifts
+        self.bucket_hours = {}  # Bucket -> hours assigned
+        self.location_shift_counts = {}  # Location -> number of shifts
+        self.location_bucket_shift_counts = {}  # (location, bucket) -> number of shifts
+        self.total_hours = 0.0  # Total hours assigned
+
+    @staticmethod
+    def get_hours(time):
+        """
+        Calculate the duration of a shift in hours.
+
+        Parameters:
+            time (str): Time range of the shift (e.g., "8:30AM-12:00PM").
+
+        Returns:
+            float: Duration of the shift in hours.
+        """
+        try:
+            return get_duration(*parse_time_range(time))
+        except ValueError:
+            raise ValueError("Time should be in the format '8:30AM - 12:00PM'")
+        
+    def add_shift(self, location, date, time):
+        """
+        Add a shift to the person's schedule.
+
+        Parameters:
+            location (str): Location of the shift (e.g., Dish Room).
+            date (str): Date of the shift.
+            time (str): Time range of the shift (e.g., "8:30AM - 12:00PM").
+            hours (float): Duration of the shift in hours.
+        """
+        time = time.replace(" ", "")
+        try:
+            start, end = parse_time_range(time)
+        except ValueError:
+            raise ValueError("Time should be in the format '8:30AM - 12:00PM'")
+        shift = Shift(location, date, time, start, end)
+        self.shifts.append(shift)
+        day_intervals = self.shifts_by_date.get(date)
+        if day_intervals is None:
+            day_intervals = self.shifts_by_date[date] = DayIntervals()
+        day_intervals.add(start, end)
+        self.total_shift_count += 1
+        hours = shift.hours
+        bucket = self.calendar_policy.get_bucket(date)
+        self.bucket_shift_counts[bucket] = self.bucket_shift_counts.get(bucket, 0) + 1
+        self.bucket_hours[bucket] = self.bucket_hours.get(bucket, 0.0) + hours
+        self.location_shift_counts[location] = self.location_shift_counts.get(location, 0) + 1
+        self.location_bucket_shift_counts[(location, bucket)] = self.location_bucket_shift_counts.get((location, bucket), 0) + 1
+        self.total_hours += hours
+        if location == "Dish" or location == "Pot Room":
+            self.dish_or_pot_shift_taken = True
+
+    def has_conflict(self, date_or_day, time):
+        """
+        Check if the person has a conflict with a new shift.
+        Overlaps are not allowed, but shifts can be back-to-back.
+
+        Parameters: 
+            date_or_day (str): Date of the new shift.
+            time (str): Time range of the new shift (e.g., "8:30AM - 12:00PM").
+
+        Returns:
+            bool: True if there is a conflict, False otherwise.
+        """
+        # Parse the new shift's start and end times
+        time = time.replace(" ", "")
+        try:
+            new_start, new_end = parse_time_range(time)
+        except ValueError:
+            raise ValueError(f"{time} Time should be in the format '8:30AM - 12:00PM'")
+
+        day_intervals = self.shifts_by_date.get(date_or_day)
+        if day_intervals is None:
+            return False
+        return day_intervals.overlaps(new_start, new_end)
+
+
+    def get_summary(self):
+        """
+        Get a summary of the person's assigned shifts and statistics.
+
+        Returns:
+            dict: Summary of the person's shifts, counts, and hours.
+        """
+        return {
+            "name": self.name,
+            "shifts": [shift.to_dict() for shift in self.shifts],
+            "dish_or_pot_shift_taken": self.dish_or_pot_shift_taken,
+            "total_shift_count": self.total_shift_count,
+            "total_hours": self.total_hours,
+        }
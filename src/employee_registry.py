@@ -0,0 +1,210 @@
+from contextlib import contextmanager
+from functools import lru_cache
+import unicodedata
+from src.config_loader import DEFAULT_CONFIG_PATH, load_config
+from src.parsing import iter_comments
+
+
+# Registry of the run in progress, see employee_registry_for.
+active_employee_registry = None
+
+
+def clean_name(name):
+    """
+    Unicode NFKC form of a name with leading, trailing and repeated whitespace removed.
+    """
+    return " ".join(unicodedata.normalize("NFKC", name).split())
+
+
+def normalize_name(name):
+    """
+    Key shared by the spellings of one name: clean_name, case folded.
+    """
+    return clean_name(name).casefold()
+
+
+def split_name(name):
+    """
+    Split a full name into first name(s) and last name, e.g. "Disha Prasanna Kumar" -> ("Disha Prasanna", "Kumar").
+    """
+    name_parts = name.split()
+    if len(name_parts) > 1:  # Ensure there's a last name
+        return ' '.join(name_parts[:-1]), name_parts[-1]
+    return (name_parts[0] if name_parts else ''), ''
+
+
+class EmployeeRegistry:
+    def __init__(self, aliases=None):
+        """
+        Interns the names of commenters to integer ids, so each person gets one Employee however
+        their name is spelled.
+
+        Spellings differing only in case, whitespace or unicode form share an id, and so do the
+        spellings listed in aliases. A person's name is the alias target, or else their first
+        spelling registered, cleaned, so a run registers the spellings of its slots in a fixed
+        order first (see create_employee_registry). Normalized forms, name parts and comment
+        ownership checks are computed once per spelling or (comment, id) pair and then looked up.
+
+        Parameters:
+            aliases (dict): Other spellings of a name -> the name they stand for.
+        """
+        self.ids = {}  # Normalized spelling -> id
+        self.spellings = {}  # Spelling as written -> id, skips normalizing spellings seen before
+        self.names = []  # Id -> name
+        self.name_parts = []  # Id -> (first_name, last_name)
+        self.folded_names = []  # Id -> normalized spellings of the person
+        self.own_comments = {}  # (comment, id) -> True if the comment is part of one of the person's spellings
+        for alias, name in (aliases or {}).items():
+            self.add_alias(alias, name)
+
+    def get_id(self, name):
+        """
+        Id of a name, registering it as a new person if no spelling of it was seen before.
+        The person's lists are filled before the id is published in ids, so find_id called
+        from another thread meanwhile never returns an id without a name.
+        """
+        person_id = self.spellings.get(name)
+        if person_id is None:
+            key = normalize_name(name)
+            person_id = self.ids.get(key)
+            if person_id is None:
+                person_id = len(self.names)
+                self.names.append(clean_name(name))
+                self.name_parts.append(split_name(self.names[person_id]))
+                self.folded_names.append((key,))
+                self.ids[key] = person_id
+            self.spellings[name] = person_id
+        return person_id
+
+    def find_id(self, name):
+        """
+        Id of a name without registering it, None if no spelling of it was seen, so lookups
+        (e.g. queries of the resolution service) never change the names of later runs.
+        """
+        person_id = self.spellings.get(name)
+        if person_id is None:
+            person_id = self.ids.get(normalize_name(name))
+        return person_id
+
+    def find_name(self, name):
+        person_id = self.find_id(name)
+        return None if person_id is None else self.names[person_id]
+
+    def add_alias(self, alias, name):
+        """
+        Count alias as another spelling of name.
+        """
+        person_id = self.get_id(name)
+        key = normalize_name(alias)
+        if self.ids.setdefault(key, person_id) != person_id:
+            raise ValueError(f"Alias '{alias}' is already the name of someone else")
+        if key not in self.folded_names[person_id]:
+            self.folded_names[person_id] += (key,)
+            self.own_comments = {cache_key: is_own for cache_key, is_own in self.own_comments.items() if cache_key[1] != person_id}
+
+    def get_name(self, name):
+        return self.names[self.get_id(name)]
+
+    def get_name_parts(self, name):
+        return self.name_parts[self.get_id(name)]
+
+    def is_own_comment(self, comment, name):
+        """
+        Check if a comment was made by the person for themselves, i.e. the comment is part of their name.
+        """
+        cache_key = (comment, self.get_id(name))
+        is_own = self.own_comments.get(cache_key)
+        if is_own is None:
+            folded_comment = normalize_name(comment)
+            is_own = self.own_comments[cache_key] = any(folded_comment in folded_name
+                                                         for folded_name in self.folded_names[cache_key[1]])
+        return is_own
+
+    def __len__(self):
+        return len(self.names)
+
+
+def load_employee_registry(config):
+    """
+    Build an EmployeeRegistry from the aliases of a config dict.
+    """
+    return EmployeeRegistry(config.get("aliases"))
+
+
+@lru_cache(maxsize=None)
+def load_aliases_file(config_path=DEFAULT_CONFIG_PATH):
+    return tuple((load_config(config_path).get("aliases") or {}).items())
+
+
+def get_aliases(config_path=DEFAULT_CONFIG_PATH):
+    """
+    The alias table of a config file, other spelling -> name.
+    """
+    return dict(load_aliases_file(config_path))
+
+
+def create_employee_registry(slots, config_path=DEFAULT_CONFIG_PATH):
+    """
+    The registry of one run over slots.
+
+    The aliases of the config are registered first, then the names of the filled name cells in
+    slot order, then the commenters in slot and comment order. A person's name is thus the alias
+    target, else their spelling in the first name cell holding it, else their first spelling in
+    the comments, whatever earlier runs of the process saw. Comment threads are scanned one
+    comment at a time (see iter_comments), so a long thread is never held parsed.
+
+    Parameters:
+        slots (list): ShiftSlot records of the run, in sheet order.
+        config_path (str): Config file holding the aliases.
+    """
+    registry = EmployeeRegistry(get_aliases(config_path))
+    for slot in slots:
+        if slot.first_name:
+            registry.get_id(slot.first_name + " " + slot.last_name)
+    for slot in slots:
+        if not slot.first_name:
+            for _, commenter in iter_comments(slot.comment):
+                if commenter != 'Unknown':
+                    registry.get_id(commenter)
+    return registry
+
+
+@contextmanager
+def employee_registry_for(slots):
+    """
+    Resolve with a registry created from slots while the block runs (see create_employee_registry).
+    A block nested in another one keeps the outer registry, so a whole run shares one.
+    """
+    global active_employee_registry
+    if active_employee_registry is not None:
+        yield active_employee_registry
+        return
+    active_employee_registry = create_employee_registry(slots)
+    try:
+        yield active_employee_registry
+    finally:
+        active_employee_registry = None
+
+
+@contextmanager
+def use_employee_registry(registry):
+    """
+    Resolve with registry while the block runs, e.g. the registry a service keeps between updates.
+    """
+    global active_employee_registry
+    previous = active_employee_registry
+    active_employee_registry = registry
+    try:
+        yield registry
+    finally:
+        active_employee_registry = previous
+
+
+def get_employee_registry(config_path=DEFAULT_CONFIG_PATH):
+    """
+    The registry of the run in progress. Outside a run, a new registry holding only the aliases
+    of the config, so names never depend on what earlier calls saw.
+    """
+    if active_employee_registry is not None:
+        return active_employee_registry
+    return EmployeeRegistry(get_aliases(config_path))
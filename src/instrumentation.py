@@ -0,0 +1,69 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import json
+import time
+
+
+class RunStats:
+    def __init__(self):
+        """
+        Timers (seconds) and counters collected during a resolver run.
+
+        While paused, timers and counters are left untouched, so passes that only
+        compare or probe decisions do not inflate the numbers of the real run.
+        """
+        self.timers = defaultdict(float)
+        self.counters = Counter()
+        self.paused = False
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+        self.paused = False
+
+    @contextmanager
+    def timer(self, name):
+        if self.paused:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] += time.perf_counter() - start
+
+    def add_time(self, name, seconds):
+        if not self.paused:
+            self.timers[name] += seconds
+
+    def count(self, name, amount=1):
+        if not self.paused:
+            self.counters[name] += amount
+
+    def merge(self, stats_dict):
+        """
+        Add the timers and counters of another run, e.g. one returned by a worker process.
+        """
+        for name, seconds in stats_dict["timers"].items():
+            self.add_time(name, seconds)
+        for name, amount in stats_dict["counters"].items():
+            self.count(name, amount)
+
+    def to_dict(self):
+        return {
+            "timers": {name: round(seconds, 6) for name, seconds in sorted(self.timers.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def save_report(self, report_path, **details):
+        """
+        Write the timers and counters as a JSON run report, along with any extra details of the run.
+        """
+        report = dict(details)
+        report.update(self.to_dict())
+        with open(report_path, 'w') as file:
+            json.dump(report, file, indent=4, default=str)
+
+
+# Stats of the current run, reset at the start of each load_and_assign_shift_xlsx call.
+stats = RunStats()
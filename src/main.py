@@ -0,0 +1,147 @@
+"""
+Command line of the shift resolver.
+
+    python -m src.main resolve workbook.xlsx [--solver optimal] [--no-write] [--json out.json] [--csv out.csv]
+    python -m src.main batch first.xlsx second.xlsx [--processes 4] [--report report.json]
+    python -m src.main simulate workbook.xlsx variants.yaml [--processes 4] [--output diff.json]
+    python -m src.main extract workbook.xlsx [--output comments.json]
+    python -m src.main serve workbook.xlsx [--port 8765] [--watch]
+
+Each command imports what it needs when it runs, so the command line starts without
+loading openpyxl or YAML. The NumPy backend of the greedy pass is slower than the scalar
+one on schedules with a few commenters per slot, so it is only offered to library callers
+(backend="numpy", see assignment_engine.assign_greedy).
+"""
+import argparse
+
+
+def resolve(args):
+    from src import assignment_engine
+    assignment_engine.configure_logging(args.log_file)
+    shift_assignments = assignment_engine.load_and_assign_shift_xlsx(
+        args.file_path, args.sheets or assignment_engine.default_sheets_to_analyze, processes=args.processes,
+        solver=args.solver, snapshot_path=args.snapshot, report_path=args.report, write_workbook=not args.no_write,
+        json_path=args.json, csv_path=args.csv, cache_dir=args.cache_dir)
+    print(f"Assigned {sum(len(employee_obj.shifts) for employee_obj in shift_assignments.values())} shifts "
+          f"to {len(shift_assignments)} people, see {args.log_file}")
+
+
+def batch(args):
+    from src import assignment_engine
+    assignment_engine.configure_logging(args.log_file)
+    shift_assignments = assignment_engine.load_and_assign_shift_xlsx_batch(
+        args.file_paths, args.sheets or assignment_engine.default_sheets_to_analyze, processes=args.processes,
+        solver=args.solver, report_path=args.report, write_workbook=not args.no_write,
+        json_path=args.json, csv_path=args.csv, cache_dir=args.cache_dir)
+    print(f"Assigned {sum(len(employee_obj.shifts) for employee_obj in shift_assignments.values())} shifts "
+          f"from {len(args.file_paths)} workbooks to {len(shift_assignments)} people, see {args.log_file}")
+
+
+def simulate(args):
+    import json
+    from src import assignment_engine
+    from src.config_loader import load_config
+    from src.simulation import simulate_workbook
+    assignment_engine.configure_logging(args.log_file)
+    variants = load_config(args.variants)
+    if isinstance(variants, dict):
+        variants = variants.get("variants", [])
+    report = simulate_workbook(args.file_path, args.sheets or assignment_engine.default_sheets_to_analyze, variants,
+                               processes=args.processes, cache_dir=args.cache_dir)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4, default=str)
+    baseline = report["baseline"]
+    print(f"{'variant':30} {'assigned':>9} {'changed':>8} {'cleared':>8}")
+    print(f"{baseline['name']:30} {baseline['assigned']:9} {0:8} {baseline['comments_cleared']:8}")
+    for summary in report["variants"]:
+        print(f"{summary['name']:30} {summary['assigned']:9} {len(summary['changes']):8} {summary['comments_cleared']:8}")
+
+
+def extract(args):
+    from src.config_loader import load_config
+    from src.data_extractor import extract_tables_and_comments, iter_tables_and_comments, save_to_json
+    config = load_config(args.config)
+    sheets = args.sheets or config.get("sheets_to_process", [])
+    output_file = args.output or config.get("output", {}).get("comments_file", "processed_comments.json")
+    if args.cache_dir:
+        tables = extract_tables_and_comments(args.file_path, sheets, cache_dir=args.cache_dir)
+    else:
+        tables = iter_tables_and_comments(args.file_path, sheets)  # Written to the file as each table is read
+    save_to_json(tables, output_file)
+
+
+def serve(args):
+    import asyncio
+    from src import assignment_engine
+    from src.resolution_service import DEFAULT_HOST, DEFAULT_PORT, run_service
+    assignment_engine.configure_logging(args.log_file)
+    asyncio.run(run_service(args.file_path, args.sheets or assignment_engine.default_sheets_to_analyze,
+                            args.host or DEFAULT_HOST, args.port or DEFAULT_PORT, args.watch, args.interval, args.cache_dir))
+
+
+def get_sheets(value):
+    return [sheet.strip() for sheet in value.split(",") if sheet.strip()]
+
+
+def get_parser():
+    from src.config_loader import DEFAULT_CONFIG_PATH
+    parser = argparse.ArgumentParser(prog="python -m src.main", description="Assign shifts from the comments of a schedule workbook.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("file_path", help="Path to the .xlsx schedule")
+    common.add_argument("--sheets", type=get_sheets, help="Comma separated sheet names, in the order they are resolved")
+    common.add_argument("--cache-dir", help="Directory of the parsed-workbook cache")
+    common.add_argument("--log-file", default="shift_assignment.log")
+
+    resolve_parser = commands.add_parser("resolve", parents=[common], help="Resolve the comments into shift assignments")
+    resolve_parser.add_argument("--solver", choices=["greedy", "optimal"], default="greedy")
+    resolve_parser.add_argument("--processes", type=int, help="Parse the sheets in this many processes")
+    resolve_parser.add_argument("--snapshot", help="Snapshot file for incremental runs")
+    resolve_parser.add_argument("--report", help="Write a JSON run report to this path")
+    resolve_parser.add_argument("--json", help="Export the assignments as JSON to this path")
+    resolve_parser.add_argument("--csv", help="Export the assignments as CSV to this path")
+    resolve_parser.add_argument("--no-write", action="store_true", help="Leave the workbook untouched")
+    resolve_parser.set_defaults(handler=resolve)
+
+    batch_parser = commands.add_parser("batch", help="Resolve several workbooks with shared employee caps")
+    batch_parser.add_argument("file_paths", nargs="+", help="Paths to the .xlsx schedules, in the order they are resolved")
+    batch_parser.add_argument("--sheets", type=get_sheets, help="Comma separated sheet names, in the order they are resolved")
+    batch_parser.add_argument("--cache-dir", help="Directory of the parsed-workbook cache")
+    batch_parser.add_argument("--log-file", default="shift_assignment.log")
+    batch_parser.add_argument("--solver", choices=["greedy", "optimal"], default="greedy")
+    batch_parser.add_argument("--processes", type=int, help="Parse and write the workbooks in this many processes")
+    batch_parser.add_argument("--report", help="Write a JSON run report with the batch throughput to this path")
+    batch_parser.add_argument("--json", help="Export the assignments as JSON to this path")
+    batch_parser.add_argument("--csv", help="Export the assignments as CSV to this path")
+    batch_parser.add_argument("--no-write", action="store_true", help="Leave the workbooks untouched")
+    batch_parser.set_defaults(handler=batch)
+
+    simulate_parser = commands.add_parser("simulate", parents=[common], help="Compare policy variants without writing the workbook")
+    simulate_parser.add_argument("variants", help="YAML or JSON list of variants, see src/simulation.py")
+    simulate_parser.add_argument("--processes", type=int, help="Run the variants in this many processes")
+    simulate_parser.add_argument("--output", help="Write the variants' summaries and diffs as JSON to this path")
+    simulate_parser.set_defaults(handler=simulate)
+
+    extract_parser = commands.add_parser("extract", parents=[common], help="Save the comments of each table as JSON")
+    extract_parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    extract_parser.add_argument("--output", help="Path of the JSON file, defaults to output.comments_file of the config")
+    extract_parser.set_defaults(handler=extract)
+
+    serve_parser = commands.add_parser("serve", parents=[common], help="Serve assignments and re-resolve them on updates")
+    serve_parser.add_argument("--host", help="Address to listen on, defaults to 127.0.0.1")
+    serve_parser.add_argument("--port", type=int, help="Port to listen on, defaults to 8765")
+    serve_parser.add_argument("--watch", action="store_true", help="Poll the workbook and apply its edits")
+    serve_parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls of the workbook")
+    serve_parser.set_defaults(handler=serve)
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from weakref import WeakKeyDictionary
+
+
+_index_cache = WeakKeyDictionary()
+
+
+class MergedCellIndex:
+    def __init__(self, merged_ranges):
+        """
+        Build a lookup of every cell covered by the given merged ranges.
+
+        The ranges are walked once, so each membership check afterwards is a
+        single set lookup instead of a scan over all ranges.
+
+        Parameters:
+            merged_ranges (iterable): CellRange objects or range strings such as "A1:C1".
+        """
+        from openpyxl.worksheet.cell_range import CellRange
+        self.cells = set()
+        for merged_range in merged_ranges:
+            if isinstance(merged_range, str):
+                merged_range = CellRange(merged_range)
+            self.cells.update(merged_range.cells)
+
+    def is_merged(self, row, column):
+        """
+        Check if the cell at (row, column) is part of a merged range.
+
+        Parameters:
+            row (int): 1-based row index.
+            column (int): 1-based column index.
+
+        Returns:
+            bool: True if the cell is part of a merged range, False otherwise.
+        """
+        return (row, column) in self.cells
+
+    def __contains__(self, cell):
+        return (cell.row, cell.column) in self.cells
+
+    def __len__(self):
+        return len(self.cells)
+
+
+def get_merged_cell_index(worksheet):
+    """
+    Return the merged-cell index of a worksheet, building it on first use.
+
+    The index is cached per worksheet object, so it has to be rebuilt with
+    MergedCellIndex(worksheet.merged_cells.ranges) if cells are merged or
+    unmerged afterwards.
+
+    Parameters:
+        worksheet: An openpyxl worksheet object.
+
+    Returns:
+        MergedCellIndex: The index for the worksheet.
+    """
+    merged_index = _index_cache.get(worksheet)
+    if merged_index is None:
+        merged_index = MergedCellIndex(worksheet.merged_cells.ranges)
+        _index_cache[worksheet] = merged_index
+    return merged_index
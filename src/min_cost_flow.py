@@ -0,0 +1,150 @@
+import heapq
+from collections import deque
+
+
+INFINITY = float("inf")
+
+
+class MinCostFlow:
+    def __init__(self):
+        """
+        A directed flow network solved for maximum flow at minimum cost.
+
+        Edges are stored in flat lists; edge e and its residual twin e ^ 1 are
+        always added together, so the flow on an edge is the capacity left on
+        its twin. Costs must be non-negative integers.
+        """
+        self.graph = []  # Node -> list of outgoing edge ids (including residual twins)
+        self.to = []
+        self.capacity = []
+        self.cost = []
+
+    def add_node(self):
+        self.graph.append([])
+        return len(self.graph) - 1
+
+    def add_edge(self, source, target, capacity, cost=0):
+        """
+        Add an edge and its residual twin.
+
+        Returns:
+            int: Id of the edge, used to read its flow after solving.
+        """
+        edge = len(self.to)
+        self.to += [target, source]
+        self.capacity += [capacity, 0]
+        self.cost += [cost, -cost]
+        self.graph[source].append(edge)
+        self.graph[target].append(edge + 1)
+        return edge
+
+    def get_flow(self, edge):
+        return self.capacity[edge ^ 1]
+
+    def solve(self, source, sink):
+        """
+        Send as much flow as possible from source to sink at the lowest total cost.
+
+        Successive shortest paths: Dijkstra on reduced costs finds the current
+        shortest distance, then every augmenting path made only of zero reduced
+        cost edges is saturated (Dinic style) before the next Dijkstra run, so
+        the number of Dijkstra runs is bounded by the number of distinct path
+        costs rather than by the amount of flow.
+
+        Returns:
+            tuple: (total flow, total cost).
+        """
+        potential = [0] * len(self.graph)
+        total_flow = 0
+        total_cost = 0
+        while True:
+            distance = self.get_distances(source, potential)
+            sink_distance = distance[sink]
+            if sink_distance == INFINITY:
+                break
+            for node, node_distance in enumerate(distance):
+                potential[node] += min(node_distance, sink_distance)
+            flow = self.augment_shortest_paths(source, sink, potential)
+            total_flow += flow
+            total_cost += flow * (potential[sink] - potential[source])
+        return total_flow, total_cost
+
+    def get_distances(self, source, potential):
+        graph, to, capacity, cost = self.graph, self.to, self.capacity, self.cost
+        distance = [INFINITY] * len(graph)
+        distance[source] = 0
+        heap = [(0, source)]
+        while heap:
+            node_distance, node = heapq.heappop(heap)
+            if node_distance > distance[node]:
+                continue
+            node_potential = potential[node]
+            for edge in graph[node]:
+                if capacity[edge] <= 0:
+                    continue
+                target = to[edge]
+                target_distance = node_distance + cost[edge] + node_potential - potential[target]
+                if target_distance < distance[target]:
+                    distance[target] = target_distance
+                    heapq.heappush(heap, (target_distance, target))
+        return distance
+
+    def is_admissible(self, node, edge, potential):
+        return self.capacity[edge] > 0 and self.cost[edge] + potential[node] - potential[self.to[edge]] == 0
+
+    def augment_shortest_paths(self, source, sink, potential):
+        """
+        Saturate the paths whose edges all have zero reduced cost.
+
+        Returns:
+            int: The amount of flow sent.
+        """
+        graph, to, capacity = self.graph, self.to, self.capacity
+        total_flow = 0
+        while True:
+            # Level the admissible subgraph so the path search cannot cycle.
+            level = [-1] * len(graph)
+            level[source] = 0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                for edge in graph[node]:
+                    target = to[edge]
+                    if level[target] < 0 and self.is_admissible(node, edge, potential):
+                        level[target] = level[node] + 1
+                        queue.append(target)
+            if level[sink] < 0:
+                return total_flow
+
+            next_edge = [0] * len(graph)
+            path = []  # Edge ids from source to the current node
+            node = source
+            while True:
+                if node == sink:
+                    flow = min(capacity[edge] for edge in path)
+                    for edge in path:
+                        capacity[edge] -= flow
+                        capacity[edge ^ 1] += flow
+                    total_flow += flow
+                    path = []
+                    node = source
+                    continue
+                edges = graph[node]
+                while next_edge[node] < len(edges):
+                    edge = edges[next_edge[node]]
+                    target = to[edge]
+                    if level[target] == level[node] + 1 and self.is_admissible(node, edge, potential):
+                        break
+                    next_edge[node] += 1
+                if next_edge[node] < len(edges):
+                    edge = edges[next_edge[node]]
+                    path.append(edge)
+                    node = to[edge]
+                    continue
+                # Dead end: retreat and skip the edge that led here.
+                if node == source:
+                    break
+                level[node] = -1
+                edge = path.pop()
+                node = to[edge ^ 1]
+                next_edge[node] += 1
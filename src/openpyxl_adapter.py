@@ -0,0 +1,80 @@
+"""
+The openpyxl internals the streaming readers of src/data_extractor.py rely on, in one place.
+
+Read-only worksheets are parsed with openpyxl's own sheet parser instead of iter_rows, which
+builds a cell object per cell, and their comments are read from the workbook archive, which
+openpyxl does not do in read-only mode. These are private APIs, so they are only used with the
+openpyxl versions they were tested with (see requirements.txt): check_openpyxl_version raises
+an ImportError naming the supported range on any other version.
+
+openpyxl is imported by the functions that use it, so importing this module does not load it.
+"""
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+# Versions whose private reader APIs match what this module uses, minimum included, maximum excluded.
+MIN_OPENPYXL_VERSION = (3, 1)
+MAX_OPENPYXL_VERSION = (3, 2)
+
+
+@lru_cache(maxsize=None)
+def check_openpyxl_version():
+    import openpyxl
+    version = tuple(int(part) for part in openpyxl.__version__.split(".")[:2] if part.isdigit())
+    if not MIN_OPENPYXL_VERSION <= version < MAX_OPENPYXL_VERSION:
+        raise ImportError(f"The workbook readers support openpyxl {'.'.join(map(str, MIN_OPENPYXL_VERSION))} up to "
+                          f"{'.'.join(map(str, MAX_OPENPYXL_VERSION))} (excluded), found {openpyxl.__version__}")
+
+
+def open_sheet_source(worksheet):
+    """
+    Open the XML file of a read-only worksheet, to be closed after use (e.g. in a with block).
+    """
+    check_openpyxl_version()
+    return worksheet._get_source()
+
+
+@contextmanager
+def open_sheet_parser(workbook, worksheet):
+    """
+    Parser of a read-only worksheet's XML file, closed when the block exits.
+
+    parser.parse() yields (row index, cells) per row of the file, each cell a dict with its
+    "column" and "value", among others. Once the rows are parsed, parser.merged_cells holds
+    the merged ranges of the sheet (None if it has none).
+    """
+    check_openpyxl_version()
+    from openpyxl.worksheet._reader import WorkSheetParser
+    with worksheet._get_source() as source:
+        yield WorkSheetParser(source,
+                              worksheet._shared_strings,
+                              data_only=workbook.data_only,
+                              epoch=workbook.epoch,
+                              date_formats=workbook._date_formats,
+                              timedelta_formats=workbook._timedelta_formats)
+
+
+def read_sheet_comments(workbook, worksheet):
+    """
+    Read the comment threads of a read-only worksheet, which openpyxl does not load itself.
+
+    Returns:
+        dict: Comment text keyed by (row, column).
+    """
+    check_openpyxl_version()
+    from openpyxl.comments.comment_sheet import CommentSheet
+    from openpyxl.packaging.relationship import get_dependents, get_rels_path
+    from openpyxl.utils import coordinate_to_tuple
+    from openpyxl.xml.constants import COMMENTS_NS
+    from openpyxl.xml.functions import fromstring
+    archive = workbook._archive
+    rels_path = get_rels_path(worksheet._worksheet_path)
+    if rels_path not in archive.namelist():
+        return {}
+    comments = {}
+    for rel in get_dependents(archive, rels_path).find(COMMENTS_NS):
+        comment_sheet = CommentSheet.from_tree(fromstring(archive.read(rel.target)))
+        for ref, comment in comment_sheet.comments:
+            comments[coordinate_to_tuple(ref)] = comment.text
+    return comments
@@ -0,0 +1,167 @@
+from functools import lru_cache
+import re
+
+
+COMMENT_SEPARATOR = '\n----\n'
+COMMENTER_SEPARATOR = '\n\t-'
+# Two comment separators sharing their newline, the only way two of them can overlap.
+OVERLAPPING_SEPARATORS = COMMENT_SEPARATOR + COMMENT_SEPARATOR[1:]
+# ASCII digits only, as datetime.strptime
+TIME_RANGE_PATTERN = re.compile(r"^\d{1,2}:\d{2}[APM]{2}-\d{1,2}:\d{2}[APM]{2}$", re.ASCII)
+TIME_PATTERN = re.compile(r"(\d{1,2}):(\d{1,2})([AP]M)", re.IGNORECASE | re.ASCII)
+TIME_CACHE_SIZE = 4096
+
+
+def parse_comments(raw_comment):
+    """
+    Parses a raw comment string into a list of (comment, commenter) tuples.
+
+    Parameters:
+        raw_comment (str): The raw comment text from a cell.
+
+    Returns:
+        list: A list of tuples, each containing (comment, commenter).
+    """
+    if not raw_comment:
+        return []
+
+    # Split the comments into a list by the delimiter '\n----\n'
+    comment_list = raw_comment.split(COMMENT_SEPARATOR)
+    return [parse_comment_item(item) for item in comment_list]
+
+
+def parse_comment_item(item):
+    """
+    Split one comment of a thread into (comment, commenter), with "Unknown" as the commenter
+    when the comment has no valid structure.
+    """
+    # Further split into comment and commenter using '\n\t-' as the delimiter
+    parts = item.split(COMMENTER_SEPARATOR)
+    if len(parts) == 2:
+        comment, commenter = parts
+        return comment.strip(), commenter.strip()
+    return parts[0].strip(), "Unknown"
+
+
+def iter_comments(raw_comment):
+    """
+    Yield the (comment, commenter) tuples of parse_comments one at a time, oldest first.
+
+    The raw string is scanned for separators from the start, the way str.split cuts it, so
+    callers that only look at each comment once (e.g. registering the commenters of a run)
+    never hold the parsed thread as a whole.
+    """
+    if not raw_comment:
+        return
+    start = 0
+    end = raw_comment.find(COMMENT_SEPARATOR)
+    while end >= 0:
+        yield parse_comment_item(raw_comment[start:end])
+        start = end + len(COMMENT_SEPARATOR)
+        end = raw_comment.find(COMMENT_SEPARATOR, start)
+    yield parse_comment_item(raw_comment[start:])
+
+
+def iter_comments_newest_first(raw_comment):
+    """
+    Yield the (comment, commenter) tuples of a raw comment string, most recent first.
+
+    Gives the same tuples as reversed(parse_comments(raw_comment)), but comments are cut off the
+    end of the string one at a time, so a caller stopping at the first valid commenter of a long
+    thread neither parses nor holds the older comments.
+    """
+    if not raw_comment:
+        return
+    if OVERLAPPING_SEPARATORS in raw_comment:
+        # Separators sharing a newline split differently from each end, keep the split of parse_comments
+        yield from reversed(parse_comments(raw_comment))
+        return
+    end = len(raw_comment)
+    start = raw_comment.rfind(COMMENT_SEPARATOR, 0, end)
+    while start >= 0:
+        yield parse_comment_item(raw_comment[start + len(COMMENT_SEPARATOR):end])
+        end = start
+        start = raw_comment.rfind(COMMENT_SEPARATOR, 0, end)
+    yield parse_comment_item(raw_comment[:end])
+
+
+def canonicalize_time_range(time):
+    """
+    Canonical form of a time range used as the cache key, e.g. "11:00 am - 2:30 PM" -> "11:00AM-2:30PM".
+    """
+    return time.replace(" ", "").upper()
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def is_canonical_time_format(cleaned_time_cell):
+    return bool(TIME_RANGE_PATTERN.match(cleaned_time_cell))
+
+
+def is_valid_time_format(time_cell):
+    """
+    Validates if a time_cell string is in the format '11:00AM - 2:30PM'.
+
+    Parameters:
+        time_cell (str): The string to validate.
+
+    Returns:
+        bool: True if the format is valid, False otherwise.
+    """
+    # Remove all spaces from the string; AM/PM must be upper case to be valid
+    return is_canonical_time_format(time_cell.replace(" ", ""))
+
+
+def parse_time(time):
+    """
+    Convert a time such as "8:30AM" into minutes after midnight.
+    Accepts the same values as datetime.strptime(time, "%I:%M%p").
+    """
+    match = TIME_PATTERN.fullmatch(time)
+    if not match:
+        raise ValueError(f"time data '{time}' does not match format '%I:%M%p'")
+    hour, minute, period = int(match.group(1)), int(match.group(2)), match.group(3).upper()
+    if not 1 <= hour <= 12 or minute > 59:
+        raise ValueError(f"time data '{time}' does not match format '%I:%M%p'")
+    if hour == 12:
+        hour = 0
+    if period == "PM":
+        hour += 12
+    return hour * 60 + minute
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def parse_canonical_time_range(time):
+    start_str, end_str = time.split('-')
+    return parse_time(start_str), parse_time(end_str)
+
+
+def parse_time_range(time):
+    """
+    Parse a shift time range into start and end minutes after midnight.
+    Results are cached by the canonical form of the range.
+
+    Parameters:
+        time (str): Time range of the shift (e.g., "8:30AM - 12:00PM").
+
+    Returns:
+        tuple: (start, end) in minutes. end is smaller than start for shifts crossing midnight.
+    """
+    return parse_canonical_time_range(canonicalize_time_range(time))
+
+
+def get_cache_info():
+    """
+    Hit and miss counters of the time parsing caches.
+
+    Returns:
+        dict: {"time_ranges": {...}, "time_formats": {...}} with hits, misses, size and maxsize.
+    """
+    return {
+        "time_ranges": parse_canonical_time_range.cache_info()._asdict(),
+        "time_formats": is_canonical_time_format.cache_info()._asdict(),
+    }
+
+
+def clear_caches():
+    parse_canonical_time_range.cache_clear()
+    is_canonical_time_format.cache_clear()
@@ -0,0 +1,54 @@
+import csv
+import json
+import os
+
+
+ASSIGNMENT_COLUMNS = ["name", "location", "date", "time", "hours"]
+
+
+def make_parent_directory(output_file):
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def get_assignment_columns(shift_assignments):
+    """
+    Flatten the resolver's employees into one array per column, one entry per assigned shift.
+
+    Parameters:
+        shift_assignments (dict): Employee objects keyed by name.
+
+    Returns:
+        dict: Lists keyed by the names in ASSIGNMENT_COLUMNS, all of the same length.
+    """
+    columns = {column: [] for column in ASSIGNMENT_COLUMNS}
+    for name, employee_obj in shift_assignments.items():
+        for shift in employee_obj.shifts:
+            columns["name"].append(name)
+            columns["location"].append(shift.location)
+            columns["date"].append(shift.date)
+            columns["time"].append(shift.time)
+            columns["hours"].append(round(shift.hours, 2))
+    return columns
+
+
+def save_assignments_json(shift_assignments, output_file):
+    """
+    Save the summary of every employee (see Employee.get_summary) as a JSON list.
+    """
+    make_parent_directory(output_file)
+    with open(output_file, 'w') as file:
+        json.dump([employee_obj.get_summary() for employee_obj in shift_assignments.values()], file, indent=4)
+
+
+def save_assignments_csv(shift_assignments, output_file):
+    """
+    Save the assigned shifts as a CSV table with the columns of ASSIGNMENT_COLUMNS.
+    """
+    columns = get_assignment_columns(shift_assignments)
+    make_parent_directory(output_file)
+    with open(output_file, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(ASSIGNMENT_COLUMNS)
+        writer.writerows(zip(*(columns[column] for column in ASSIGNMENT_COLUMNS)))
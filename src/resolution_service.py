@@ -0,0 +1,342 @@
+"""
+Long-lived resolution service keeping the resolver state in memory.
+
+Clients connect over a local TCP socket and send one JSON object per line; every message
+gets one JSON line back. Updates re-resolve only the slots they affect (see
+assignment_engine.resolve_changed_slots) and queries are answered from memory. Updates run one
+at a time in a worker thread and only replace the state once resolving succeeds, so queries are
+answered meanwhile from the previous state and a rejected update leaves no trace.
+
+Updates:
+    {"type": "set_slot", "slot": {"sheet", "header", "row", "first_name_column", "last_name_column", "time",
+                                  "first_name", "last_name", "comment"}}  (last_name_column defaults to the next column)
+    {"type": "remove_slot", "key": "Dish!C4"}
+    {"type": "set_comment", "key": "Dish!C4", "comment": "<whole comment thread>"}
+    {"type": "add_comment", "key": "Dish!C4", "comment": "Disha", "commenter": "Disha Prasanna Kumar"}
+Queries:
+    {"type": "who_has", "key": "Dish!C4"}
+    {"type": "is_available", "name": "Disha Prasanna Kumar", "date": "2024-12-11", "time": "7:00AM - 10:30AM",
+     "sheet": "Line"}  (sheet is optional, rules limited to some sheets are skipped without it)
+    {"type": "shifts", "name": "Disha Prasanna Kumar"}
+
+With --watch, the workbook is polled and its edits are turned into set_slot and remove_slot
+updates, which stands in for live schedule updates when testing offline.
+
+Usage (from the repository root):
+    python -m src.resolution_service workbook.xlsx [--port 8765] [--watch] [--interval 1.0]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from collections import namedtuple
+from time import perf_counter
+from src import assignment_engine
+from src.data_extractor import ShiftSlot, iter_shift_slots
+from src.employee_registry import create_employee_registry, use_employee_registry
+from src.parsing import COMMENT_SEPARATOR, COMMENTER_SEPARATOR, is_valid_time_format
+from src.snapshot import get_slot_fingerprint, get_slot_key
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+UPDATE_TYPES = ("set_slot", "remove_slot", "set_comment", "add_comment")
+
+
+def get_message_slot(fields):
+    """
+    Build a ShiftSlot from the "slot" of a set_slot message, checking the types of its fields.
+
+    Raises:
+        ValueError: If a field has the wrong type, or there is a first name without a last name.
+    """
+    if not isinstance(fields, dict):
+        raise ValueError("Field 'slot' must be a JSON object")
+    fields = dict(fields)
+    if isinstance(fields.get("first_name_column"), int):
+        fields.setdefault("last_name_column", fields["first_name_column"] + 1)
+    slot = ShiftSlot(**fields)
+    for field in ("sheet", "header", "time"):
+        if not isinstance(getattr(slot, field), str):
+            raise ValueError(f"Slot field '{field}' must be a string")
+    for field in ("row", "first_name_column", "last_name_column"):
+        if not isinstance(getattr(slot, field), int) or isinstance(getattr(slot, field), bool):
+            raise ValueError(f"Slot field '{field}' must be an integer")
+    for field in ("first_name", "last_name", "comment"):
+        if getattr(slot, field) is not None and not isinstance(getattr(slot, field), str):
+            raise ValueError(f"Slot field '{field}' must be a string or null")
+    if slot.first_name and not slot.last_name:
+        raise ValueError("Slot has a first name but no last name")
+    return slot
+
+
+class ResolverState(namedtuple("ResolverState", ["slots", "assignees", "fingerprints", "shift_assignments"])):
+    """
+    What a service answers queries from: its slots, the assigned name and the fingerprint per slot
+    key, and the Employee objects. An update replaces the whole state in one assignment.
+    """
+    __slots__ = ()
+
+
+def get_message_text(message, field, nullable=False):
+    text = message[field]
+    if not isinstance(text, str) and not (nullable and text is None):
+        raise ValueError(f"Field '{field}' must be a string{' or null' if nullable else ''}")
+    return text
+
+
+class ResolutionService:
+    def __init__(self, sheets_to_analyze, slots=()):
+        """
+        Resolver state of one schedule: its slots, the assigned name per slot and the employees.
+
+        Parameters:
+            sheets_to_analyze (list): Sheet names in the order they are resolved.
+            slots (iterable): Initial ShiftSlot records, resolved right away.
+        """
+        self.sheets_to_analyze = list(sheets_to_analyze)
+        self.state = ResolverState({}, {}, {}, {})
+        self.registry = None  # Names people from the initial slots on, see src/employee_registry.py
+        self.update_lock = asyncio.Lock()  # Updates run one at a time, off the event loop
+        self.set_slots(slots)
+
+    @property
+    def slots(self):
+        return self.state.slots  # Slot key -> ShiftSlot
+
+    @property
+    def assignees(self):
+        return self.state.assignees  # Slot key -> assigned name or ""
+
+    @property
+    def fingerprints(self):
+        return self.state.fingerprints  # Slot key -> fingerprint of the slot when it was last resolved
+
+    @property
+    def shift_assignments(self):
+        return self.state.shift_assignments
+
+    @classmethod
+    def from_workbook(cls, file_path, sheets_to_analyze, cache_dir=None):
+        return cls(sheets_to_analyze, iter_shift_slots(file_path, sheets_to_analyze, cache_dir=cache_dir))
+
+    def get_ordered_slots(self, slots):
+        sheet_order = {sheet: index for index, sheet in enumerate(self.sheets_to_analyze)}
+        return sorted(slots.values(), key=lambda slot: (sheet_order[slot.sheet], slot.row, slot.first_name_column))
+
+    def resolve(self, slots):
+        """
+        Re-resolve the slots affected by the differences between slots and the current state,
+        then make slots the current state. The state is left as it was if resolving fails.
+
+        Parameters:
+            slots (dict): ShiftSlot records keyed by slot key.
+
+        Returns:
+            int: Number of slots re-resolved.
+        """
+        ordered_slots = self.get_ordered_slots(slots)
+        state = self.state
+        snapshot = {"slots": {slot_key: [fingerprint, state.assignees.get(slot_key, "")]
+                              for slot_key, fingerprint in state.fingerprints.items()}}
+        if self.registry is None:
+            self.registry = create_employee_registry(ordered_slots)
+        with use_employee_registry(self.registry):
+            assignees, shift_assignments, resolved = assignment_engine.resolve_changed_slots(ordered_slots, snapshot)
+        # One assignment, so queries answered meanwhile see either the old or the new state
+        self.state = ResolverState(
+            slots,
+            {get_slot_key(slot): assign_shift_to for slot, assign_shift_to in zip(ordered_slots, assignees)},
+            {get_slot_key(slot): get_slot_fingerprint(slot) for slot in ordered_slots},
+            shift_assignments)
+        return len(resolved)
+
+    def set_slots(self, slots, removed_keys=()):
+        """
+        Add or replace slots, remove the slots of removed_keys, then re-resolve.
+        Slots of other sheets or without a valid time are not shift rows and are removed.
+
+        Returns:
+            int: Number of slots re-resolved.
+        """
+        new_slots = dict(self.slots)
+        for slot_key in removed_keys:
+            new_slots.pop(slot_key, None)
+        for slot in slots:
+            slot_key = get_slot_key(slot)
+            if slot.sheet in self.sheets_to_analyze and isinstance(slot.time, str) and is_valid_time_format(slot.time):
+                new_slots[slot_key] = slot
+            else:
+                new_slots.pop(slot_key, None)
+        return self.resolve(new_slots)
+
+    def get_slot(self, slot_key, state=None):
+        slot = (state or self.state).slots.get(slot_key)
+        if slot is None:
+            raise ValueError(f"Unknown slot '{slot_key}'")
+        return slot
+
+    def find_employee(self, name, state=None):
+        """
+        Employee object of a name, None if they have no shift. Looks the name up without
+        registering it, so queries never change the names of later updates.
+        """
+        person = self.registry.find_name(name)
+        return None if person is None else (state or self.state).shift_assignments.get(person)
+
+    def is_available(self, name, date_or_day, time, sheet=None, state=None):
+        """
+        Check if an employee could take one more shift, with the same rules as the resolver.
+
+        Returns:
+            str: None if the employee is available, otherwise the name of the rule rejecting them.
+
+        Raises:
+            ValueError: If time is not a time range such as "7:00AM - 10:30AM".
+        """
+        if not is_valid_time_format(time):
+            raise ValueError(f"Invalid time '{time}', expected a range such as '7:00AM - 10:30AM'")
+        slot = ShiftSlot(sheet, date_or_day, 0, 0, 0, time, None, None, None)
+        return assignment_engine.get_rejection(self.find_employee(name, state), slot)
+
+    def handle(self, message):
+        """
+        Apply an update or answer a query.
+
+        Parameters:
+            message (dict): One of the messages listed in the module docstring.
+
+        Returns:
+            dict: The response, with "ok" False and an "error" when the message cannot be handled.
+        """
+        start = perf_counter()
+        try:
+            message_type = message.get("type")
+            if message_type == "set_slot":
+                response = {"resolved": self.set_slots([get_message_slot(message["slot"])])}
+            elif message_type == "remove_slot":
+                self.get_slot(message["key"])
+                response = {"resolved": self.set_slots([], [message["key"]])}
+            elif message_type == "set_comment":
+                slot = self.get_slot(message["key"])
+                response = {"resolved": self.set_slots([slot._replace(comment=get_message_text(message, "comment", nullable=True) or None)])}
+            elif message_type == "add_comment":
+                slot = self.get_slot(message["key"])
+                comment = f"{get_message_text(message, 'comment')}{COMMENTER_SEPARATOR}{get_message_text(message, 'commenter')}"
+                if slot.comment:
+                    comment = slot.comment + COMMENT_SEPARATOR + comment
+                response = {"resolved": self.set_slots([slot._replace(comment=comment)])}
+            elif message_type == "who_has":
+                state = self.state  # Queries read one state, even if an update swaps it meanwhile
+                self.get_slot(message["key"], state)
+                response = {"assignee": state.assignees.get(message["key"]) or None}
+            elif message_type == "is_available":
+                sheet = get_message_text(message, "sheet", nullable=True) if "sheet" in message else None
+                reason = self.is_available(get_message_text(message, "name"), get_message_text(message, "date"),
+                                           get_message_text(message, "time"), sheet)
+                response = {"available": reason is None, "reason": reason}
+            elif message_type == "shifts":
+                employee_obj = self.find_employee(get_message_text(message, "name"))
+                response = {"shifts": [shift.to_dict() for shift in employee_obj.shifts] if employee_obj else []}
+            else:
+                raise ValueError(f"Unknown message type '{message_type}'")
+        except KeyError as e:
+            return {"ok": False, "error": f"Missing field {e}"}
+        except (TypeError, ValueError) as e:
+            return {"ok": False, "error": str(e)}
+        response["ok"] = True
+        response["elapsed_ms"] = round((perf_counter() - start) * 1000, 3)
+        return response
+
+    async def handle_async(self, message):
+        """
+        Answer a query right away, or apply an update in a worker thread once the updates sent
+        before it are applied, so the event loop keeps answering queries meanwhile.
+        """
+        if not isinstance(message, dict):
+            return {"ok": False, "error": "A message must be a JSON object"}
+        if message.get("type") not in UPDATE_TYPES:
+            return self.handle(message)
+        async with self.update_lock:
+            return await asyncio.to_thread(self.handle, message)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Invalid JSON: {e}"}
+                else:
+                    response = await self.handle_async(message)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logging.info(f"Resolution service listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def get_workbook_updates(self, slots):
+        """
+        Compare the slots read from the workbook with the service state.
+
+        Returns:
+            tuple: (new or changed ShiftSlot records, keys of the slots no longer in the workbook).
+        """
+        slots = [slot for slot in slots if isinstance(slot.time, str) and is_valid_time_format(slot.time)]
+        changed_slots = [slot for slot in slots if self.fingerprints.get(get_slot_key(slot)) != get_slot_fingerprint(slot)]
+        removed_keys = self.slots.keys() - {get_slot_key(slot) for slot in slots}
+        return changed_slots, removed_keys
+
+    async def watch_workbook(self, file_path, interval=1.0, cache_dir=None):
+        """
+        Poll the workbook and apply its edits as updates, a stand-in for live change events.
+        A workbook that cannot be read, e.g. while it is being saved, is read again at the next poll.
+        """
+        last_modified = os.stat(file_path).st_mtime_ns
+        while True:
+            await asyncio.sleep(interval)
+            modified = os.stat(file_path).st_mtime_ns
+            if modified == last_modified:
+                continue
+            try:
+                slots = await asyncio.to_thread(lambda: list(iter_shift_slots(file_path, self.sheets_to_analyze, cache_dir=cache_dir)))
+            except Exception as e:
+                logging.warning(f"Could not read {file_path}, retrying at the next poll: {e}")
+                continue
+            last_modified = modified
+            async with self.update_lock:
+                # Compared under the lock, so updates applied meanwhile are not undone
+                changed_slots, removed_keys = self.get_workbook_updates(slots)
+                if not (changed_slots or removed_keys):
+                    continue
+                resolved = await asyncio.to_thread(self.set_slots, changed_slots, removed_keys)
+            logging.info(f"{file_path} changed: {len(changed_slots)} slots updated, {len(removed_keys)} removed, "
+                         f"{resolved} re-resolved")
+
+
+async def run_service(file_path, sheets_to_analyze, host=DEFAULT_HOST, port=DEFAULT_PORT, watch=False, interval=1.0,
+                      cache_dir=None):
+    service = await asyncio.to_thread(ResolutionService.from_workbook, file_path, sheets_to_analyze, cache_dir)
+    tasks = [service.serve(host, port)]
+    if watch:
+        tasks.append(service.watch_workbook(file_path, interval, cache_dir))
+    await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve shift assignments of a workbook and re-resolve them on updates.")
+    parser.add_argument("file_path")
+    parser.add_argument("--sheets", default=",".join(assignment_engine.default_sheets_to_analyze))
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--watch", action="store_true", help="Poll the workbook and apply its edits")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls of the workbook")
+    args = parser.parse_args()
+    assignment_engine.configure_logging()
+    asyncio.run(run_service(args.file_path, args.sheets.split(","), args.host, args.port, args.watch, args.interval))
@@ -0,0 +1,290 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from time import perf_counter
+from src.employee import get_duration
+from src.config_loader import DEFAULT_CONFIG_PATH, load_config
+from src.instrumentation import stats
+from src.parsing import parse_time_range
+
+
+# Rules of a config without a "rules" list: the checks the resolver has always made.
+DEFAULT_RULES = [
+    {"type": "weekly_cap"},
+    {"type": "hours_cap"},
+    {"type": "conflict"},
+    {"type": "prerequisite", "name": "no_dish_or_pot_shift", "except_sheets": ["Dish", "Pot Room"]},
+]
+# Rule types an AvailabilityMatrix checks in one batch, see RuleSet.get_rejection.
+BATCHED_TYPES = ("weekly_cap", "hours_cap", "conflict")
+NOT_CHECKED = object()
+# Set while a policy variant is simulated, replacing the rules of the config file.
+active_rule_set = None
+
+
+def get_slot_interval(slot):
+    """
+    Start and end of a slot in minutes, with the end after the start for shifts crossing midnight.
+    """
+    start, end = parse_time_range(slot.time)
+    return start, end if end > start else end + 24 * 60
+
+
+class Rule(ABC):
+    type = None
+    cost = 0  # Rough cost of a check, cheaper rules run first
+    checks_new_employees = False  # Whether the rule can reject someone without any shift yet
+
+    def __init__(self, name=None, sheets=None, except_sheets=None):
+        """
+        A check a commenter must pass to take a slot.
+
+        Parameters:
+            name (str): Name of the rule in rejection reasons and counters, defaults to its type.
+            sheets (list): Sheets the rule applies to, None for every sheet.
+            except_sheets (list): Sheets the rule does not apply to.
+        """
+        self.name = name or self.type
+        self.sheets = set(sheets) if sheets is not None else None
+        self.except_sheets = set(except_sheets or ())
+        self.timer_name = f"rule_{self.name}"
+
+    def applies_to(self, sheet):
+        """
+        Check if the rule applies to a sheet. Rules limited to some sheets do not apply to
+        a slot without a sheet (e.g. an availability query).
+        """
+        if sheet is None:
+            return self.sheets is None and not self.except_sheets
+        return (self.sheets is None or sheet in self.sheets) and sheet not in self.except_sheets
+
+    def to_dict(self):
+        options = {key: sorted(value) if isinstance(value, set) else value
+                   for key, value in vars(self).items() if key != "timer_name"}
+        return {"type": self.type, **options}
+
+    @abstractmethod
+    def rejects(self, employee_obj, slot):
+        """
+        Returns:
+            bool: True if the employee cannot take the slot. employee_obj is None for someone without shifts.
+        """
+
+
+class WeeklyCapRule(Rule):
+    type = "weekly_cap"
+    cost = 2
+
+    def rejects(self, employee_obj, slot):
+        calendar_policy = employee_obj.calendar_policy
+        bucket = calendar_policy.get_bucket(slot.header)
+        max_shifts, _ = calendar_policy.get_limits(bucket)
+        return max_shifts is not None and employee_obj.bucket_shift_counts.get(bucket, 0) >= max_shifts
+
+
+class HoursCapRule(Rule):
+    type = "hours_cap"
+    cost = 3
+
+    def rejects(self, employee_obj, slot):
+        calendar_policy = employee_obj.calendar_policy
+        bucket = calendar_policy.get_bucket(slot.header)
+        _, max_hours = calendar_policy.get_limits(bucket)
+        return (max_hours is not None
+                and employee_obj.bucket_hours.get(bucket, 0.0) + get_duration(*parse_time_range(slot.time)) > max_hours)
+
+
+class ConflictRule(Rule):
+    type = "conflict"
+    cost = 4
+
+    def rejects(self, employee_obj, slot):
+        return employee_obj.has_conflict(slot.header, slot.time)
+
+
+class PrerequisiteRule(Rule):
+    type = "prerequisite"
+    cost = 1
+    checks_new_employees = True
+
+    def __init__(self, locations=None, **options):
+        """
+        Only people who already have a shift, at one of locations if given, can take the slot.
+        """
+        super().__init__(**options)
+        self.locations = list(locations) if locations is not None else None
+
+    def rejects(self, employee_obj, slot):
+        if employee_obj is None:
+            return True
+        if self.locations is None:
+            return employee_obj.total_shift_count == 0
+        return not any(employee_obj.location_shift_counts.get(location) for location in self.locations)
+
+
+class SheetCapRule(Rule):
+    type = "sheet_cap"
+    cost = 2
+
+    def __init__(self, max_shifts, **options):
+        """
+        At most max_shifts shifts per period or ISO week at each of the rule's sheets.
+        """
+        super().__init__(**options)
+        self.max_shifts = max_shifts
+
+    def rejects(self, employee_obj, slot):
+        bucket = employee_obj.calendar_policy.get_bucket(slot.header)
+        return employee_obj.location_bucket_shift_counts.get((slot.sheet, bucket), 0) >= self.max_shifts
+
+
+class DailyHoursRule(Rule):
+    type = "daily_hours"
+    cost = 3
+
+    def __init__(self, max_hours, **options):
+        """
+        At most max_hours hours of shifts on one date.
+        """
+        super().__init__(**options)
+        self.max_hours = max_hours
+
+    def rejects(self, employee_obj, slot):
+        day_intervals = employee_obj.shifts_by_date.get(slot.header)
+        if day_intervals is None:
+            return False
+        hours = get_duration(*parse_time_range(slot.time))
+        hours += sum(get_duration(start, end) for start, end in zip(day_intervals.starts, day_intervals.ends))
+        return hours > self.max_hours
+
+
+class MinRestRule(Rule):
+    type = "min_rest"
+    cost = 5
+
+    def __init__(self, minutes, **options):
+        """
+        At least minutes of rest between two shifts on the same date.
+        """
+        super().__init__(**options)
+        self.minutes = minutes
+
+    def get_gaps(self, employee_obj, slot):
+        """
+        Minutes between the slot and each shift of the employee on its date, negative for overlaps.
+        """
+        day_intervals = employee_obj.shifts_by_date.get(slot.header)
+        if day_intervals is None:
+            return
+        start, end = get_slot_interval(slot)
+        for other_start, other_end in zip(day_intervals.starts, day_intervals.ends):
+            if other_end <= other_start:
+                other_end += 24 * 60
+            yield max(other_start - end, start - other_end)
+
+    def rejects(self, employee_obj, slot):
+        return any(0 <= gap < self.minutes for gap in self.get_gaps(employee_obj, slot))
+
+
+class NoBackToBackRule(MinRestRule):
+    type = "no_back_to_back"
+
+    def __init__(self, **options):
+        """
+        No shift ending when the slot starts or starting when it ends.
+        """
+        super().__init__(minutes=1, **options)
+
+
+rule_types = {rule_class.type: rule_class for rule_class in (
+    WeeklyCapRule, HoursCapRule, ConflictRule, PrerequisiteRule, SheetCapRule, DailyHoursRule, MinRestRule, NoBackToBackRule)}
+
+
+class RuleSet:
+    def __init__(self, rules):
+        """
+        Rules compiled into one ordered chain per sheet.
+
+        The chain runs the cheapest rules first (rules of the same cost keep their config order)
+        and stops at the first rejection. Each check adds to the rule's timer in the run stats.
+
+        Parameters:
+            rules (list): Rule objects.
+        """
+        self.rules = sorted(rules, key=lambda rule: rule.cost)
+        self.chains = {}  # Sheet -> rules applying to it, in order
+
+    def get_chain(self, sheet):
+        chain = self.chains.get(sheet)
+        if chain is None:
+            chain = self.chains[sheet] = tuple(rule for rule in self.rules if rule.applies_to(sheet))
+        return chain
+
+    def applies(self, rule_type, sheet):
+        return any(rule.type == rule_type for rule in self.get_chain(sheet))
+
+    def get_rejection(self, employee_obj, slot, batch_rejection=NOT_CHECKED):
+        """
+        Name of the first rule rejecting the employee for the slot, None if every rule passes.
+
+        Parameters:
+            employee_obj (Employee): The candidate, None for someone without any shift yet.
+            slot (ShiftSlot): The slot to take.
+            batch_rejection (str): Result of an AvailabilityMatrix batch for this employee, which stands
+                                   in for the rules of BATCHED_TYPES where they come in the chain,
+                                   so the first rejecting rule is the same as without a batch.
+        """
+        chain = self.get_chain(slot.sheet)
+        use_batch = batch_rejection is not NOT_CHECKED
+        if batch_rejection and not any(rule.type == batch_rejection for rule in chain):
+            use_batch = False  # The batch stopped at a rule this sheet does not have
+        for rule in chain:
+            if employee_obj is None and not rule.checks_new_employees:
+                continue
+            if use_batch and rule.type in BATCHED_TYPES:
+                if rule.type == batch_rejection:
+                    return rule.name
+                continue
+            start = perf_counter()
+            rejected = rule.rejects(employee_obj, slot)
+            stats.add_time(rule.timer_name, perf_counter() - start)
+            if rejected:
+                return rule.name
+        return None
+
+    def to_dict(self):
+        return {"rules": [rule.to_dict() for rule in self.rules]}
+
+
+def compile_rule(rule_config):
+    options = dict(rule_config)
+    rule_type = options.pop("type", None)
+    rule_class = rule_types.get(rule_type)
+    if rule_class is None:
+        raise ValueError(f"Unknown rule type '{rule_type}', expected one of {', '.join(rule_types)}")
+    try:
+        return rule_class(**options)
+    except TypeError as e:
+        raise ValueError(f"Invalid options for the {rule_type} rule: {e}")
+
+
+def load_rule_set(config):
+    """
+    Build a RuleSet from the rules of a config dict, DEFAULT_RULES if it has none.
+    """
+    rules = config.get("rules")
+    return RuleSet([compile_rule(rule_config) for rule_config in (DEFAULT_RULES if rules is None else rules)])
+
+
+@lru_cache(maxsize=None)
+def load_rule_set_file(config_path=DEFAULT_CONFIG_PATH):
+    return load_rule_set(load_config(config_path))
+
+
+def get_rule_set(config_path=DEFAULT_CONFIG_PATH):
+    """
+    The rule set of a config file, compiled once per path, or the one of the variant being
+    simulated (see src/simulation.py).
+    """
+    if active_rule_set is not None:
+        return active_rule_set
+    return load_rule_set_file(config_path)
@@ -0,0 +1,116 @@
+from collections import Counter, namedtuple
+from datetime import date, datetime
+import re
+from src.instrumentation import stats
+from src.parsing import is_valid_time_format
+
+
+# A table header is a date, or a string naming a day or a year (e.g. "Monday", "Dec 11 2025").
+HEADER_PATTERN = re.compile(r"day|\b(?:19|20)\d{2}\b", re.IGNORECASE)
+TIME_LABEL = "time"
+FIRST_NAME_LABEL = "first"
+LAST_NAME_LABEL = "last"
+
+# Label row signature -> SheetLayout, shared by every table, sheet and workbook with the same labels.
+_layout_cache = {}
+
+
+class SheetLayout(namedtuple("SheetLayout", ["time_column", "first_name_column", "last_name_column"])):
+    """
+    The 1-based columns of a shift table: time, first name and last name. Table headers are
+    looked for in these columns and the ones between them.
+    """
+    __slots__ = ()
+
+    @property
+    def first_column(self):
+        return min(self)
+
+    @property
+    def last_column(self):
+        return max(self)
+
+
+def get_header_value(values):
+    """
+    Return the table header among the cell values of a row, None if the row is not a header.
+
+    Returns:
+        str: The first string naming a day or a year, stripped, or the first date as "YYYY-MM-DD".
+    """
+    for value in values:
+        if isinstance(value, str):
+            if HEADER_PATTERN.search(value):
+                return value.strip()
+        elif isinstance(value, (date, datetime)):
+            return value.strftime("%Y-%m-%d")
+    return None
+
+
+def get_label_layout(values):
+    """
+    Detect the layout of a "Time / First Name / Last Name" label row.
+
+    Parameters:
+        values (dict): Cell values of the row keyed by column.
+
+    Returns:
+        SheetLayout: The columns of the labels, None if the row is not a label row. The last
+                     name column defaults to the one after the first name.
+    """
+    signature = tuple((column, value.strip().casefold()) for column, value in sorted(values.items()) if isinstance(value, str))
+    if not any(label == TIME_LABEL for _, label in signature):
+        return None
+    layout = _layout_cache.get(signature)
+    if layout is not None:
+        stats.count("layout_cache_hits")
+        return layout
+    time_column = first_name_column = last_name_column = None
+    for column, label in signature:
+        if label == TIME_LABEL and time_column is None:
+            time_column = column
+        elif label.startswith(FIRST_NAME_LABEL) and first_name_column is None:
+            first_name_column = column
+        elif label.startswith(LAST_NAME_LABEL) and last_name_column is None:
+            last_name_column = column
+    if first_name_column is None:
+        return None
+    stats.count("layout_detections")
+    layout = _layout_cache[signature] = SheetLayout(time_column, first_name_column, last_name_column or first_name_column + 1)
+    return layout
+
+
+def infer_layout(rows):
+    """
+    Layout of a sheet without label rows: the column holding the most time ranges, followed
+    by the first and last name columns.
+
+    Parameters:
+        rows (iterable): Cell values of each row, as dicts keyed by column.
+
+    Returns:
+        SheetLayout: The inferred columns, None if the rows hold no time range.
+    """
+    time_columns = Counter(column for values in rows for column, value in values.items()
+                           if isinstance(value, str) and is_valid_time_format(value))
+    if not time_columns:
+        return None
+    time_column = time_columns.most_common(1)[0][0]
+    return SheetLayout(time_column, time_column + 1, time_column + 2)
+
+
+def find_sheet_layout(rows):
+    """
+    Layout of a sheet from its first label row, or inferred from its time ranges.
+
+    Parameters:
+        rows (iterable): Tuples of cell values, e.g. worksheet.iter_rows(values_only=True).
+    """
+    profiled_rows = []
+    for row in rows:
+        values = {column: value for column, value in enumerate(row, start=1) if value is not None}
+        layout = get_label_layout(values)
+        if layout:
+            return layout
+        profiled_rows.append(values)
+    return infer_layout(profiled_rows)
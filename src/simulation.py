@@ -0,0 +1,171 @@
+"""
+Dry runs of the resolver: compare policy variants on one workbook without writing to it.
+
+The workbook is parsed once, then the current policy (the baseline) and every variant are
+resolved on the same slots, each on fresh Employee state, in parallel with processes greater
+than 1. Worker processes get the parsed slots when they start, so each variant only sends
+its settings. A variant is a dict of the settings it changes:
+
+    name: a label for the report
+    max_shifts_per_week, max_hours_per_week, periods, rules: as in config/config.yaml
+    solver: "greedy" or "optimal"
+    backend: "scalar" or "numpy"
+    resolve_comments_after_assigned, resolve_comments_after_unassigned: as in assignment_engine
+
+Usage (from the repository root):
+    python -m src.main simulate workbook.xlsx variants.yaml [--processes 4] [--output diff.json]
+"""
+from contextlib import contextmanager
+from time import perf_counter
+import logging
+from src import assignment_engine, calendar_policy, rules
+from src.config_loader import load_config
+from src.data_extractor import iter_shift_slots
+from src.employee_registry import employee_registry_for
+from src.parsing import is_valid_time_format
+from src.snapshot import get_slot_key
+
+
+POLICY_SETTINGS = ("max_shifts_per_week", "max_hours_per_week", "periods", "rules")
+RUN_SETTINGS = ("solver", "backend", "resolve_comments_after_assigned", "resolve_comments_after_unassigned")
+
+# Slots shared by the variants, set in each worker process when it starts.
+simulation_slots = None
+
+
+def set_simulation_slots(slots):
+    global simulation_slots
+    simulation_slots = slots
+
+
+@contextmanager
+def variant_policy(variant):
+    """
+    Resolve with the settings of a variant instead of the ones of config/config.yaml.
+    """
+    unknown_settings = set(variant) - set(POLICY_SETTINGS) - set(RUN_SETTINGS) - {"name"}
+    if unknown_settings:
+        raise ValueError(f"Unknown variant settings: {', '.join(sorted(unknown_settings))}")
+    previous = (calendar_policy.active_calendar_policy, rules.active_rule_set,
+                assignment_engine.resolve_comments_after_assigned, assignment_engine.resolve_comments_after_unassigned)
+    if any(setting in variant for setting in POLICY_SETTINGS):
+        config = dict(load_config())
+        config.update({setting: variant[setting] for setting in POLICY_SETTINGS if setting in variant})
+        calendar_policy.active_calendar_policy = calendar_policy.load_calendar_policy(config)
+        rules.active_rule_set = rules.load_rule_set(config)
+    assignment_engine.resolve_comments_after_assigned = variant.get("resolve_comments_after_assigned", previous[2])
+    assignment_engine.resolve_comments_after_unassigned = variant.get("resolve_comments_after_unassigned", previous[3])
+    try:
+        yield
+    finally:
+        (calendar_policy.active_calendar_policy, rules.active_rule_set,
+         assignment_engine.resolve_comments_after_assigned, assignment_engine.resolve_comments_after_unassigned) = previous
+
+
+def run_variant(variant):
+    """
+    Resolve the simulation slots with a variant's settings.
+
+    Returns:
+        tuple: (assigned name or "" per slot, number of slots whose comments would be cleared, seconds).
+    """
+    start = perf_counter()
+    slots = simulation_slots
+    with variant_policy(variant), assignment_engine.quiet_pass(), employee_registry_for(slots):
+        if variant.get("solver", "greedy") == "optimal":
+            assignees, _ = assignment_engine.solve_optimal_assignment(slots)
+        else:
+            assignees, _ = assignment_engine.assign_greedy(slots, backend=variant.get("backend", "scalar"))
+        slot_decisions = assignment_engine.get_slot_decisions(slots, assignees)
+    comments_cleared = sum(1 for _, _, _, clear_comments in slot_decisions.values() if clear_comments)
+    return assignees, comments_cleared, perf_counter() - start
+
+
+def get_assignment_diff(slots, baseline_assignees, assignees):
+    """
+    Compare the assignments of a variant with the baseline.
+
+    Returns:
+        tuple: (slots assigned differently, as dicts with the slot key, date, time and both names,
+                change in number of shifts per person).
+    """
+    changes = []
+    shift_count_changes = {}
+    for slot, baseline_name, name in zip(slots, baseline_assignees, assignees):
+        if baseline_name == name:
+            continue
+        changes.append({"slot": get_slot_key(slot), "date": slot.header, "time": slot.time,
+                        "baseline": baseline_name or None, "variant": name or None})
+        if baseline_name:
+            shift_count_changes[baseline_name] = shift_count_changes.get(baseline_name, 0) - 1
+        if name:
+            shift_count_changes[name] = shift_count_changes.get(name, 0) + 1
+    return changes, {name: change for name, change in sorted(shift_count_changes.items()) if change}
+
+
+def get_variant_summary(variant, assignees, comments_cleared, seconds):
+    return {
+        "name": variant.get("name"),
+        "settings": {setting: value for setting, value in variant.items() if setting != "name"},
+        "assigned": sum(1 for name in assignees if name),
+        "unassigned": sum(1 for name in assignees if not name),
+        "comments_cleared": comments_cleared,
+        "seconds": round(seconds, 6),
+    }
+
+
+def simulate_variants(slots, variants, processes=None):
+    """
+    Resolve slots with the current policy and with each variant, and diff every variant against it.
+
+    Parameters:
+        slots (list): ShiftSlot records with a valid time, in sheet order.
+        variants (list): Variant dicts, see the module docstring.
+        processes (int): Number of worker processes, None or 1 to run the variants in this process.
+
+    Returns:
+        dict: {"baseline": summary, "variants": [summary with "changes" and "shift_count_changes", ...]}
+    """
+    variants = [{"name": "baseline"}] + [dict(variant, name=variant.get("name", f"variant_{index + 1}"))
+                                         for index, variant in enumerate(variants)]
+    for variant in variants:
+        with variant_policy(variant):  # Reject unknown settings before starting any run
+            pass
+    if processes and processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes, initializer=set_simulation_slots, initargs=(slots,)) as executor:
+            results = list(executor.map(run_variant, variants))
+    else:
+        set_simulation_slots(slots)
+        try:
+            results = [run_variant(variant) for variant in variants]
+        finally:
+            set_simulation_slots(None)
+
+    baseline_assignees = results[0][0]
+    report = {"baseline": get_variant_summary(variants[0], *results[0]), "variants": []}
+    for variant, (assignees, comments_cleared, seconds) in zip(variants[1:], results[1:]):
+        summary = get_variant_summary(variant, assignees, comments_cleared, seconds)
+        summary["changes"], summary["shift_count_changes"] = get_assignment_diff(slots, baseline_assignees, assignees)
+        logging.info(f"Variant {summary['name']}: {summary['assigned']} assigned, {len(summary['changes'])} slots changed")
+        report["variants"].append(summary)
+    return report
+
+
+def simulate_workbook(file_path, sheets_to_analyze, variants, processes=None, cache_dir=None):
+    """
+    Parse a workbook once and simulate policy variants on it, leaving the file untouched.
+
+    Parameters:
+        file_path (str): Path to the .xlsx file.
+        sheets_to_analyze (list): List of sheet names to analyze.
+        variants (list): Variant dicts, see the module docstring.
+        processes (int): Number of processes running the variants, None to run them serially.
+        cache_dir (str): Directory of the parsed-workbook cache, None to always parse the workbook.
+
+    Returns:
+        dict: See simulate_variants.
+    """
+    slots = [slot for slot in iter_shift_slots(file_path, sheets_to_analyze, cache_dir=cache_dir)
+             if isinstance(slot.time, str) and is_valid_time_format(slot.time)]
+    return simulate_variants(slots, variants, processes)
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+
+
+def get_slot_key(slot):
+    """
+    Identify a slot by its sheet and first name cell, e.g. "Dish!C4".
+    """
+    return f"{slot.sheet}!{slot.coordinate}"
+
+
+def get_slot_fingerprint(slot):
+    """
+    Hash everything that feeds the resolver's decision for a slot: the table header,
+    the time cell, the name cells and the comment thread.
+    """
+    content = repr((slot.header, slot.time, slot.first_name, slot.last_name, slot.comment))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def load_snapshot(snapshot_path):
+    """
+    Load the snapshot saved by the previous run.
+
+    Returns:
+        dict: The snapshot, or None if there is no snapshot yet or it cannot be read.
+    """
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(snapshot_path, settings, slots, employees):
+    """
+    Save the state of a run so the next run can re-resolve only what changed.
+
+    Parameters:
+        snapshot_path (str): Path to the snapshot JSON file.
+        settings (dict): Resolver settings the decisions depend on.
+        slots (dict): [fingerprint, assigned name] keyed by slot key, describing each slot
+                      as it is in the workbook after the run.
+        employees (dict): Shift dictionaries keyed by employee name.
+    """
+    snapshot = {"settings": settings, "slots": slots, "employees": employees}
+    temporary_path = snapshot_path + ".tmp"
+    with open(temporary_path, 'w') as file:
+        json.dump(snapshot, file)
+    os.replace(temporary_path, snapshot_path)
@@ -0,0 +1,256 @@
+from array import array
+from datetime import date, datetime, time, timedelta
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "shift_resolver")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+MAX_CACHE_AGE_SECONDS = 7 * 24 * 60 * 60
+FORMAT_VERSION = 1
+MAGIC = b"SRWC"
+HEADER = struct.Struct("<4sHHHHIII")  # magic, version, little endian, field count, reserved, records, strings, blob length
+NONE = 0xFFFFFFFF
+INDEX_FILE = "index.json"
+
+
+def encode_value(value):
+    """
+    Encode a cell value as a string with a one letter type prefix, so values of any
+    type can share the string table.
+    """
+    if isinstance(value, bool):
+        return "b1" if value else "b0"
+    if isinstance(value, int):
+        return f"i{value}"
+    if isinstance(value, float):
+        return f"f{value!r}"
+    if isinstance(value, str):
+        return f"s{value}"
+    if isinstance(value, datetime):
+        return f"d{value.isoformat()}"
+    if isinstance(value, date):
+        return f"D{value.isoformat()}"
+    if isinstance(value, time):
+        return f"t{value.isoformat()}"
+    if isinstance(value, timedelta):
+        return f"T{value.total_seconds()!r}"
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+def decode_value(text):
+    kind, text = text[0], text[1:]
+    if kind == "s":
+        return text
+    if kind == "i":
+        return int(text)
+    if kind == "b":
+        return text == "1"
+    if kind == "f":
+        return float(text)
+    if kind == "d":
+        return datetime.fromisoformat(text)
+    if kind == "D":
+        return date.fromisoformat(text)
+    if kind == "t":
+        return time.fromisoformat(text)
+    return timedelta(seconds=float(text))
+
+
+def write_records(file_path, records, field_count):
+    """
+    Write records (tuples of field_count values) in the binary cache format.
+
+    The file holds a header, one uint32 string index per field (NONE for None), the end
+    offset of every string, and the UTF-8 blob of the distinct encoded values. Repeated
+    values such as sheet names, headers and time ranges are stored once.
+    """
+    string_indexes = {}
+    fields = array("I")
+    for record in records:
+        for value in record:
+            if value is None:
+                fields.append(NONE)
+                continue
+            text = encode_value(value)
+            index = string_indexes.get(text)
+            if index is None:
+                index = string_indexes[text] = len(string_indexes)
+            fields.append(index)
+    blob = bytearray()
+    string_ends = array("I")
+    for text in string_indexes:
+        blob += text.encode("utf-8")
+        string_ends.append(len(blob))
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder == "little", field_count, 0,
+                               len(records), len(string_ends), len(blob)))
+        file.write(fields.tobytes())
+        file.write(string_ends.tobytes())
+        file.write(blob)
+    os.replace(temporary_path, file_path)
+
+
+def read_records(file_path):
+    """
+    Read the records of a cache file through a memory map.
+
+    Returns:
+        list: Tuples of decoded values, or None if the file is not a readable cache file.
+    """
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if len(mapped) < HEADER.size:
+            return None
+        magic, version, little_endian, field_count, _, record_count, string_count, blob_length = HEADER.unpack_from(mapped)
+        fields_end = HEADER.size + 4 * field_count * record_count
+        ends_end = fields_end + 4 * string_count
+        if (magic != MAGIC or version != FORMAT_VERSION or bool(little_endian) != (sys.byteorder == "little")
+                or len(mapped) != ends_end + blob_length):
+            return None
+        with memoryview(mapped) as view:
+            with view[HEADER.size:fields_end] as field_bytes, field_bytes.cast("I") as field_view:
+                fields = field_view.tolist()
+            with view[fields_end:ends_end] as end_bytes, end_bytes.cast("I") as end_view:
+                string_ends = end_view.tolist()
+            blob = view[ends_end:].tobytes()
+    values = []
+    start = 0
+    for end in string_ends:
+        values.append(decode_value(blob[start:end].decode("utf-8")))
+        start = end
+    # Point the NONE markers at a trailing None value.
+    none_index = len(values)
+    values.append(None)
+    fields = [none_index if index == NONE else index for index in fields]
+    return [tuple(values[index] for index in fields[position:position + field_count])
+            for position in range(0, len(fields), field_count)]
+
+
+class WorkbookCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIRECTORY, max_bytes=MAX_CACHE_BYTES, max_age=MAX_CACHE_AGE_SECONDS,
+                 extractor_version=0):
+        """
+        On-disk cache of data extracted from workbooks, shared by every process using the same directory.
+
+        Entries are keyed by the SHA-1 of the workbook's content, the kind of extraction, the
+        sheets, the cache format and the extractor version, so a modified or copied workbook,
+        or a changed extractor, never reads stale data. The hash of each path
+        is remembered with its mtime and size, so an unchanged file is not hashed again.
+        Entries unused for max_age seconds are evicted, then the least recently used ones
+        until the cache fits in max_bytes.
+
+        Parameters:
+            cache_dir (str): Directory of the cache files, created on first store.
+            max_bytes (int): Size limit of the cache entries.
+            max_age (float): Age limit in seconds since an entry was last used.
+            extractor_version (int): Version of the code producing the records, to be bumped whenever
+                                     it extracts different records from the same workbook.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.extractor_version = extractor_version
+
+    def get_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        temporary_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'w') as file:
+            json.dump(index, file)
+        os.replace(temporary_path, index_path)
+
+    def get_file_hash(self, file_path):
+        """
+        SHA-1 of the file's content, reused from the index while its mtime and size are unchanged.
+        """
+        file_path = os.path.abspath(file_path)
+        file_stat = os.stat(file_path)
+        index = self.get_index()
+        entry = index.get(file_path)
+        if entry and entry[0] == file_stat.st_mtime_ns and entry[1] == file_stat.st_size:
+            return entry[2]
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        file_hash = digest.hexdigest()
+        index[file_path] = [file_stat.st_mtime_ns, file_stat.st_size, file_hash]
+        self.save_index(index)
+        return file_hash
+
+    def get_entry_path(self, file_path, kind, sheets):
+        key = json.dumps([self.get_file_hash(file_path), kind, list(sheets), FORMAT_VERSION, self.extractor_version])
+        return os.path.join(self.cache_dir, f"{kind}-{hashlib.sha1(key.encode('utf-8')).hexdigest()}.bin")
+
+    def load(self, file_path, kind, sheets):
+        """
+        Returns:
+            list: The cached records of an extraction of the workbook, None on a cache miss.
+        """
+        entry_path = self.get_entry_path(file_path, kind, sheets)
+        try:
+            records = read_records(entry_path)
+        except (OSError, ValueError):
+            return None
+        if records is not None:
+            os.utime(entry_path)  # Mark the entry as recently used
+        return records
+
+    def store(self, file_path, kind, sheets, records, field_count):
+        """
+        Cache the records of an extraction of the workbook and evict old entries.
+        Records holding a value the format cannot encode are not cached.
+
+        Returns:
+            bool: True if the records were cached.
+        """
+        entry_path = self.get_entry_path(file_path, kind, sheets)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            write_records(entry_path, records, field_count)
+        except TypeError:
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        now = datetime.now().timestamp()
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".bin"):
+                continue
+            try:
+                entry_stat = entry.stat()
+                if now - entry_stat.st_mtime > self.max_age:
+                    os.remove(entry.path)
+                    continue
+            except FileNotFoundError:  # Evicted by another process
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+        index = self.get_index()
+        missing = [path for path in index if not os.path.exists(path)]
+        if missing:
+            for path in missing:
+                del index[path]
+            self.save_index(index)
@@ -0,0 +1,38 @@
+"""
+Factories shared by the tests: slots, comment threads and slots of synthetic schedules.
+"""
+from src.data_extractor import ShiftSlot, iter_shift_slots
+from src.parsing import COMMENT_SEPARATOR, COMMENTER_SEPARATOR, is_valid_time_format
+from benchmarks.synthetic_schedule import generate_schedule
+
+DATE = "2024-12-11"
+
+
+def get_thread(*commenters):
+    """
+    Comment thread, oldest first, of people each asking for the slot for themselves (e.g. "Jane\\n\\t-Jane Doe").
+    """
+    return COMMENT_SEPARATOR.join(f"{commenter.split()[0]}{COMMENTER_SEPARATOR}{commenter}" for commenter in commenters)
+
+
+def get_slot(row=5, comment=None, time="9:00AM - 1:00PM", date=DATE, sheet="Dish", first_name=None, last_name=None):
+    """
+    A slot with its names in columns C and D.
+    """
+    return ShiftSlot(sheet, date, row, 3, 4, time, first_name, last_name, comment)
+
+
+def get_slots(file_path, sheets, keep_filled=True, **schedule_options):
+    """
+    Write a synthetic schedule (see benchmarks/synthetic_schedule.py) and read back its slots with a
+    valid time, as a run resolves them.
+
+    Parameters:
+        file_path (str): Path of the .xlsx file to write.
+        sheets (list): Sheet names, in the order they are resolved.
+        keep_filled (bool): False to leave out the slots whose name cells are filled.
+        schedule_options: days, slots_per_day, commenters and seed of generate_schedule.
+    """
+    generate_schedule(str(file_path), sheets=sheets, **schedule_options)
+    return [slot for slot in iter_shift_slots(str(file_path), sheets)
+            if is_valid_time_format(slot.time) and (keep_filled or not slot.first_name)]
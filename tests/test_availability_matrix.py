@@ -0,0 +1,52 @@
+import random
+import pytest
+from src import assignment_engine
+from src.calendar_policy import CalendarPolicy
+from src.employee import Employee
+from benchmarks.synthetic_schedule import get_random_time
+from tests.helpers import get_slot, get_slots
+
+np = pytest.importorskip("numpy")
+from src.availability_matrix import AvailabilityMatrix  # noqa: E402
+
+
+def test_day_batch_matches_single_shift_batches():
+    rng = random.Random(0)
+    calendar_policy = CalendarPolicy(max_shifts_per_week=3, max_hours_per_week=12)
+    dates = [f"2025-01-{day:02d}" for day in range(6, 10)]
+    availability = AvailabilityMatrix(calendar_policy)
+    shift_assignments = {}
+    for index in range(40):
+        name = f"Person {index}"
+        employee_obj = shift_assignments[name] = Employee(name, calendar_policy)
+        for _ in range(rng.randint(1, 4)):
+            date, time_range = rng.choice(dates), get_random_time(rng)
+            employee_obj.add_shift("Dish", date, time_range)
+            availability.add_shift(name, date, time_range, employee_obj.shifts[-1].hours)
+    shifts = []
+    for _ in range(30):
+        time_range = get_random_time(rng)
+        slot = get_slot(time=time_range, date=dates[0])
+        names = rng.sample(list(shift_assignments), 8) + ["Nobody Yet"]
+        shifts.append((names, time_range, assignment_engine.get_slot_hours(slot)))
+
+    day_rejections = availability.get_day_rejections(dates[0], shifts, shift_assignments)
+    assert day_rejections == [availability.get_rejections(names, dates[0], time_range, hours, shift_assignments)
+                              for names, time_range, hours in shifts]
+    # Same reasons as the scalar checks, in the same order
+    for (names, time_range, hours), rejections in zip(shifts, day_rejections):
+        for name, rejection in rejections.items():
+            employee_obj = shift_assignments[name]
+            expected = calendar_policy.get_cap_violation(employee_obj, dates[0], hours)
+            if expected is None and employee_obj.has_conflict(dates[0], time_range):
+                expected = "conflict"
+            assert rejection == expected
+
+
+def test_numpy_backend_makes_the_scalar_decisions(tmp_path):
+    slots = get_slots(tmp_path / "schedule.xlsx", ["Dish", "Pot Room", "Line"], days=6, slots_per_day=12, commenters=15, seed=3)
+    with assignment_engine.quiet_pass():
+        scalar_assignees, _ = assignment_engine.assign_greedy(slots)
+        numpy_assignees, _ = assignment_engine.assign_greedy(slots, backend="numpy")
+    assert numpy_assignees == scalar_assignees
+    assert sum(1 for name in scalar_assignees if name) > len(slots) // 2
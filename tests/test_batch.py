@@ -0,0 +1,20 @@
+import pytest
+from src.assignment_engine import load_and_assign_shift_xlsx, load_and_assign_shift_xlsx_batch
+from benchmarks.synthetic_schedule import generate_schedule
+
+
+@pytest.mark.parametrize("options", [{"solver": "bogus"}, {"backend": "bogus"}])
+def test_batch_rejects_unknown_options(tmp_path, options):
+    with pytest.raises(ValueError, match="bogus"):
+        load_and_assign_shift_xlsx_batch([str(tmp_path / "missing.xlsx")], ["Dish"], **options)
+    with pytest.raises(ValueError, match="bogus"):
+        load_and_assign_shift_xlsx(str(tmp_path / "missing.xlsx"), ["Dish"], **options)
+
+
+def test_batch_of_one_workbook_matches_a_single_run(tmp_path):
+    file_path = str(tmp_path / "schedule.xlsx")
+    generate_schedule(file_path, sheets=["Dish", "Line"], days=4, commenters=12, seed=1)
+    batch = load_and_assign_shift_xlsx_batch([file_path], ["Dish", "Line"], write_workbook=False)
+    single = load_and_assign_shift_xlsx(file_path, ["Dish", "Line"], write_workbook=False)
+    assert {name: employee_obj.get_summary() for name, employee_obj in batch.items()} == {
+        name: employee_obj.get_summary() for name, employee_obj in single.items()}
@@ -0,0 +1,74 @@
+from datetime import date
+from src.calendar_policy import CalendarPolicy, load_calendar_policy
+from src.employee import Employee
+
+PERIODS = [{"name": "first_finals_week", "start": "2024-12-11", "end": "2024-12-14", "max_shifts": 3},
+           {"name": "second_finals_week", "start": date(2024, 12, 15), "end": date(2024, 12, 19), "max_hours": 10}]
+
+
+def get_policy():
+    return CalendarPolicy(PERIODS, max_shifts_per_week=2, max_hours_per_week=20)
+
+
+def test_date_inside_a_period():
+    calendar_policy = get_policy()
+    assert calendar_policy.get_bucket("2024-12-11") == calendar_policy.get_bucket("2024-12-14") == "first_finals_week"
+    assert calendar_policy.get_limits("first_finals_week") == (3, None)
+    # Period dates given as dates rather than strings, and a missing cap is not enforced
+    assert calendar_policy.get_bucket("2024-12-19") == "second_finals_week"
+    assert calendar_policy.get_limits("second_finals_week") == (None, 10)
+
+
+def test_date_outside_every_period_counts_per_iso_week():
+    calendar_policy = get_policy()
+    # 2024-12-10 is the Tuesday of the week of the first period's start, but outside the period
+    assert calendar_policy.get_bucket("2024-12-10") == calendar_policy.get_bucket("2024-12-09") == "2024-W50"
+    assert calendar_policy.get_bucket("2024-12-20") == "2024-W51"
+    assert calendar_policy.get_bucket("2024-12-30") == "2025-W01"
+    assert calendar_policy.get_limits("2024-W50") == (2, 20)
+
+
+def test_non_date_header_is_a_bucket_of_its_own():
+    calendar_policy = get_policy()
+    assert calendar_policy.get_bucket("Unknown Table") == "Unknown Table"
+    assert calendar_policy.get_bucket("Monday") == "Monday"
+    assert calendar_policy.get_limits("Monday") == (2, 20)
+
+
+def test_weekly_cap_across_days_of_one_bucket():
+    calendar_policy = get_policy()
+    employee_obj = Employee("Jane Doe", calendar_policy)
+    employee_obj.add_shift("Dish", "2024-12-09", "9:00AM - 12:00PM")
+    employee_obj.add_shift("Dish", "2024-12-10", "9:00AM - 12:00PM")
+    assert calendar_policy.get_cap_violation(employee_obj, "2024-12-08") is None  # Sunday of the week before
+    assert calendar_policy.get_cap_violation(employee_obj, "2024-12-10", 3) == "weekly_cap"
+    # The period has its own cap, counted apart from the ISO week it falls in
+    for day in ("2024-12-11", "2024-12-12"):
+        employee_obj.add_shift("Dish", day, "9:00AM - 12:00PM")
+    assert calendar_policy.get_cap_violation(employee_obj, "2024-12-13", 3) is None
+    employee_obj.add_shift("Dish", "2024-12-13", "9:00AM - 12:00PM")
+    assert calendar_policy.get_cap_violation(employee_obj, "2024-12-14", 3) == "weekly_cap"
+
+
+def test_hours_cap():
+    calendar_policy = get_policy()
+    employee_obj = Employee("Jane Doe", calendar_policy)
+    employee_obj.add_shift("Dish", "2024-12-16", "7:00AM - 3:00PM")
+    assert calendar_policy.get_cap_violation(employee_obj, "2024-12-17", 2) is None
+    assert calendar_policy.get_cap_violation(employee_obj, "2024-12-17", 2.5) == "hours_cap"
+
+
+def test_weekly_cap_of_non_date_headers_counts_per_header():
+    calendar_policy = get_policy()
+    employee_obj = Employee("Jane Doe", calendar_policy)
+    employee_obj.add_shift("Dish", "Monday", "7:00AM - 9:00AM")
+    employee_obj.add_shift("Dish", "Monday", "1:00PM - 3:00PM")
+    assert calendar_policy.get_cap_violation(employee_obj, "Monday") == "weekly_cap"
+    # Tuesday's table is another bucket, even if the two tables are of the same week
+    assert calendar_policy.get_cap_violation(employee_obj, "Tuesday") is None
+
+
+def test_load_calendar_policy():
+    calendar_policy = load_calendar_policy({"periods": PERIODS, "max_shifts_per_week": 5})
+    assert calendar_policy.get_limits(calendar_policy.get_bucket("2024-12-02")) == (5, None)
+    assert load_calendar_policy({}).get_limits(load_calendar_policy({}).get_bucket("2024-12-02")) == (None, None)
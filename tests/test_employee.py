@@ -0,0 +1,73 @@
+import random
+from src.calendar_policy import CalendarPolicy
+from src.employee import DayIntervals, Employee
+
+DATE = "2025-01-06"
+
+
+def get_employee(*times):
+    employee_obj = Employee("Jane Doe", CalendarPolicy())
+    for time in times:
+        employee_obj.add_shift("Dish", DATE, time)
+    return employee_obj
+
+
+def has_pairwise_conflict(intervals, start, end):
+    """
+    The check DayIntervals replaces: compare the new interval with every interval of the day.
+    """
+    day = 24 * 60
+    end += day if end < start else 0
+    return any(not (end <= other_start or start >= other_end + (day if other_end < other_start else 0))
+               for other_start, other_end in intervals)
+
+
+def test_touching_shifts_do_not_conflict():
+    employee_obj = get_employee("9:00AM - 12:00PM")
+    assert not employee_obj.has_conflict(DATE, "12:00PM - 2:00PM")
+    assert not employee_obj.has_conflict(DATE, "7:00AM - 9:00AM")
+    assert employee_obj.has_conflict(DATE, "11:59AM - 2:00PM")
+
+
+def test_containment_conflicts():
+    employee_obj = get_employee("9:00AM - 5:00PM")
+    assert employee_obj.has_conflict(DATE, "10:00AM - 11:00AM")
+    assert employee_obj.has_conflict(DATE, "8:00AM - 6:00PM")
+    assert employee_obj.has_conflict(DATE, "9:00AM - 5:00PM")
+
+
+def test_overlap_with_an_earlier_long_shift():
+    # The shift just before 3:00PM in start order ends at 11:00AM; only the running max of the
+    # ends sees the 8:00AM - 6:00PM shift.
+    employee_obj = get_employee("8:00AM - 6:00PM", "10:00AM - 11:00AM", "12:00PM - 1:00PM")
+    assert employee_obj.has_conflict(DATE, "3:00PM - 4:00PM")
+    assert not employee_obj.has_conflict(DATE, "6:00PM - 8:00PM")
+
+
+def test_other_dates_do_not_conflict():
+    employee_obj = get_employee("9:00AM - 5:00PM")
+    assert not employee_obj.has_conflict("2025-01-07", "10:00AM - 11:00AM")
+
+
+def test_shifts_past_midnight():
+    employee_obj = get_employee("10:00PM - 2:00AM")
+    assert employee_obj.has_conflict(DATE, "11:00PM - 11:30PM")
+    assert employee_obj.has_conflict(DATE, "9:00PM - 10:30PM")
+    assert employee_obj.has_conflict(DATE, "11:00PM - 1:00AM")
+    assert not employee_obj.has_conflict(DATE, "6:00PM - 10:00PM")
+    assert get_employee("6:00PM - 11:00PM").has_conflict(DATE, "10:00PM - 2:00AM")
+    assert not get_employee("6:00PM - 10:00PM").has_conflict(DATE, "10:00PM - 2:00AM")
+    assert employee_obj.total_hours == 4
+
+
+def test_same_result_as_the_pairwise_check():
+    rng = random.Random(0)
+    minutes = range(0, 24 * 60, 15)
+    for _ in range(300):
+        intervals = [(rng.choice(minutes), rng.choice(minutes)) for _ in range(rng.randint(0, 8))]
+        day_intervals = DayIntervals()
+        for start, end in intervals:
+            day_intervals.add(start, end)
+        for _ in range(20):
+            start, end = rng.choice(minutes), rng.choice(minutes)
+            assert day_intervals.overlaps(start, end) == has_pairwise_conflict(intervals, start, end), (intervals, start, end)
@@ -0,0 +1,89 @@
+import pytest
+from src import employee_registry
+from src.assignment_engine import assign_greedy, quiet_pass
+from src.employee_registry import (EmployeeRegistry, create_employee_registry, employee_registry_for, get_employee_registry,
+                                   normalize_name)
+from src.resolution_service import ResolutionService
+from tests.helpers import get_slot, get_thread
+
+
+def test_case_width_and_space_variants_are_one_person():
+    registry = EmployeeRegistry()
+    person_id = registry.get_id("Jane  Doe ")
+    for spelling in ("jane doe", "JANE DOE", "Ｊａｎｅ　Ｄｏｅ", "\tJane Doe"):
+        assert registry.get_id(spelling) == person_id
+    assert registry.get_name("ＪＡＮＥ doe") == "Jane Doe"
+    assert normalize_name("Ｊａｎｅ　ＤＯＥ") == "jane doe"
+    assert len(registry) == 1
+
+
+def test_different_names_stay_apart():
+    registry = EmployeeRegistry()
+    assert len({registry.get_id(name) for name in ("Jane Doe", "Jane Do", "Jane Doe Smith", "John Doe")}) == 4
+
+
+def test_alias_resolves_to_its_name():
+    registry = EmployeeRegistry({"Disha P. Kumar": "Disha Prasanna Kumar"})
+    assert registry.get_name("disha p. kumar") == "Disha Prasanna Kumar"
+    assert registry.get_id("DISHA P. KUMAR") == registry.get_id("Disha Prasanna Kumar")
+    assert registry.get_name_parts("Disha P. Kumar") == ("Disha Prasanna", "Kumar")
+    # A comment is the person's own when it is part of any of their spellings
+    assert registry.is_own_comment("Disha P.", "Disha Prasanna Kumar")
+    assert registry.is_own_comment("Prasanna", "Disha P. Kumar")
+    assert not registry.is_own_comment("John", "Disha P. Kumar")
+
+
+def test_alias_of_someone_else_is_rejected():
+    with pytest.raises(ValueError, match="already the name of someone else"):
+        EmployeeRegistry({"Jane Doe": "Jane Smith", "jane doe": "John Roe"})
+
+
+def test_aliases_of_the_config(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text('aliases:\n  "J. Doe": Jane Doe\n')
+    registry = create_employee_registry([get_slot(5, get_thread("J. Doe"))], str(config_path))
+    assert registry.get_name("J. Doe") == "Jane Doe"
+    assert registry.names == ["Jane Doe"]
+
+
+def test_lookups_do_not_register_names():
+    registry = EmployeeRegistry()
+    registry.get_id("Jane Doe")
+    assert registry.find_name("JANE DOE") == "Jane Doe"
+    assert registry.find_id("John Roe") is None and registry.find_name("John Roe") is None
+    assert len(registry) == 1
+
+
+def test_service_lookups_of_unknown_names_do_not_register_them():
+    service = ResolutionService(["Dish"], [get_slot(5, get_thread("Jane Doe"))])
+    assert service.handle({"type": "shifts", "name": "John Roe"})["shifts"] == []
+    assert service.handle({"type": "is_available", "name": "John Roe", "date": "2024-12-11", "time": "1:00PM - 2:00PM"})["available"]
+    assert service.registry.find_id("John Roe") is None
+    assert service.registry.names == ["Jane Doe"]
+
+
+def test_first_filled_name_cell_then_first_comment_names_a_person():
+    slots = [get_slot(5, get_thread("jane doe")), get_slot(6, get_thread("JOHN ROE")),
+             get_slot(7, first_name="Jane", last_name="DOE")]
+    registry = create_employee_registry(slots)
+    assert registry.get_name("Jane Doe") == "Jane DOE"
+    assert registry.get_name("John Roe") == "JOHN ROE"
+
+
+def test_runs_do_not_share_a_registry():
+    first_run = [get_slot(5, get_thread("jane doe"))]
+    second_run = [get_slot(5, get_thread("Jane Doe"))]
+    with quiet_pass():
+        assert assign_greedy(first_run)[0] == ["jane doe"]
+        assert assign_greedy(second_run)[0] == ["Jane Doe"]
+    assert employee_registry.active_employee_registry is None
+    # Outside a run, every registry starts from the aliases only
+    assert get_employee_registry().find_id("jane doe") is None
+
+
+def test_nested_blocks_share_the_outer_registry():
+    with employee_registry_for([get_slot(5, get_thread("Jane Doe"))]) as registry:
+        with employee_registry_for([get_slot(5, get_thread("John Roe"))]) as inner_registry:
+            assert inner_registry is registry and get_employee_registry() is registry
+        assert registry.find_id("John Roe") is None
+    assert employee_registry.active_employee_registry is None
@@ -0,0 +1,104 @@
+import random
+import pytest
+from src.assignment_engine import assign_greedy, quiet_pass, resolve_changed_slots
+from src.parsing import COMMENT_SEPARATOR
+from src.snapshot import get_slot_fingerprint, get_slot_key
+from benchmarks.synthetic_schedule import get_comment_thread, get_people
+from tests.helpers import get_slot, get_thread, get_slots
+
+SHEETS = ["Dish", "Line", "Sushi"]
+
+
+def get_schedule_slots(tmp_path, seed):
+    return get_slots(tmp_path / f"schedule_{seed}.xlsx", SHEETS, days=5, slots_per_day=8, commenters=12, seed=seed)
+
+
+def get_snapshot(slots):
+    """
+    The snapshot of a full greedy run that left the workbook untouched.
+    """
+    with quiet_pass():
+        assignees, _ = assign_greedy(slots)
+    return {"slots": {get_slot_key(slot): [get_slot_fingerprint(slot), assign_shift_to]
+                      for slot, assign_shift_to in zip(slots, assignees)}}
+
+
+def edit_slots(slots, rng, edits):
+    """
+    Apply random edits: new comments, rewritten or cleared threads, filled or moved shifts,
+    removed rows and rows added at the end of a table.
+    """
+    people = get_people(12)
+    slots = list(slots)
+    for _ in range(edits):
+        slot_index = rng.randrange(len(slots))
+        slot = slots[slot_index]
+        kind = rng.randrange(6)
+        if kind == 0:
+            comment = get_thread(" ".join(rng.choice(people)))
+            slots[slot_index] = slot._replace(comment=slot.comment + COMMENT_SEPARATOR + comment if slot.comment else comment)
+        elif kind == 1:
+            slots[slot_index] = slot._replace(comment=get_comment_thread(rng, people) if rng.random() < 0.7 else None)
+        elif kind == 2:
+            slots[slot_index] = slot._replace(first_name="Pat", last_name="Filled", comment=None)
+        elif kind == 3:
+            slots[slot_index] = slot._replace(time=rng.choice(["7:00AM - 9:00AM", "10:00AM - 2:00PM", "5:00PM - 9:00PM"]))
+        elif kind == 4:
+            del slots[slot_index]
+        else:
+            row = max(other.row for other in slots if other.sheet == slot.sheet) + 1
+            slots.insert(slot_index + 1, slot._replace(row=row, first_name=None, last_name=None, comment=get_comment_thread(rng, people)))
+    return slots
+
+
+def assert_same_as_full_run(slots, snapshot, backend="scalar"):
+    assignees, shift_assignments, _ = resolve_changed_slots(slots, snapshot, backend)
+    with quiet_pass():
+        full_assignees, full_shift_assignments = assign_greedy(slots)
+    assert assignees == full_assignees
+    assert {name: employee_obj.get_summary() for name, employee_obj in shift_assignments.items()} == {
+        name: employee_obj.get_summary() for name, employee_obj in full_shift_assignments.items()}
+
+
+def test_unchanged_slots_are_not_resolved(tmp_path):
+    slots = get_schedule_slots(tmp_path, 0)
+    assignees, _, slots_to_resolve = resolve_changed_slots(slots, get_snapshot(slots))
+    assert not slots_to_resolve
+    with quiet_pass():
+        assert assignees == assign_greedy(slots)[0]
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("edits", [1, 5, 20])
+def test_incremental_run_matches_a_full_run_after_edits(tmp_path, seed, edits):
+    slots = get_schedule_slots(tmp_path, seed)
+    snapshot = get_snapshot(slots)
+    assert_same_as_full_run(edit_slots(slots, random.Random(seed * 100 + edits), edits), snapshot)
+
+
+def test_removed_slot_frees_its_assignee():
+    # Four shifts in the first finals week, capped at three
+    slots = [get_slot(day, get_thread("Jane Doe"), date=f"2024-12-{day}") for day in range(11, 15)]
+    snapshot = get_snapshot(slots)
+    assert [entry[1] for entry in snapshot["slots"].values()] == ["Jane Doe"] * 3 + [""]
+    assignees, _, _ = resolve_changed_slots(slots[1:], snapshot)
+    assert assignees == ["Jane Doe"] * 3
+
+
+def test_successive_incremental_runs(tmp_path):
+    rng = random.Random(7)
+    slots = get_schedule_slots(tmp_path, 7)
+    snapshot = get_snapshot(slots)
+    for _ in range(5):
+        slots = edit_slots(slots, rng, 3)
+        assignees, _, _ = resolve_changed_slots(slots, snapshot)
+        assert_same_as_full_run(slots, snapshot)
+        snapshot = {"slots": {get_slot_key(slot): [get_slot_fingerprint(slot), assign_shift_to]
+                              for slot, assign_shift_to in zip(slots, assignees)}}
+
+
+def test_numpy_backend_matches_a_full_run(tmp_path):
+    pytest.importorskip("numpy")
+    slots = get_schedule_slots(tmp_path, 3)
+    snapshot = get_snapshot(slots)
+    assert_same_as_full_run(edit_slots(slots, random.Random(3), 10), snapshot, backend="numpy")
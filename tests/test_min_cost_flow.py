@@ -0,0 +1,57 @@
+from src.min_cost_flow import MinCostFlow
+
+
+def get_network(node_count, edges):
+    """
+    A network of node_count nodes with edges given as (source, target, capacity, cost) tuples.
+
+    Returns:
+        tuple: (the network, the id of each edge).
+    """
+    network = MinCostFlow()
+    for _ in range(node_count):
+        network.add_node()
+    return network, [network.add_edge(*edge) for edge in edges]
+
+
+def test_max_flow_is_limited_by_the_min_cut():
+    # 0 -> 1 -> 3 and 0 -> 2 -> 3, with a cross edge 1 -> 2; the cut around the sink holds 5.
+    network, edges = get_network(4, [(0, 1, 3), (0, 2, 2), (1, 2, 5), (1, 3, 2), (2, 3, 3)])
+    assert network.solve(0, 3) == (5, 0)
+    assert [network.get_flow(edge) for edge in edges][3:] == [2, 3]
+
+
+def test_flow_takes_the_cheapest_path_first():
+    network, edges = get_network(4, [(0, 1, 1, 1), (0, 2, 1, 5), (1, 3, 1, 1), (2, 3, 1, 1), (1, 2, 1, 0)])
+    assert network.solve(0, 3) == (2, 8)
+    # Unit flow on the cheap path and on the expensive one, none through the unused shortcut.
+    assert [network.get_flow(edge) for edge in edges] == [1, 1, 1, 1, 0]
+
+
+def test_flow_is_rerouted_when_a_cheap_path_blocks_a_larger_flow():
+    # Sending the first unit on 0 -> 1 -> 2 -> 3 (cost 2) blocks both other paths; the optimum
+    # sends one unit on each of 0 -> 1 -> 3 and 0 -> 2 -> 3 for a cost of 6 + 6.
+    network, edges = get_network(4, [(0, 1, 1, 1), (0, 2, 1, 5), (1, 2, 1, 0), (1, 3, 1, 5), (2, 3, 1, 1)])
+    assert network.solve(0, 3) == (2, 12)
+    assert network.get_flow(edges[2]) == 0
+
+
+def test_parallel_edges_fill_cheapest_first():
+    network, edges = get_network(2, [(0, 1, 2, 3), (0, 1, 1, 1), (0, 1, 4, 2)])
+    assert network.solve(0, 1) == (7, 1 + 4 * 2 + 2 * 3)
+    assert [network.get_flow(edge) for edge in edges] == [2, 1, 4]
+
+
+def test_assignment_problem():
+    # Workers 1, 2 and slots 3, 4 between source 0 and sink 5; the optimum is 1 -> 4, 2 -> 3.
+    costs = {(1, 3): 4, (1, 4): 1, (2, 3): 2, (2, 4): 3}
+    network, edges = get_network(6, [(0, 1, 1), (0, 2, 1), (3, 5, 1), (4, 5, 1)]
+                                 + [(worker, slot, 1, cost) for (worker, slot), cost in costs.items()])
+    assert network.solve(0, 5) == (2, 3)
+    assert [pair for pair, edge in zip(costs, edges[4:]) if network.get_flow(edge)] == [(1, 4), (2, 3)]
+
+
+def test_unreachable_sink():
+    network, edges = get_network(3, [(0, 1, 4, 1)])
+    assert network.solve(0, 2) == (0, 0)
+    assert network.get_flow(edges[0]) == 0
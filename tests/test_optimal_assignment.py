@@ -0,0 +1,69 @@
+import pytest
+from src import assignment_engine
+from src.assignment_engine import (add_shift_to_employee, assign_greedy, get_rejection, get_slot_candidates, quiet_pass,
+                                   solve_optimal_assignment)
+from src.employee_registry import employee_registry_for
+from benchmarks.synthetic_schedule import generate_schedule
+from tests.helpers import get_slot, get_slots, get_thread
+
+
+def get_tight_slots(tmp_path, seed, keep_filled=False):
+    # Few commenters for many slots, so the caps and conflicts decide most slots. Pre-filled
+    # slots keep their name even when it breaks a rule.
+    return get_slots(tmp_path / f"schedule_{seed}.xlsx", ["Dish", "Line", "Sushi"], keep_filled,
+                     days=6, slots_per_day=8, commenters=10, seed=seed)
+
+
+def count_greedy_assignments(slots):
+    with quiet_pass():
+        assignees, _ = assign_greedy(slots)
+    return sum(map(bool, assignees))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_optimal_assignments_pass_every_rule(tmp_path, seed):
+    slots = get_tight_slots(tmp_path, seed)
+    assignees, shift_assignments = solve_optimal_assignment(slots)
+    with employee_registry_for(slots):
+        for slot_index, (slot, assign_shift_to) in enumerate(zip(slots, assignees)):
+            if not assign_shift_to:
+                continue
+            assert assign_shift_to in get_slot_candidates(slot)
+            # Check the slot against every other shift of its assignee, whichever was assigned first.
+            others = {}
+            for other_index, (other_slot, other_assignee) in enumerate(zip(slots, assignees)):
+                if other_assignee == assign_shift_to and other_index != slot_index:
+                    add_shift_to_employee(others, assign_shift_to, other_slot)
+            assert get_rejection(others.get(assign_shift_to), slot) is None, (slot, assign_shift_to)
+    assert sum(len(employee_obj.shifts) for employee_obj in shift_assignments.values()) == sum(map(bool, assignees))
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("keep_filled", [False, True])
+def test_optimal_fills_at_least_as_many_slots_as_greedy(tmp_path, seed, keep_filled):
+    slots = get_tight_slots(tmp_path, seed, keep_filled)
+    assignees, _ = solve_optimal_assignment(slots)
+    assert sum(map(bool, assignees)) >= count_greedy_assignments(slots)
+
+
+def test_optimal_fills_a_slot_greedy_leaves_empty():
+    # Greedy gives the first slot to its latest commenter, Jane, who then conflicts with the
+    # second slot, the only one she asked for alone.
+    slots = [get_slot(5, get_thread("John Roe", "Jane Doe"), "9:00AM - 12:00PM"), get_slot(6, get_thread("Jane Doe"), "11:00AM - 1:00PM")]
+    assert count_greedy_assignments(slots) == 1
+    assignees, _ = solve_optimal_assignment(slots)
+    assert assignees == ["John Roe", "Jane Doe"]
+
+
+def test_optimal_run_makes_one_greedy_pass(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "schedule.xlsx")
+    generate_schedule(file_path, sheets=["Dish", "Line"], days=2, commenters=6, seed=0)
+    greedy_passes = []
+
+    def counting_assign_greedy(slots, *args, **kwargs):
+        greedy_passes.append(len(slots))
+        return assign_greedy(slots, *args, **kwargs)
+
+    monkeypatch.setattr(assignment_engine, "assign_greedy", counting_assign_greedy)
+    assignment_engine.load_and_assign_shift_xlsx(file_path, ["Dish", "Line"], solver="optimal", write_workbook=False)
+    assert len(greedy_passes) == 1
@@ -0,0 +1,83 @@
+from datetime import datetime
+import random
+import pytest
+from src.parsing import (COMMENT_SEPARATOR, COMMENTER_SEPARATOR, clear_caches, get_cache_info, is_valid_time_format, iter_comments,
+                         iter_comments_newest_first, parse_comments, parse_time, parse_time_range)
+
+THREADS = [
+    None,
+    "",
+    "Jane",
+    f"Jane{COMMENTER_SEPARATOR}Jane Doe",
+    f"Jane{COMMENTER_SEPARATOR}Jane Doe{COMMENT_SEPARATOR}John please{COMMENT_SEPARATOR}John{COMMENTER_SEPARATOR}John Roe",
+    f"{COMMENT_SEPARATOR}{COMMENT_SEPARATOR}x",
+    # Two separators sharing a newline
+    f"a{COMMENT_SEPARATOR}----{COMMENT_SEPARATOR[1:]}b{COMMENTER_SEPARATOR}B",
+    COMMENT_SEPARATOR,
+]
+
+
+@pytest.mark.parametrize("raw_comment", THREADS)
+def test_iter_comments_matches_parse_comments(raw_comment):
+    assert list(iter_comments(raw_comment)) == parse_comments(raw_comment)
+
+
+@pytest.mark.parametrize("raw_comment", THREADS)
+def test_iter_comments_newest_first_matches_parse_comments(raw_comment):
+    assert list(iter_comments_newest_first(raw_comment)) == parse_comments(raw_comment)[::-1]
+
+
+def parse_time_with_strptime(time):
+    parsed = datetime.strptime(time, "%I:%M%p")
+    return parsed.hour * 60 + parsed.minute
+
+
+TIMES = ["12:00AM", "12:00PM", "12:59am", "1:00PM", "01:05pm", "9:5PM", "9:05", "9:00 PM", " 9:00PM", "9:00PM ",
+         "9 :00PM", "0:30AM", "13:00PM", "9:60AM", "9:000AM", "123:00AM", "9:00XM", "9:00P", "9.00PM", "", ":PM", "1:1AM",
+         "９:00AM", "9:00ＡＭ", "٩:30PM"]
+
+
+@pytest.mark.parametrize("time", TIMES)
+def test_parse_time_matches_strptime(time):
+    try:
+        expected = parse_time_with_strptime(time)
+    except ValueError:
+        with pytest.raises(ValueError):
+            parse_time(time)
+    else:
+        assert parse_time(time) == expected
+
+
+def test_parse_time_matches_strptime_on_random_inputs():
+    rng = random.Random(0)
+    valid = 0
+    for _ in range(5000):
+        hour = rng.choice([str(rng.randint(0, 13)), f"{rng.randint(0, 13):02d}", "", "123"])
+        minute = rng.choice([str(rng.randint(0, 61)), f"{rng.randint(0, 61):02d}", "", "000"])
+        time = hour + rng.choice([":", ":", " :", "."]) + minute + rng.choice(["AM", "pm", "Pm", "", "XM", " AM", "AM "])
+        try:
+            expected = parse_time_with_strptime(time)
+        except ValueError:
+            expected = None
+        try:
+            result = parse_time(time)
+        except ValueError:
+            result = None
+        assert result == expected, time
+        valid += result is not None
+    assert valid > 100
+
+
+def test_time_parsing_caches_are_hit():
+    clear_caches()
+    assert parse_time_range("9:00AM - 1:00PM") == (540, 780)
+    # Spacing and case variants share the canonical cache entry
+    assert parse_time_range("9:00am-1:00pm") == parse_time_range(" 9:00AM -1:00PM") == (540, 780)
+    assert parse_time_range("10:00PM - 2:00AM") == (1320, 120)
+    assert is_valid_time_format("9:00AM - 1:00PM") and is_valid_time_format("9:00AM-1:00PM")
+    assert not is_valid_time_format("9:00am - 1:00pm")
+    cache_info = get_cache_info()
+    assert (cache_info["time_ranges"]["hits"], cache_info["time_ranges"]["misses"]) == (2, 2)
+    assert (cache_info["time_formats"]["hits"], cache_info["time_formats"]["misses"]) == (1, 2)
+    clear_caches()
+    assert get_cache_info()["time_ranges"]["currsize"] == 0
@@ -0,0 +1,59 @@
+import csv
+import json
+from src.assignment_engine import export_assignments, load_and_assign_shift_xlsx
+from src.calendar_policy import CalendarPolicy
+from src.employee import Employee
+from src.report_generator import ASSIGNMENT_COLUMNS
+from benchmarks.synthetic_schedule import generate_schedule
+
+
+def get_shift_assignments():
+    jane = Employee("Jane Doe", CalendarPolicy())
+    jane.add_shift("Dish", "2024-12-11", "9:00AM - 12:00PM")
+    jane.add_shift("Line", "2024-12-12", "1:00PM - 3:30PM")
+    john = Employee("John Roe", CalendarPolicy())
+    john.add_shift("Pot Room", "2024-12-11", "10:00PM - 2:00AM")
+    return {"Jane Doe": jane, "John Roe": john}
+
+
+def read_csv(csv_path):
+    with open(csv_path, newline='') as file:
+        return list(csv.reader(file))
+
+
+def test_export_assignments(tmp_path):
+    json_path = tmp_path / "out" / "assignments.json"
+    csv_path = tmp_path / "out" / "assignments.csv"
+    export_assignments(get_shift_assignments(), str(json_path), str(csv_path))
+    assert json.loads(json_path.read_text()) == [
+        {"name": "Jane Doe", "shifts": [{"location": "Dish", "date": "2024-12-11", "time": "9:00AM-12:00PM"},
+                                        {"location": "Line", "date": "2024-12-12", "time": "1:00PM-3:30PM"}],
+         "dish_or_pot_shift_taken": True, "total_shift_count": 2, "total_hours": 5.5},
+        {"name": "John Roe", "shifts": [{"location": "Pot Room", "date": "2024-12-11", "time": "10:00PM-2:00AM"}],
+         "dish_or_pot_shift_taken": True, "total_shift_count": 1, "total_hours": 4.0},
+    ]
+    assert read_csv(csv_path) == [
+        ["name", "location", "date", "time", "hours"],
+        ["Jane Doe", "Dish", "2024-12-11", "9:00AM-12:00PM", "3.0"],
+        ["Jane Doe", "Line", "2024-12-12", "1:00PM-3:30PM", "2.5"],
+        ["John Roe", "Pot Room", "2024-12-11", "10:00PM-2:00AM", "4.0"],
+    ]
+    assert ASSIGNMENT_COLUMNS == read_csv(csv_path)[0]
+
+
+def test_run_without_write_back_leaves_the_workbook_unmodified(tmp_path):
+    file_path = tmp_path / "schedule.xlsx"
+    generate_schedule(str(file_path), sheets=["Dish", "Line"], days=3, commenters=10, seed=2)
+    content = file_path.read_bytes()
+    modified = file_path.stat().st_mtime_ns
+    shift_assignments = load_and_assign_shift_xlsx(str(file_path), ["Dish", "Line"], write_workbook=False,
+                                                   json_path=str(tmp_path / "assignments.json"), csv_path=str(tmp_path / "assignments.csv"))
+    assert shift_assignments
+    assert file_path.read_bytes() == content and file_path.stat().st_mtime_ns == modified
+    rows = read_csv(tmp_path / "assignments.csv")[1:]
+    assert len(rows) == sum(len(employee_obj.shifts) for employee_obj in shift_assignments.values())
+    assert [summary["name"] for summary in json.loads((tmp_path / "assignments.json").read_text())] == list(shift_assignments)
+
+    # The same run with write-back fills the name cells
+    load_and_assign_shift_xlsx(str(file_path), ["Dish", "Line"])
+    assert file_path.read_bytes() != content
@@ -0,0 +1,40 @@
+from src.resolution_service import ResolutionService
+from tests.helpers import get_slot, get_thread
+
+
+def test_queries_do_not_register_names():
+    service = ResolutionService(["Dish"], [get_slot(5)])
+    response = service.handle({"type": "is_available", "name": "JANE DOE", "date": "2024-12-11", "time": "2:00PM - 4:00PM"})
+    assert response["ok"] and response["available"]
+    assert service.handle({"type": "shifts", "name": "JANE DOE"})["shifts"] == []
+    assert service.registry.find_id("Jane Doe") is None
+
+    service.handle({"type": "set_slot", "slot": get_slot(6, get_thread("Jane Doe"))._asdict()})
+    assert service.handle({"type": "who_has", "key": "Dish!C6"})["assignee"] == "Jane Doe"
+    # Other spellings find the registered person without renaming them
+    assert service.handle({"type": "shifts", "name": "JANE DOE"})["shifts"] == [
+        {"location": "Dish", "date": "2024-12-11", "time": "9:00AM-1:00PM"}]
+
+
+def test_is_available_checks_the_time_range():
+    service = ResolutionService(["Dish"], [get_slot(5, get_thread("Jane Doe"))])
+    response = service.handle({"type": "is_available", "name": "Jane Doe", "date": "2024-12-11", "time": "garbage"})
+    assert not response["ok"] and "garbage" in response["error"]
+    response = service.handle({"type": "is_available", "name": "Jane Doe", "date": "2024-12-11", "time": "10:00AM - 11:00AM"})
+    assert response["ok"] and response["reason"] == "conflict"
+
+
+def test_set_slot_defaults_the_last_name_column():
+    service = ResolutionService(["Dish"])
+    fields = get_slot(5)._asdict()
+    del fields["last_name_column"]
+    assert service.handle({"type": "set_slot", "slot": fields})["ok"]
+    assert service.slots["Dish!C5"].last_name_column == 4
+
+
+def test_rejected_update_keeps_the_state():
+    service = ResolutionService(["Dish"], [get_slot(5, get_thread("Jane Doe"))])
+    state = service.state
+    response = service.handle({"type": "set_slot", "slot": dict(get_slot(6)._asdict(), row="6")})
+    assert not response["ok"]
+    assert service.state is state
@@ -0,0 +1,170 @@
+import pytest
+from src import assignment_engine, rules
+from src.calendar_policy import CalendarPolicy
+from src.employee import Employee
+from src.rules import NOT_CHECKED, Rule, RuleSet, compile_rule, load_rule_set
+from tests.helpers import DATE, get_slot, get_thread
+
+# Same ISO week as DATE, and the week after
+NEXT_DAY = "2024-12-12"
+NEXT_WEEK = "2024-12-18"
+
+
+def get_employee(*shifts, max_shifts_per_week=None, max_hours_per_week=None):
+    """
+    An employee holding shifts given as (sheet, date, time) tuples.
+    """
+    employee_obj = Employee("Jane Doe", CalendarPolicy(max_shifts_per_week=max_shifts_per_week, max_hours_per_week=max_hours_per_week))
+    for sheet, date, time in shifts:
+        employee_obj.add_shift(sheet, date, time)
+    return employee_obj
+
+
+def rejects(rule_config, employee_obj, slot):
+    return compile_rule(rule_config).rejects(employee_obj, slot)
+
+
+def test_rule_is_abstract():
+    class IncompleteRule(Rule):
+        type = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteRule()
+
+
+def test_weekly_cap():
+    employee_obj = get_employee(("Dish", DATE, "7:00AM - 9:00AM"), ("Dish", NEXT_DAY, "7:00AM - 9:00AM"), max_shifts_per_week=2)
+    assert rejects({"type": "weekly_cap"}, employee_obj, get_slot(time="1:00PM - 3:00PM", date=NEXT_DAY))
+    assert not rejects({"type": "weekly_cap"}, employee_obj, get_slot(time="1:00PM - 3:00PM", date=NEXT_WEEK))
+
+
+def test_hours_cap():
+    employee_obj = get_employee(("Dish", DATE, "7:00AM - 1:00PM"), max_hours_per_week=8)
+    assert rejects({"type": "hours_cap"}, employee_obj, get_slot(time="2:00PM - 5:00PM", date=NEXT_DAY))
+    assert not rejects({"type": "hours_cap"}, employee_obj, get_slot(time="2:00PM - 4:00PM", date=NEXT_DAY))
+
+
+def test_conflict():
+    employee_obj = get_employee(("Dish", DATE, "9:00AM - 12:00PM"))
+    assert rejects({"type": "conflict"}, employee_obj, get_slot(time="11:00AM - 1:00PM"))
+    assert not rejects({"type": "conflict"}, employee_obj, get_slot(time="12:00PM - 2:00PM"))
+    assert not rejects({"type": "conflict"}, employee_obj, get_slot(time="11:00AM - 1:00PM", date=NEXT_DAY))
+
+
+def test_prerequisite():
+    line_only = get_employee(("Line", DATE, "9:00AM - 12:00PM"))
+    slot = get_slot(time="1:00PM - 3:00PM", sheet="Sushi")
+    assert rejects({"type": "prerequisite"}, None, slot)
+    assert not rejects({"type": "prerequisite"}, line_only, slot)
+    assert rejects({"type": "prerequisite", "locations": ["Dish", "Pot Room"]}, line_only, slot)
+    assert not rejects({"type": "prerequisite", "locations": ["Dish", "Pot Room"]},
+                       get_employee(("Pot Room", DATE, "9:00AM - 12:00PM")), slot)
+
+
+def test_sheet_cap():
+    employee_obj = get_employee(("Line", DATE, "7:00AM - 9:00AM"), ("Dish", DATE, "9:00AM - 11:00AM"))
+    rule_config = {"type": "sheet_cap", "max_shifts": 1, "sheets": ["Line"]}
+    assert rejects(rule_config, employee_obj, get_slot(time="1:00PM - 3:00PM", date=NEXT_DAY, sheet="Line"))
+    assert not rejects(rule_config, employee_obj, get_slot(time="1:00PM - 3:00PM", date=NEXT_WEEK, sheet="Line"))
+    assert not rejects({**rule_config, "max_shifts": 2}, employee_obj, get_slot(time="1:00PM - 3:00PM", date=NEXT_DAY, sheet="Line"))
+    # Shifts at other sheets do not count
+    assert not rejects(rule_config, get_employee(("Dish", DATE, "7:00AM - 9:00AM")), get_slot(time="1:00PM - 3:00PM", sheet="Line"))
+
+
+def test_daily_hours():
+    employee_obj = get_employee(("Dish", DATE, "7:00AM - 11:00AM"))
+    assert rejects({"type": "daily_hours", "max_hours": 6}, employee_obj, get_slot(time="1:00PM - 4:00PM"))
+    assert not rejects({"type": "daily_hours", "max_hours": 6}, employee_obj, get_slot(time="1:00PM - 3:00PM"))
+    assert not rejects({"type": "daily_hours", "max_hours": 6}, employee_obj, get_slot(time="1:00PM - 4:00PM", date=NEXT_DAY))
+
+
+def test_min_rest():
+    employee_obj = get_employee(("Dish", DATE, "9:00AM - 12:00PM"))
+    rule_config = {"type": "min_rest", "minutes": 60}
+    assert rejects(rule_config, employee_obj, get_slot(time="12:30PM - 2:00PM"))
+    assert rejects(rule_config, employee_obj, get_slot(time="7:00AM - 8:30AM"))
+    assert not rejects(rule_config, employee_obj, get_slot(time="1:00PM - 3:00PM"))
+    assert not rejects(rule_config, employee_obj, get_slot(time="12:30PM - 2:00PM", date=NEXT_DAY))
+    # Overlaps are left to the conflict rule
+    assert not rejects(rule_config, employee_obj, get_slot(time="11:00AM - 1:00PM"))
+
+
+def test_no_back_to_back():
+    employee_obj = get_employee(("Dish", DATE, "9:00AM - 12:00PM"))
+    assert rejects({"type": "no_back_to_back"}, employee_obj, get_slot(time="12:00PM - 2:00PM"))
+    assert rejects({"type": "no_back_to_back"}, employee_obj, get_slot(time="7:00AM - 9:00AM"))
+    assert not rejects({"type": "no_back_to_back"}, employee_obj, get_slot(time="12:15PM - 2:00PM"))
+
+
+def test_compile_rule_errors():
+    with pytest.raises(ValueError, match="Unknown rule type"):
+        compile_rule({"type": "bogus"})
+    with pytest.raises(ValueError, match="Invalid options"):
+        compile_rule({"type": "sheet_cap"})
+
+
+class RecordingRule(Rule):
+    type = "recording"
+
+    def __init__(self, rejected, cost, calls, **options):
+        super().__init__(**options)
+        self.rejected = rejected
+        self.cost = cost
+        self.calls = calls
+
+    def rejects(self, employee_obj, slot):
+        self.calls.append(self.name)
+        return self.rejected
+
+
+def test_chain_runs_cheapest_first_and_stops_at_the_first_rejection():
+    calls = []
+    rule_set = RuleSet([RecordingRule(False, 3, calls, name="expensive"), RecordingRule(True, 1, calls, name="cheap_rejects"),
+                        RecordingRule(True, 2, calls, name="middle"), RecordingRule(False, 1, calls, name="cheap_passes")])
+    assert [rule.name for rule in rule_set.rules] == ["cheap_rejects", "cheap_passes", "middle", "expensive"]
+    assert rule_set.get_rejection(get_employee(), get_slot(time="9:00AM - 12:00PM")) == "cheap_rejects"
+    assert calls == ["cheap_rejects"]
+
+
+def test_chain_of_a_sheet():
+    rule_set = load_rule_set({"rules": [
+        {"type": "conflict"},
+        {"type": "sheet_cap", "max_shifts": 1, "sheets": ["Line"]},
+        {"type": "prerequisite", "except_sheets": ["Dish"]},
+    ]})
+    assert [rule.type for rule in rule_set.get_chain("Line")] == ["prerequisite", "sheet_cap", "conflict"]
+    assert [rule.type for rule in rule_set.get_chain("Dish")] == ["conflict"]
+    # Availability queries without a sheet skip the rules limited to some sheets
+    assert [rule.type for rule in rule_set.get_chain(None)] == ["conflict"]
+    assert rule_set.applies("sheet_cap", "Line") and not rule_set.applies("sheet_cap", "Sushi")
+
+
+def test_new_employees_are_only_checked_by_the_rules_that_can_reject_them():
+    rule_set = load_rule_set({"rules": [{"type": "weekly_cap"}, {"type": "conflict"}, {"type": "prerequisite"}]})
+    assert rule_set.get_rejection(None, get_slot(time="9:00AM - 12:00PM")) == "prerequisite"
+    assert load_rule_set({"rules": [{"type": "conflict"}]}).get_rejection(None, get_slot(time="9:00AM - 12:00PM")) is None
+
+
+def test_batched_rejection_keeps_the_chain_order():
+    rule_set = load_rule_set({"rules": [{"type": "conflict"}, {"type": "prerequisite", "locations": ["Pot Room"]}]})
+    employee_obj = get_employee(("Dish", DATE, "9:00AM - 12:00PM"))
+    slot = get_slot(time="11:00AM - 1:00PM")
+    # The cheaper prerequisite rule comes before the batched conflict check
+    assert rule_set.get_rejection(employee_obj, slot, "conflict") == "prerequisite"
+    assert rule_set.get_rejection(employee_obj, slot, NOT_CHECKED) == "prerequisite"
+
+
+def test_resolver_applies_the_configured_rules(monkeypatch):
+    def resolve(rule_configs):
+        monkeypatch.setattr(rules, "active_rule_set", load_rule_set({"rules": rule_configs}))
+        with assignment_engine.quiet_pass():
+            assignees, _ = assignment_engine.assign_greedy(slots)
+        return assignees
+
+    slots = [get_slot(time="7:00AM - 9:00AM", sheet="Line", comment=get_thread("Jane Doe"), row=5),
+             get_slot(time="9:00AM - 11:00AM", sheet="Line", comment=get_thread("John Roe", "Jane Doe"), row=6),
+             get_slot(time="1:00PM - 3:00PM", sheet="Line", comment=get_thread("John Roe", "Jane Doe"), row=7)]
+    assert resolve([{"type": "conflict"}]) == ["Jane Doe", "Jane Doe", "Jane Doe"]
+    # Jane's 9:00AM slot would follow her 7:00AM one back to back
+    assert resolve([{"type": "conflict"}, {"type": "no_back_to_back"}]) == ["Jane Doe", "John Roe", "Jane Doe"]
+    assert resolve([{"type": "sheet_cap", "max_shifts": 1, "sheets": ["Line"]}]) == ["Jane Doe", "John Roe", ""]
@@ -0,0 +1,39 @@
+from datetime import datetime
+from openpyxl import Workbook, load_workbook
+from openpyxl.comments import Comment
+from src.assignment_engine import load_and_assign_shift_xlsx
+from src.data_extractor import iter_shift_slots
+from tests.helpers import get_thread
+
+
+def write_role_column_workbook(file_path):
+    """
+    A Dish sheet labelled Time | First Name | Role | Last Name, with one open slot commented by Jane Doe.
+    """
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Dish"
+    worksheet.cell(row=1, column=1, value=datetime(2024, 12, 11))
+    for column, label in enumerate(["Time", "First Name", "Role", "Last Name"], start=1):
+        worksheet.cell(row=2, column=column, value=label)
+    worksheet.cell(row=3, column=1, value="9:00AM - 1:00PM")
+    worksheet.cell(row=3, column=3, value="Dishwasher")
+    worksheet.cell(row=3, column=2).comment = Comment(get_thread("Jane Doe"), "Scheduler")
+    workbook.save(file_path)
+
+
+def test_slots_keep_the_detected_last_name_column(tmp_path):
+    file_path = str(tmp_path / "schedule.xlsx")
+    write_role_column_workbook(file_path)
+    slots = list(iter_shift_slots(file_path, ["Dish"]))
+    assert [(slot.first_name_column, slot.last_name_column) for slot in slots] == [(2, 4)]
+
+
+def test_write_back_uses_the_last_name_column(tmp_path):
+    file_path = str(tmp_path / "schedule.xlsx")
+    write_role_column_workbook(file_path)
+    shift_assignments = load_and_assign_shift_xlsx(file_path, ["Dish"])
+    assert list(shift_assignments) == ["Jane Doe"]
+    worksheet = load_workbook(file_path)["Dish"]
+    assert [worksheet.cell(row=3, column=column).value for column in range(1, 5)] == ["9:00AM - 1:00PM", "Jane", "Dishwasher", "Doe"]
+    assert worksheet.cell(row=3, column=2).comment is None
@@ -0,0 +1,63 @@
+import pytest
+from src import calendar_policy, rules
+from src.simulation import simulate_variants, simulate_workbook
+from benchmarks.synthetic_schedule import generate_schedule
+from tests.helpers import get_slot, get_thread
+
+
+def get_week_slots():
+    """
+    Jane asks for a shift on each day of a week outside the named periods, John for the last two.
+    """
+    return [get_slot(day, get_thread("John Roe", "Jane Doe") if day >= 9 else get_thread("Jane Doe"), "9:00AM - 12:00PM",
+                     f"2025-01-{day:02d}") for day in range(6, 11)]
+
+
+def without_timings(report):
+    for summary in [report["baseline"]] + report["variants"]:
+        del summary["seconds"]
+    return report
+
+
+def test_variant_changing_a_cap_lists_the_changed_slots():
+    report = simulate_variants(get_week_slots(), [{"name": "three_a_week", "max_shifts_per_week": 3}, {"name": "same"}])
+    assert report["baseline"]["assigned"] == 5
+    three_a_week, same = report["variants"]
+    assert three_a_week["settings"] == {"max_shifts_per_week": 3}
+    assert three_a_week["changes"] == [
+        {"slot": "Dish!C9", "date": "2025-01-09", "time": "9:00AM - 12:00PM", "baseline": "Jane Doe", "variant": "John Roe"},
+        {"slot": "Dish!C10", "date": "2025-01-10", "time": "9:00AM - 12:00PM", "baseline": "Jane Doe", "variant": "John Roe"},
+    ]
+    assert three_a_week["shift_count_changes"] == {"Jane Doe": -2, "John Roe": 2}
+    assert same["changes"] == [] and same["shift_count_changes"] == {}
+
+
+def test_variant_leaving_a_slot_open():
+    report = simulate_variants(get_week_slots(), [{"max_shifts_per_week": 2, "rules": [{"type": "weekly_cap"}]}])
+    variant = report["variants"][0]
+    assert variant["name"] == "variant_1"
+    assert [(change["slot"], change["variant"]) for change in variant["changes"]] == [
+        ("Dish!C8", None), ("Dish!C9", "John Roe"), ("Dish!C10", "John Roe")]
+    assert (variant["assigned"], variant["unassigned"]) == (4, 1)
+
+
+def test_variants_do_not_change_the_policy():
+    calendar_policy_before, rule_set_before = calendar_policy.active_calendar_policy, rules.active_rule_set
+    simulate_variants(get_week_slots(), [{"max_shifts_per_week": 1}])
+    assert (calendar_policy.active_calendar_policy, rules.active_rule_set) == (calendar_policy_before, rule_set_before)
+    with pytest.raises(ValueError, match="max_shift_per_week"):
+        simulate_variants(get_week_slots(), [{"max_shift_per_week": 1}])
+
+
+def test_simulation_does_not_write_the_workbook(tmp_path):
+    file_path = tmp_path / "schedule.xlsx"
+    generate_schedule(str(file_path), sheets=["Dish", "Line"], days=3, commenters=10, seed=4)
+    content = file_path.read_bytes()
+    modified = file_path.stat().st_mtime_ns
+    variants = [{"name": "strict", "max_shifts_per_week": 1, "periods": []}, {"name": "optimal", "solver": "optimal"}]
+    report = simulate_workbook(str(file_path), ["Dish", "Line"], variants)
+    assert report["variants"][0]["changes"]
+    assert file_path.read_bytes() == content and file_path.stat().st_mtime_ns == modified
+    assert list(tmp_path.iterdir()) == [file_path]
+    # Worker processes give the same report
+    assert without_timings(simulate_workbook(str(file_path), ["Dish", "Line"], variants, processes=2)) == without_timings(report)
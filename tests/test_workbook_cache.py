@@ -0,0 +1,105 @@
+from datetime import date, datetime, time, timedelta, timezone
+import os
+import time as time_module
+import pytest
+from src.workbook_cache import WorkbookCache, read_records, write_records
+
+RECORDS = [
+    ("Dish", 5, None, True, 2.5, datetime(2024, 12, 11, 8, 30)),
+    (None, None, None, None, None, None),
+    ("", 0, 1, False, -0.5, date(2024, 12, 11)),
+    ("Dish", -7, 10 ** 20, True, float("inf"), time(8, 30, 15)),
+    ("Crème brûlée\n----\n 寿司", 1.0, 1, "1", 1e-300, timedelta(hours=3, minutes=30)),
+    ("Dish", 5, None, True, 2.5, datetime(2024, 12, 11, 8, 30, tzinfo=timezone(timedelta(hours=-5)))),
+]
+
+
+def assert_same_records(records, expected):
+    assert records == expected
+    # bools, ints and floats compare equal to each other, so check the types too
+    assert [[type(value) for value in record] for record in records] == [[type(value) for value in record] for record in expected]
+
+
+def test_records_round_trip(tmp_path):
+    file_path = str(tmp_path / "records.bin")
+    write_records(file_path, RECORDS, 6)
+    assert_same_records(read_records(file_path), RECORDS)
+
+
+def test_no_records(tmp_path):
+    file_path = str(tmp_path / "records.bin")
+    write_records(file_path, [], 9)
+    assert read_records(file_path) == []
+
+
+def test_repeated_values_are_stored_once(tmp_path):
+    once = str(tmp_path / "once.bin")
+    repeated = str(tmp_path / "repeated.bin")
+    write_records(once, [("Dish", "9:00AM - 1:00PM")], 2)
+    write_records(repeated, [("Dish", "9:00AM - 1:00PM")] * 100, 2)
+    with open(once, 'rb') as file, open(repeated, 'rb') as other_file:
+        # Only the field indexes grow, by two uint32 per record
+        assert len(other_file.read()) - len(file.read()) == 99 * 2 * 4
+
+
+def test_unreadable_files_are_not_records(tmp_path):
+    file_path = str(tmp_path / "records.bin")
+    write_records(file_path, RECORDS, 6)
+    with open(file_path, 'rb') as file:
+        content = file.read()
+    with open(file_path, 'wb') as file:
+        file.write(content[:-1])
+    assert read_records(file_path) is None
+    with open(file_path, 'wb') as file:
+        file.write(b"XXXX" + content[4:])
+    assert read_records(file_path) is None
+    with open(file_path, 'wb') as file:
+        file.write(b"SR")
+    assert read_records(file_path) is None
+
+
+def test_unsupported_values_are_not_written(tmp_path):
+    file_path = str(tmp_path / "records.bin")
+    with pytest.raises(TypeError):
+        write_records(file_path, [("Dish", object())], 2)
+
+
+def test_cache_entries_follow_the_workbook_content(tmp_path):
+    workbook_path = str(tmp_path / "schedule.xlsx")
+    with open(workbook_path, 'wb') as file:
+        file.write(b"first version")
+    cache = WorkbookCache(str(tmp_path / "cache"))
+    assert cache.load(workbook_path, "slots", ["Dish"]) is None
+    assert cache.store(workbook_path, "slots", ["Dish"], RECORDS, 6)
+    assert_same_records(cache.load(workbook_path, "slots", ["Dish"]), RECORDS)
+    # Other sheets, another extractor version or other content are other entries
+    assert cache.load(workbook_path, "slots", ["Dish", "Line"]) is None
+    assert WorkbookCache(str(tmp_path / "cache"), extractor_version=1).load(workbook_path, "slots", ["Dish"]) is None
+    with open(workbook_path, 'wb') as file:
+        file.write(b"second version, longer")
+    assert cache.load(workbook_path, "slots", ["Dish"]) is None
+    assert not cache.store(workbook_path, "slots", ["Dish"], [(object(),)], 1)
+
+
+def test_eviction_drops_old_and_least_recently_used_entries(tmp_path):
+    workbook_paths = []
+    for index in range(4):
+        workbook_paths.append(str(tmp_path / f"schedule_{index}.xlsx"))
+        with open(workbook_paths[-1], 'wb') as file:
+            file.write(f"workbook {index}".encode())
+    cache = WorkbookCache(str(tmp_path / "cache"), max_age=1000)
+    cache.store(workbook_paths[0], "slots", ["Dish"], RECORDS, 6)
+    cache.max_bytes = 2 * os.path.getsize(cache.get_entry_path(workbook_paths[0], "slots", ["Dish"]))
+    now = time_module.time()
+    for workbook_path, age in zip(workbook_paths, (2000, 200)):
+        cache.store(workbook_path, "slots", ["Dish"], RECORDS, 6)
+        entry_path = cache.get_entry_path(workbook_path, "slots", ["Dish"])
+        os.utime(entry_path, (now - age, now - age))
+    # The first entry was unused for longer than max_age
+    cache.store(workbook_paths[2], "slots", ["Dish"], RECORDS, 6)
+    assert cache.load(workbook_paths[0], "slots", ["Dish"]) is None
+    assert cache.load(workbook_paths[1], "slots", ["Dish"]) == RECORDS
+    os.utime(cache.get_entry_path(workbook_paths[2], "slots", ["Dish"]), (now - 100, now - 100))
+    # Over the size limit the least recently used entry goes, and loading the second entry used it
+    cache.store(workbook_paths[3], "slots", ["Dish"], RECORDS, 6)
+    assert [cache.load(workbook_path, "slots", ["Dish"]) is None for workbook_path in workbook_paths[1:]] == [False, True, False]